@@ -0,0 +1,29 @@
+"""Atomic writes of the JSON files caches, indexes and checkpoints are persisted to."""
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+def write_json(path: Union[str, Path], data: Any) -> None:
+    """Write data to a JSON file so readers see either the old or the new file, never part of one.
+
+    The data is written to a uniquely named temporary file next to ``path``, flushed to
+    disk and then renamed over ``path``, so concurrent writers, even in other processes,
+    never share a temporary file.
+
+    Args:
+        path: JSON file to write
+        data: JSON-serializable data
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False) as f:
+        try:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
@@ -0,0 +1,179 @@
+"""Bulk export of every ticket matching a JQL query, with sharded output and checkpoints."""
+import os
+import json
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
+from .bundle_stream import encode_record
+from .atomic_json import write_json
+
+if TYPE_CHECKING:
+    from .jira_extractor import JiraExtractor
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "checkpoint.json"
+
+@dataclass
+class BulkExportConfig:
+    """Configuration for bulk exports."""
+    page_size: int = 100  # Keys requested per search page
+    search_concurrency: int = 4  # Search pages fetched concurrently
+    batch_size: int = 50  # Tickets mined together in one shared traversal
+    shard_max_bytes: int = 64 * 1024 * 1024  # Start a new shard once a shard reaches this size
+    shard_prefix: str = "bundles"
+
+@dataclass
+class ExportSummary:
+    """Outcome of a bulk export."""
+    total: int = 0  # Tickets matching the query
+    exported: int = 0  # Bundles written by this run
+    resumed_from: int = 0  # Tickets already exported by an earlier run
+    failed: List[str] = field(default_factory=list)  # Tickets that could not be fetched
+    shards: List[str] = field(default_factory=list)  # Shard file names, in order
+
+class BulkExporter:
+    """Mines every ticket matching a JQL query into NDJSON shards.
+
+    Matching keys are listed once and stored in a checkpoint together with the
+    number of tickets exported and the committed size of the current shard. An
+    interrupted run resumes from the checkpoint: the shard is truncated to its
+    committed size and mining continues with the first unexported ticket.
+    """
+
+    def __init__(self, extractor: 'JiraExtractor', output_dir: str, config: Optional[BulkExportConfig] = None):
+        """Initialize the exporter.
+
+        Args:
+            extractor: Extractor used to mine the tickets
+            output_dir: Directory for shards and the checkpoint. Created if missing.
+            config: Export configuration
+        """
+        self.extractor = extractor
+        self.config = config or BulkExportConfig()
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_path = self.output_dir / CHECKPOINT_NAME
+
+    async def run(self, jql: str) -> ExportSummary:
+        """Export every ticket matching a query, resuming an earlier run of the same query.
+
+        Args:
+            jql: JQL query selecting the tickets
+
+        Returns:
+            ExportSummary
+        """
+        # Shard and checkpoint I/O (including fsync) runs on the transport's threads, so
+        # it never stalls the fetches of other coroutines on the event loop
+        transport = self.extractor.transport
+        checkpoint = await transport.call(self._load_checkpoint, jql)
+        if checkpoint is None:
+            keys = await self.search_keys(jql)
+            checkpoint = {
+                'jql': jql,
+                'keys': keys,
+                'done': 0,
+                'failed': [],
+                'shards': [],
+                'shard_bytes': 0
+            }
+            await transport.call(self._save_checkpoint, checkpoint)
+        else:
+            logger.info(f"Resuming export at ticket {checkpoint['done']} of {len(checkpoint['keys'])}")
+
+        summary = ExportSummary(total=len(checkpoint['keys']), resumed_from=checkpoint['done'])
+        keys = checkpoint['keys']
+        while checkpoint['done'] < len(keys):
+            batch = keys[checkpoint['done']:checkpoint['done'] + max(1, self.config.batch_size)]
+            bundles = await self.extractor.mine_many(batch)
+
+            lines = []
+            for key in batch:
+                if bundles.get(key) is None:
+                    checkpoint['failed'].append(key)
+                else:
+                    lines.append(encode_record({'id': key, 'bundle': bundles[key]}).encode('utf-8'))
+            del bundles
+
+            await transport.call(self._write_lines, checkpoint, lines)
+            checkpoint['done'] += len(batch)
+            await transport.call(self._save_checkpoint, checkpoint)
+            summary.exported += len(lines)
+            logger.info(f"Exported {checkpoint['done']} of {len(keys)} ticket(s)")
+
+        summary.failed = list(checkpoint['failed'])
+        summary.shards = list(checkpoint['shards'])
+        return summary
+
+    async def search_keys(self, jql: str) -> List[str]:
+        """List the keys of every ticket matching a query.
+
+        The first page gives the total; the remaining pages are fetched concurrently.
+
+        Args:
+            jql: JQL query
+
+        Returns:
+            Ticket keys in the order of the search results, without duplicates
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.search_concurrency))
+        page_size = self.config.page_size
+
+        async def search_page(start: int) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self.extractor.transport.call(
+                    self.extractor.jira.jql, jql, fields='key', start=start, limit=page_size
+                )
+            if not isinstance(result, dict) or not isinstance(result.get('issues'), list):
+                raise ValueError(f"Unexpected search response for {jql!r}")
+            return result
+
+        first_page = await search_page(0)
+        pages = [first_page]
+        total = first_page.get('total', 0)
+        received = len(first_page['issues'])
+        if 0 < received < total:
+            pages.extend(await asyncio.gather(
+                *(search_page(start) for start in range(received, total, received))
+            ))
+
+        keys = list(dict.fromkeys(issue['key'] for page in pages for issue in page['issues']))
+        logger.info(f"Found {len(keys)} ticket(s) matching {jql!r}")
+        return keys
+
+    def _write_lines(self, checkpoint: Dict[str, Any], lines: List[bytes]) -> None:
+        """Append lines to the current shard, rolling over to new shards at the size bound."""
+        index = 0
+        while index < len(lines):
+            if not checkpoint['shards'] or checkpoint['shard_bytes'] >= self.config.shard_max_bytes:
+                checkpoint['shards'].append(f"{self.config.shard_prefix}-{len(checkpoint['shards']):05d}.ndjson")
+                checkpoint['shard_bytes'] = 0
+
+            with open(self.output_dir / checkpoint['shards'][-1], 'ab') as f:
+                # Drop anything written after the last checkpoint by an interrupted run
+                f.truncate(checkpoint['shard_bytes'])
+                while index < len(lines) and checkpoint['shard_bytes'] < self.config.shard_max_bytes:
+                    f.write(lines[index])
+                    checkpoint['shard_bytes'] += len(lines[index])
+                    index += 1
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _load_checkpoint(self, jql: str) -> Optional[Dict[str, Any]]:
+        """Load the checkpoint of an earlier run of the same query, if any."""
+        if not self.checkpoint_path.exists():
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('jql') != jql:
+            raise ValueError(
+                f"{self.output_dir} holds an export of {checkpoint.get('jql')!r}; use another directory for {jql!r}"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """Write the checkpoint atomically."""
+        write_json(self.checkpoint_path, checkpoint)
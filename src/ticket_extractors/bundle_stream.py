@@ -0,0 +1,85 @@
+"""Records emitted when streaming a ticket bundle."""
+import json
+from dataclasses import asdict, is_dataclass
+from typing import Dict, Any, Optional
+
+# Record types, in the order a ticket's records are emitted
+TICKET_RECORD = 'jira_ticket'
+EDGE_RECORD = 'edge'
+TRUNCATED_RECORD = 'truncated'
+RESOURCE_RECORDS = ('confluence_pages', 'scrapable_documentation', 'other_urls')
+
+def ticket_record(ticket_data: Dict[str, Any], depth: int, parent: Optional[str], context: Optional[str]) -> Dict[str, Any]:
+    """Create the record of a resolved ticket.
+
+    The ticket's references are emitted as records of their own, so the data carries
+    empty reference lists.
+
+    Args:
+        ticket_data: Ticket data as built by the extractor
+        depth: Depth of the ticket in the reference chain
+        parent: Ticket whose reference led to this ticket, or None for the root
+        context: Where the parent referenced this ticket
+
+    Returns:
+        Record dictionary
+    """
+    data = dict(ticket_data)
+    data['references'] = {ref_type: [] for ref_type in ticket_data['references']}
+    return {
+        'type': TICKET_RECORD,
+        'id': ticket_data['id'],
+        'depth': depth,
+        'parent': parent,
+        'context': context,
+        'data': data
+    }
+
+def resource_record(ref_type: str, reference: Dict[str, Any], parent: str, depth: int) -> Dict[str, Any]:
+    """Create the record of a Confluence page, document or other URL referenced by a ticket."""
+    return {
+        'type': ref_type,
+        'parent': parent,
+        'depth': depth,
+        'context': reference.get('context'),
+        'data': reference
+    }
+
+def edge_record(source: str, target: str, context: str) -> Dict[str, Any]:
+    """Create the record of a reference to a ticket emitted under another parent."""
+    return {
+        'type': EDGE_RECORD,
+        'source': source,
+        'target': target,
+        'context': context
+    }
+
+def truncated_record(
+    ticket_id: str,
+    parent: Optional[str],
+    context: Optional[str],
+    reason: str,
+    elapsed_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """Create the record of a referenced ticket left unfetched because a budget or deadline ran out.
+
+    ``reason`` is the budget limit reached, or 'timeout' for a ticket whose own request
+    timed out after ``elapsed_seconds``.
+    """
+    return {
+        'type': TRUNCATED_RECORD,
+        'id': ticket_id,
+        'parent': parent,
+        'context': context,
+        'reason': reason,
+        'elapsed_seconds': round(elapsed_seconds, 3) if elapsed_seconds is not None else None
+    }
+
+def _json_default(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+def encode_record(record: Dict[str, Any]) -> str:
+    """Encode a record as one NDJSON line, including the trailing newline."""
+    return json.dumps(record, separators=(',', ':'), default=_json_default) + '\n'
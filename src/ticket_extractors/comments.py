@@ -0,0 +1,36 @@
+"""Paginated retrieval of Jira comments."""
+from typing import List, Optional
+from dataclasses import dataclass
+
+@dataclass
+class CommentConfig:
+    """Configuration for fetching ticket comments."""
+    page_size: int = 100  # maxResults per comment page
+    prefetch_pages: int = 4  # Pages fetched ahead of the one being processed
+    max_comments: Optional[int] = None  # Keep only the newest N comments of each ticket
+
+def comment_path(ticket_id: str) -> str:
+    """REST path of a ticket's comments."""
+    return f"rest/api/2/issue/{ticket_id}/comment"
+
+def comment_page_starts(total: int, config: CommentConfig, first: int = 0) -> List[int]:
+    """Offsets of the comment pages to fetch, oldest first.
+
+    Args:
+        total: Number of comments on the ticket
+        config: Comment configuration
+        first: Offset of the first page to fetch (before applying ``max_comments``)
+
+    Returns:
+        List of ``startAt`` values
+    """
+    start = first
+    if config.max_comments is not None:
+        start = max(start, total - config.max_comments)
+    return list(range(start, total, max(1, config.page_size)))
+
+def newest_comments(comments: List[dict], config: CommentConfig) -> List[dict]:
+    """Apply ``max_comments`` to a chronological list of comments."""
+    if config.max_comments is None:
+        return comments
+    return comments[-config.max_comments:] if config.max_comments > 0 else []
@@ -1,7 +1,10 @@
 import os
+import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from atlassian import Confluence
+from atlassian.errors import ApiError
+from requests import HTTPError
 from urllib.parse import urlparse, unquote
 import json
 import re
@@ -9,13 +12,24 @@ import html2text
 from . import config
 from .url_analyzer import URLAnalyzer
 from .base_extractor import BaseExtractor
+from .transport import ExecutorTransport, get_default_transport
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Errors of Confluence rejecting a request (404, 403...), raised to the caller so it can
+# tell a missing or forbidden page from other failures
+API_ERRORS = (HTTPError, ApiError)
+
 class ConfluenceExtractor(BaseExtractor):
-    def __init__(self):
+    def __init__(self, transport: Optional[ExecutorTransport] = None):
+        """Initialize the ConfluenceExtractor.
+        
+        Args:
+            transport: Optional transport used to run blocking Confluence calls. Defaults to the shared transport.
+        """
         super().__init__()
+        self.transport = transport or get_default_transport()
         logger.info(f"Connecting to Confluence: {config.CONFLUENCE_URL}")
         
         try:
@@ -32,21 +46,39 @@ class ConfluenceExtractor(BaseExtractor):
         # Create sync versions of async methods
         self.get_page_from_url_sync = self._make_sync(self.get_page_from_url)
 
-    async def get_page_from_url(self, url: str) -> Optional[Dict[str, Any]]:
-        """Get a Confluence page from its URL."""
+    async def get_page_from_url(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get a Confluence page from its URL.
+
+        Args:
+            url: URL of the page
+            timeout: Optional seconds allowed for the whole fetch, attachments included
+
+        Returns:
+            Dict containing the page data or None if failed
+
+        Raises:
+            asyncio.TimeoutError: If the page could not be fetched within ``timeout``
+            requests.HTTPError, atlassian.errors.ApiError: If Confluence rejected the request
+        """
+        if timeout is not None:
+            return await asyncio.wait_for(self.get_page_from_url(url), timeout)
+            
         try:
             # Extract page ID from URL
-            page_id = self._extract_page_id_from_url(url)
+            page_id = await self._extract_page_id_from_url(url)
             if not page_id:
                 logger.warning(f"Could not extract page ID from URL: {url}")
                 return None
 
             # Get the page content
             try:
-                page = self.confluence.get_page_by_id(
+                page = await self.transport.call(
+                    self.confluence.get_page_by_id,
                     page_id,
                     expand='body.storage,version,space,history,metadata.labels'
                 )
+            except API_ERRORS:
+                raise
             except Exception as e:
                 logger.error(f"Failed to fetch Confluence page {page_id}: {str(e)}")
                 return None
@@ -56,7 +88,7 @@ class ConfluenceExtractor(BaseExtractor):
                 return None
 
             # Get attachments
-            attachments = self._get_attachments(page_id)
+            attachments = await self._get_attachments(page_id)
 
             # Extract and clean the content
             content = self._clean_confluence_markup(page['body']['storage']['value'])
@@ -76,11 +108,48 @@ class ConfluenceExtractor(BaseExtractor):
                 'attachments': attachments
             }
 
+        except API_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch page from URL {url}: {str(e)}")
             return None
 
-    def _extract_page_id_from_url(self, url: str) -> Optional[str]:
+    async def get_page_versions(self, page_ids: List[str], chunk_size: int = 50) -> Dict[str, int]:
+        """Get the current version number of many pages with bulk CQL searches.
+
+        Args:
+            page_ids: Page IDs to check
+            chunk_size: Page IDs per search
+
+        Returns:
+            Dict mapping page IDs to their version number. Deleted pages and pages
+            whose search failed are left out.
+        """
+        async def search_chunk(chunk: List[str]) -> Dict[str, int]:
+            try:
+                result = await self.transport.call(
+                    self.confluence.cql,
+                    f"id in ({', '.join(chunk)})",
+                    limit=len(chunk),
+                    expand='content.version'
+                )
+                return {
+                    str(item['content']['id']): item['content']['version']['number']
+                    for item in result.get('results', [])
+                    if item.get('content', {}).get('version')
+                }
+            except Exception as e:
+                logger.warning(f"Failed to check the version of {len(chunk)} page(s): {str(e)}")
+                return {}
+
+        chunk_size = max(1, chunk_size)
+        chunks = [page_ids[i:i + chunk_size] for i in range(0, len(page_ids), chunk_size)]
+        versions = {}
+        for chunk_versions in await asyncio.gather(*(search_chunk(chunk) for chunk in chunks)):
+            versions.update(chunk_versions)
+        return versions
+
+    async def _extract_page_id_from_url(self, url: str) -> Optional[str]:
         """Extract the page ID from a Confluence URL."""
         try:
             parsed = urlparse(url)
@@ -95,19 +164,21 @@ class ConfluenceExtractor(BaseExtractor):
                 # In this case, we need to get the page by title and space
                 space_key = path.split('/display/')[-1].split('/')[0]
                 title = path.split('/')[-1].replace('+', ' ')
-                page = self.confluence.get_page_by_title(space_key, title)
+                page = await self.transport.call(self.confluence.get_page_by_title, space_key, title)
                 return page['id'] if page else None
             
             return None
             
+        except API_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Failed to extract page ID from URL {url}: {str(e)}")
             return None
 
-    def _get_attachments(self, page_id: str) -> List[Dict[str, Any]]:
+    async def _get_attachments(self, page_id: str) -> List[Dict[str, Any]]:
         """Get attachments for a page."""
         try:
-            attachments = self.confluence.get_attachments_from_content(page_id)
+            attachments = await self.transport.call(self.confluence.get_attachments_from_content, page_id)
             if not attachments or 'results' not in attachments:
                 return []
                 
@@ -0,0 +1,187 @@
+"""Field projection planning for Jira issue fetches."""
+import json
+import logging
+from typing import Dict, List, Any, Optional, Sequence
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Fields read when building a ticket bundle. 'comment' embeds the comments in the issue response.
+BUNDLE_FIELDS = (
+    'summary',
+    'description',
+    'status',
+    'created',
+    'updated',
+    'priority',
+    'assignee',
+    'reporter',
+    'labels',
+    'issuelinks',
+    'comment',
+)
+
+# Fields fetched in the first phase of a skeleton crawl: what links are discovered from.
+# Comments, usually the heaviest field, are left to the second phase.
+SKELETON_FIELDS = (
+    'description',
+    'issuelinks',
+)
+
+def payload_size(payload: Any) -> int:
+    """Approximate the size in bytes of a decoded JSON payload."""
+    return len(json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8'))
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """Fields and expansions requested for a Jira issue."""
+    fields: Sequence[str] = BUNDLE_FIELDS
+    expand: Optional[str] = None
+
+    @property
+    def fields_param(self) -> str:
+        """Value of the `fields` request parameter."""
+        return ','.join(self.fields)
+
+    @property
+    def include_comments(self) -> bool:
+        """Whether comments are fetched with the issue."""
+        return 'comment' in self.fields
+
+    def skeleton(self) -> 'FetchPlan':
+        """Plan fetching only the fields of this plan that references are discovered from."""
+        return FetchPlan(fields=tuple(f for f in self.fields if f in SKELETON_FIELDS))
+
+    def remainder(self) -> Optional['FetchPlan']:
+        """Plan fetching the fields of this plan left out of its skeleton, or None if there are none."""
+        fields = tuple(f for f in self.fields if f not in SKELETON_FIELDS)
+        return FetchPlan(fields=fields, expand=self.expand) if fields else None
+
+    def requests(self, name: str) -> bool:
+        """Whether the plan requests a field, or an expansion such as renderedFields."""
+        if name in self.fields or name in (self.expand or '').split(','):
+            return True
+        return '*all' in self.fields and name != 'renderedFields'
+
+    def covered_by(self, issue: Dict[str, Any]) -> bool:
+        """Whether an issue payload already holds every field of this plan."""
+        fields = issue.get('fields') or {}
+        return all(f in fields for f in self.fields)
+
+@dataclass
+class FetchStats:
+    """Payload statistics for the issues fetched for one bundle."""
+    payloads: int = 0  # Every payload received: issues, comment pages and searches
+    bytes_received: int = 0
+    api_calls: int = 0  # Requests sent to Jira, including searches returning many issues
+    cache_hits: int = 0  # Issues served from the ticket cache without a full fetch
+    projected_payloads: int = 0  # Issues fetched with their depth's plan, whose savings are estimated
+    estimated_bytes_saved: Optional[int] = None  # Size of the fields their plans left out, None if no baseline is known
+
+    def record_saving(self, saved: int) -> None:
+        """Account for the bytes a projected issue fetch saved."""
+        self.projected_payloads += 1
+        self.estimated_bytes_saved = (self.estimated_bytes_saved or 0) + saved
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a dictionary."""
+        return {
+            'payloads': self.payloads,
+            'bytes_received': self.bytes_received,
+            'api_calls': self.api_calls,
+            'cache_hits': self.cache_hits,
+            'projected_payloads': self.projected_payloads,
+            'estimated_bytes_saved': self.estimated_bytes_saved
+        }
+
+class FetchPlanner:
+    """Chooses the projection used to fetch issues at each reference depth."""
+
+    def __init__(
+        self,
+        default_plan: Optional[FetchPlan] = None,
+        depth_plans: Optional[Dict[int, FetchPlan]] = None,
+        full_payload_bytes: Optional[int] = None,
+        field_bytes: Optional[Dict[str, int]] = None
+    ):
+        """Initialize the fetch planner.
+
+        Args:
+            default_plan: Plan used for depths without a specific plan
+            depth_plans: Plans keyed by the minimum depth they apply to. A plan for depth 2
+                also applies to depths 3 and deeper unless they have their own plan.
+            full_payload_bytes: Average size of a full issue payload, used to estimate savings
+                when the size of each field is not known
+            field_bytes: Average size of each field of a full issue payload, used to estimate savings
+        """
+        self.default_plan = default_plan or FetchPlan()
+        self.depth_plans = dict(depth_plans or {})
+        self.full_payload_bytes = full_payload_bytes
+        self.field_bytes = dict(field_bytes) if field_bytes is not None else None
+
+    def plan_for_depth(self, depth: int) -> FetchPlan:
+        """Get the plan for issues fetched at a given depth.
+
+        Args:
+            depth: Reference depth (0 for the root ticket)
+
+        Returns:
+            FetchPlan to use
+        """
+        applicable = [plan_depth for plan_depth in self.depth_plans if plan_depth <= depth]
+        if not applicable:
+            return self.default_plan
+        return self.depth_plans[max(applicable)]
+
+    def new_stats(self) -> FetchStats:
+        """Create empty statistics for a new bundle."""
+        return FetchStats()
+
+    def bytes_saved(self, plan: FetchPlan, issue: Dict[str, Any]) -> Optional[int]:
+        """Estimate the bytes a projected fetch saved compared to fetching the full issue.
+
+        With per-field sizes, the saving is the size of the fields the plan left out.
+        Otherwise the issue received is compared to the average full payload.
+
+        Args:
+            plan: Plan the issue's fields were requested with
+            issue: Issue received
+
+        Returns:
+            Bytes saved, or None if no baseline is known
+        """
+        if self.field_bytes is not None:
+            return sum(size for name, size in self.field_bytes.items() if not plan.requests(name))
+        if self.full_payload_bytes is not None:
+            return max(0, self.full_payload_bytes - payload_size(issue))
+        return None
+
+    def calibrate(self, full_payloads: List[Dict[str, Any]]) -> int:
+        """Set the full payload baseline from sample unprojected payloads.
+
+        The size of each field is averaged too. A payload is an issue, or an
+        ``{'issue': ..., 'comments': ...}`` pair whose separately fetched comments count
+        as the 'comment' field; renderedFields counts as a field of its own.
+
+        Args:
+            full_payloads: Issues fetched with all fields
+
+        Returns:
+            Average full payload size in bytes
+        """
+        if not full_payloads:
+            raise ValueError("At least one payload is required for calibration")
+        self.full_payload_bytes = sum(payload_size(p) for p in full_payloads) // len(full_payloads)
+        totals: Dict[str, int] = {}
+        for payload in full_payloads:
+            issue = payload.get('issue', payload)
+            sizes = {name: payload_size({name: value}) for name, value in (issue.get('fields') or {}).items()}
+            if 'renderedFields' in issue:
+                sizes['renderedFields'] = payload_size(issue['renderedFields'])
+            if 'comments' in payload:
+                sizes.setdefault('comment', payload_size(payload['comments']))
+            for name, size in sizes.items():
+                totals[name] = totals.get(name, 0) + size
+        self.field_bytes = {name: total // len(full_payloads) for name, total in totals.items()}
+        logger.info(f"Calibrated full issue payload size: {self.full_payload_bytes} bytes")
+        return self.full_payload_bytes
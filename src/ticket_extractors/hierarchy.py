@@ -0,0 +1,77 @@
+"""Expansion of ticket hierarchies: parents, sub-tasks and epic children."""
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass
+
+PARENT_CONTEXT = "Parent ticket"
+EPIC_CONTEXT = "Epic"
+CHILD_CONTEXT = "Child issue"
+EPIC_CHILD_CONTEXT = "Issue in epic"
+
+@dataclass
+class HierarchyConfig:
+    """Configuration for following ticket hierarchies."""
+    enabled: bool = False
+    parents: bool = True  # Follow the `parent` field (and the epic link) up to the parent
+    children: bool = True  # Search for sub-tasks and child issues with `parent in (...)`
+    epic_link_field: Optional[str] = None  # Epic Link custom field of classic projects, e.g. "customfield_10014"
+    max_children: Optional[int] = None  # Keep only the first N children of each ticket
+    page_size: int = 50  # maxResults per child search page
+
+    @property
+    def extra_fields(self) -> Tuple[str, ...]:
+        """Issue fields holding the upward hierarchy references."""
+        if not self.enabled or not self.parents:
+            return ()
+        return ('parent', self.epic_link_field) if self.epic_link_field else ('parent',)
+
+def epic_link_clause(epic_link_field: str) -> str:
+    """JQL name of the Epic Link custom field, e.g. "cf[10014]" for "customfield_10014"."""
+    match = re.fullmatch(r'customfield_(\d+)', epic_link_field)
+    return f"cf[{match.group(1)}]" if match else f'"{epic_link_field}"'
+
+def build_children_jql(keys: Sequence[str], config: HierarchyConfig) -> Optional[str]:
+    """Build a JQL query matching the children of the given tickets.
+
+    Args:
+        keys: Parent ticket keys
+        config: Hierarchy configuration
+
+    Returns:
+        JQL query ordered by key, so pages are stable, or None if no child relation is followed
+    """
+    key_list = ', '.join(keys)
+    clauses = []
+    if config.children:
+        clauses.append(f"parent in ({key_list})")
+        if config.epic_link_field:
+            clauses.append(f"{epic_link_clause(config.epic_link_field)} in ({key_list})")
+    if not clauses:
+        return None
+    return f"{' OR '.join(clauses)} ORDER BY key ASC"
+
+def parent_references(fields: Dict, config: HierarchyConfig) -> List[Tuple[str, str]]:
+    """Get the (key, context) pairs of the parent and epic an issue's fields point to."""
+    if not config.enabled or not config.parents:
+        return []
+    references = []
+    parent = fields.get('parent')
+    if isinstance(parent, dict) and parent.get('key'):
+        references.append((parent['key'], PARENT_CONTEXT))
+    if config.epic_link_field:
+        epic = fields.get(config.epic_link_field)
+        if isinstance(epic, str) and epic:
+            references.append((epic, EPIC_CONTEXT))
+    return references
+
+def child_parents(fields: Dict, parent_keys: Set[str], config: HierarchyConfig) -> List[Tuple[str, str]]:
+    """Get the (parent key, context) pairs linking a child search result to the searched tickets."""
+    parents = []
+    parent = fields.get('parent')
+    if isinstance(parent, dict) and parent.get('key') in parent_keys:
+        parents.append((parent['key'], CHILD_CONTEXT))
+    if config.epic_link_field:
+        epic = fields.get(config.epic_link_field)
+        if epic in parent_keys:
+            parents.append((epic, EPIC_CHILD_CONTEXT))
+    return parents
@@ -0,0 +1,217 @@
+"""Incremental re-mining: rebuild only the bundles whose inputs changed."""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Iterable, TYPE_CHECKING
+from dataclasses import dataclass, field
+from .atomic_json import write_json
+
+if TYPE_CHECKING:
+    from .jira_extractor import JiraExtractor
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BundleDependencies:
+    """The inputs a bundle was built from, with the version of each."""
+    tickets: Dict[str, Optional[str]] = field(default_factory=dict)  # Ticket key -> `updated`
+    pages: Dict[str, Optional[int]] = field(default_factory=dict)  # Confluence page id -> version number
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the dependencies to a dictionary."""
+        return {'tickets': dict(self.tickets), 'pages': dict(self.pages)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BundleDependencies':
+        """Create dependencies from the output of ``to_dict``."""
+        return cls(tickets=dict(data.get('tickets', {})), pages=dict(data.get('pages', {})))
+
+def bundle_dependencies(bundle: Dict[str, Any]) -> BundleDependencies:
+    """Collect the tickets and Confluence pages embedded in a nested bundle.
+
+    Placeholders and truncation markers are not dependencies: a placeholder points to
+    a ticket embedded elsewhere in the same bundle, and a truncated ticket was never
+    fetched. Pages that failed to fetch carry no version and are left out.
+
+    Args:
+        bundle: Nested bundle as returned by ``get_ticket`` or ``mine_many``
+
+    Returns:
+        BundleDependencies
+    """
+    dependencies = BundleDependencies()
+    stack = [bundle]
+    while stack:
+        ticket_data = stack.pop()
+        dependencies.tickets[ticket_data['id']] = ticket_data.get('updated')
+        references = ticket_data['references']
+        for reference in references['confluence_pages']:
+            page = reference.get('data')
+            if page and page.get('id'):
+                dependencies.pages[str(page['id'])] = page.get('version')
+        stack.extend(
+            reference for reference in references['jira_tickets']
+            if not reference.get('metadata', {}).get('is_processed_reference')
+            and not reference.get('metadata', {}).get('is_truncated')
+        )
+    return dependencies
+
+class DependencyIndex:
+    """Dependencies of every produced bundle, with a reverse index from each input to its bundles.
+
+    The index is persisted as JSON; the reverse index is rebuilt when it is loaded.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.bundles: Dict[str, BundleDependencies] = {}
+        self._ticket_bundles: Dict[str, Set[str]] = {}
+        self._page_bundles: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.bundles)
+
+    def __contains__(self, root_id: str) -> bool:
+        return root_id in self.bundles
+
+    def record(self, root_id: str, dependencies: BundleDependencies) -> None:
+        """Record the dependencies of a (re)built bundle, replacing earlier ones."""
+        self.remove(root_id)
+        self.bundles[root_id] = dependencies
+        for key in dependencies.tickets:
+            self._ticket_bundles.setdefault(key, set()).add(root_id)
+        for page_id in dependencies.pages:
+            self._page_bundles.setdefault(page_id, set()).add(root_id)
+
+    def remove(self, root_id: str) -> None:
+        """Forget a bundle."""
+        dependencies = self.bundles.pop(root_id, None)
+        if dependencies is None:
+            return
+        for reverse, inputs in ((self._ticket_bundles, dependencies.tickets), (self._page_bundles, dependencies.pages)):
+            for key in inputs:
+                reverse[key].discard(root_id)
+                if not reverse[key]:
+                    del reverse[key]
+
+    def tickets(self) -> List[str]:
+        """Every ticket some bundle depends on."""
+        return list(self._ticket_bundles)
+
+    def pages(self) -> List[str]:
+        """Every Confluence page some bundle depends on."""
+        return list(self._page_bundles)
+
+    def bundles_for_ticket(self, key: str) -> Set[str]:
+        """Bundles that include a ticket."""
+        return set(self._ticket_bundles.get(key, ()))
+
+    def bundles_for_page(self, page_id: str) -> Set[str]:
+        """Bundles that include a Confluence page."""
+        return set(self._page_bundles.get(page_id, ()))
+
+    def changed_bundles(self, ticket_versions: Dict[str, str], page_versions: Dict[str, int]) -> List[str]:
+        """Find the bundles built from an input that has changed since.
+
+        Args:
+            ticket_versions: Current `updated` value of each ticket. Tickets left out
+                (deleted, or their check failed) count as changed.
+            page_versions: Current version number of each Confluence page, with the
+                same convention
+
+        Returns:
+            Root ticket IDs of the changed bundles, in recording order
+        """
+        changed: Set[str] = set()
+        for reverse, current, attribute in (
+            (self._ticket_bundles, ticket_versions, 'tickets'),
+            (self._page_bundles, page_versions, 'pages'),
+        ):
+            for key, root_ids in reverse.items():
+                version = current.get(key)
+                for root_id in root_ids:
+                    recorded = getattr(self.bundles[root_id], attribute)[key]
+                    if version is None or recorded != version:
+                        changed.add(root_id)
+        return [root_id for root_id in self.bundles if root_id in changed]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a dictionary."""
+        return {root_id: dependencies.to_dict() for root_id, dependencies in self.bundles.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DependencyIndex':
+        """Create an index from the output of ``to_dict``."""
+        index = cls()
+        for root_id, dependencies in data.items():
+            index.record(root_id, BundleDependencies.from_dict(dependencies))
+        return index
+
+    def save(self, path: str) -> None:
+        """Write the index to a JSON file atomically."""
+        write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> 'DependencyIndex':
+        """Read an index written by ``save``, or return an empty index if the file does not exist."""
+        if not Path(path).exists():
+            return cls()
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+class IncrementalMiner:
+    """Mines bundles and keeps them up to date by rebuilding only those whose inputs changed.
+
+    Checking for changes costs bulk searches for the ``updated`` field of every
+    dependency ticket and the version of every dependency page, instead of a full
+    re-crawl of the corpus.
+    """
+
+    def __init__(self, extractor: 'JiraExtractor', index: Optional[DependencyIndex] = None):
+        """Initialize the miner.
+
+        Args:
+            extractor: Extractor used to mine the bundles
+            index: Dependencies of the bundles produced so far
+        """
+        self.extractor = extractor
+        self.index = index if index is not None else DependencyIndex()
+
+    async def mine(self, ticket_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Mine bundles in one shared traversal and record their dependencies.
+
+        Args:
+            ticket_ids: Root ticket IDs
+
+        Returns:
+            Dict mapping each ticket ID to its bundle, or None if the ticket could not be
+            fetched. Bundles that could not be built are removed from the index.
+        """
+        bundles = await self.extractor.mine_many(list(ticket_ids))
+        for root_id, bundle in bundles.items():
+            if bundle is None:
+                self.index.remove(root_id)
+            else:
+                self.index.record(root_id, bundle_dependencies(bundle))
+        return bundles
+
+    async def stale_bundles(self) -> List[str]:
+        """Check every dependency in bulk and list the bundles that need rebuilding."""
+        ticket_versions = await self.extractor.ticket_versions(self.index.tickets())
+        page_ids = self.index.pages()
+        page_versions = await self.extractor.confluence_extractor.get_page_versions(page_ids) if page_ids else {}
+        stale = self.index.changed_bundles(ticket_versions, page_versions)
+        logger.info(f"{len(stale)} of {len(self.index)} bundle(s) have changed inputs")
+        return stale
+
+    async def refresh(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Rebuild the bundles whose inputs changed.
+
+        Returns:
+            Dict mapping the root of each rebuilt bundle to its new bundle, or None if the
+            root ticket could not be fetched any more. Unchanged bundles are left out.
+        """
+        stale = await self.stale_bundles()
+        if not stale:
+            return {}
+        return await self.mine(stale)
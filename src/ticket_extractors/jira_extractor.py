@@ -1,21 +1,37 @@
 import os
 import json
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple, AsyncIterator, Iterable
+from collections import deque
 from atlassian import Jira
 from datetime import datetime
 import sys
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from . import config
 from .confluence_extractor import ConfluenceExtractor
 from .webpage_extractor import WebPageExtractor
-from .url_analyzer import URLAnalyzer
+from .url_analyzer import URLAnalyzer, URLMatch, canonical_key
 from .base_extractor import BaseExtractor
-from .rate_limiter import rate_limited, RateLimitConfig
-from .memory_manager import memory_managed, MemoryManager, MemoryConfig
-from urllib.parse import urlparse
+from .transport import ExecutorTransport, get_default_transport
+from .jql_batch import JQLBatchConfig, KEY_SEARCH_VALIDATION, build_key_jql, chunk_keys, is_rejected_search, search_url_overhead
+from .fetch_planner import FetchPlanner, FetchPlan, payload_size
+from .ticket_cache import TicketCache
+from .reference_graph import ReferenceGraph, TicketReference
+from .normalized_bundle import NormalizedBundle, placeholder_reference
+from .comments import CommentConfig, comment_path, comment_page_starts, newest_comments
+from .bulk_export import BulkExporter, BulkExportConfig, ExportSummary
+from .hierarchy import HierarchyConfig, build_children_jql, parent_references, child_parents
+from .resource_fetch import ResourceFetchConfig, FETCHED_REFERENCES, resource_key
+from .single_flight import SingleFlight
+from .negative_cache import NegativeCache, classify_failure
+from .memory_manager import MemoryManager
+from .traversal import TraversalContext, TraversalBudget, TimeoutConfig, ReferenceQueue, REFERENCE_PRIORITY
+from .bundle_stream import RESOURCE_RECORDS, ticket_record, resource_record, edge_record, truncated_record, encode_record
+from urllib.parse import urlparse, quote
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -29,13 +45,43 @@ def truncate_for_logging(text: str, max_length: int = 100) -> str:
     return f"{text[:max_length]}..."
 
 class JiraExtractor(BaseExtractor):
-    def __init__(self, jira=None, max_reference_depth: int = 2, support_team_file: str = None):
+    def __init__(
+        self,
+        jira=None,
+        max_reference_depth: int = 2,
+        support_team_file: str = None,
+        max_concurrency: int = 10,
+        transport: Optional[ExecutorTransport] = None,
+        batch_config: Optional[JQLBatchConfig] = None,
+        fetch_planner: Optional[FetchPlanner] = None,
+        ticket_cache: Optional[TicketCache] = None,
+        budget: Optional[TraversalBudget] = None,
+        resource_config: Optional[ResourceFetchConfig] = None,
+        comment_config: Optional[CommentConfig] = None,
+        skeleton_crawl: bool = False,
+        hierarchy_config: Optional[HierarchyConfig] = None,
+        timeouts: Optional[TimeoutConfig] = None,
+        negative_cache: Optional[NegativeCache] = None
+    ):
         """Initialize the JiraExtractor.
         
         Args:
             jira: Optional Jira client instance. If not provided, one will be created using environment variables.
             max_reference_depth: Maximum depth for recursive reference processing.
             support_team_file: Optional path to a JSON file containing support team member information.
+            max_concurrency: Maximum number of tickets fetched concurrently within a depth level.
+            transport: Optional transport used to run blocking Jira and Confluence calls. Defaults to the shared transport.
+            batch_config: Optional configuration for fetching each depth level through batched JQL searches.
+            fetch_planner: Optional planner choosing the issue fields requested at each depth.
+            ticket_cache: Optional persistent cache of issue payloads, revalidated by their `updated` field.
+            budget: Optional limits on tickets, time, bytes and API calls per extraction.
+            resource_config: Optional configuration for fetching referenced Confluence pages and documentation.
+            comment_config: Optional configuration for paginated comment fetching.
+            skeleton_crawl: Discover the reference graph from minimal payloads first, within the
+                budget, and fetch the remaining fields only for the tickets discovered.
+            hierarchy_config: Optional configuration for following parents, sub-tasks and epic children.
+            timeouts: Optional deadlines for each request and for each extraction as a whole.
+            negative_cache: Optional cache of failed tickets and pages, skipped until their failure expires.
         """
         super().__init__()
         if jira is None:
@@ -53,26 +99,35 @@ class JiraExtractor(BaseExtractor):
         else:
             self.jira = jira
             
-        self.confluence_extractor = ConfluenceExtractor()
+        self.transport = transport or get_default_transport()
+        self.confluence_extractor = ConfluenceExtractor(transport=self.transport)
         self.webpage_extractor = WebPageExtractor()
         self.url_analyzer = URLAnalyzer()
         self.max_reference_depth = max_reference_depth
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_config = batch_config or JQLBatchConfig()
+        self.fetch_planner = fetch_planner or FetchPlanner()
+        self.ticket_cache = ticket_cache
+        self.budget = budget or TraversalBudget()
+        self.resource_config = resource_config or ResourceFetchConfig()
+        self.comment_config = comment_config or CommentConfig()
+        self.skeleton_crawl = skeleton_crawl
+        self.hierarchy_config = hierarchy_config or HierarchyConfig()
+        self.timeouts = timeouts or TimeoutConfig()
+        self.negative_cache = negative_cache
+        # Stops traversals at the memory limits, sampling memory at most every half second
+        self.memory_manager = MemoryManager()
+        # Concurrent extractions requesting the same ticket, page or URL share one fetch
+        self.single_flight = SingleFlight()
+        
+        # Payload statistics of the most recently completed extraction
+        self.fetch_stats = self.fetch_planner.new_stats()
+        # Deduplication statistics of the most recent mine_many call
+        self.mining_stats = {}
         
         # Load support team members
         self.support_team = self._load_support_team(support_team_file)
         
-        # Track processed content to avoid cycles
-        self.processed_ids = set()
-        self.failed_urls = []
-        
-        # Statistics for reference tracking
-        self.reference_stats = {
-            'total_references': 0,
-            'by_type': {},
-            'by_depth': {},
-            'failed_fetches': 0
-        }
-        
         # Create sync versions of async methods
         self.get_ticket_sync = self._make_sync(self.get_ticket)
     
@@ -88,224 +143,1631 @@ class JiraExtractor(BaseExtractor):
             logger.warning(f"Failed to load support team config: {str(e)}")
             return set()
 
-    async def get_ticket(self, ticket_id: str) -> Dict[str, Any]:
+    def new_context(self, max_concurrency: Optional[int] = None) -> TraversalContext:
+        """
+        Create the state for a single extraction.
+        
+        Args:
+            max_concurrency: Maximum number of concurrent fetches (defaults to ``max_concurrency``)
+            
+        Returns:
+            A fresh TraversalContext
+        """
+        context = TraversalContext(
+            max_concurrency=max_concurrency or self.max_concurrency,
+            fetch_stats=self.fetch_planner.new_stats(),
+            budget=self.budget,
+            resource_limits=self.resource_config.pool_limits(),
+            node_timeout=self.timeouts.node_seconds,
+            memory=self.memory_manager
+        )
+        if self.timeouts.bundle_seconds is not None:
+            context.deadline = context.started_at + self.timeouts.bundle_seconds
+        return context
+
+    async def get_ticket(self, ticket_id: str, context: Optional[TraversalContext] = None) -> Dict[str, Any]:
         """
         Extract a single ticket and all its referenced content.
         
+        Each call works on its own traversal context, so concurrent calls on the same
+        extractor are independent.
+        
         Args:
             ticket_id: The Jira ticket ID (e.g., "PROJ-123")
+            context: Optional traversal context, to read its statistics after the call
             
         Returns:
             Dict containing the ticket data and all referenced content
         """
         logger.info(f"Extracting ticket: {ticket_id}")
-        return await self._get_ticket_with_references(ticket_id, depth=0)
+        context = context or self.new_context()
+        bundle = await self._get_ticket_with_references(ticket_id, context, depth=0)
+        self.fetch_stats = context.fetch_stats
+        return bundle
 
-    async def _get_ticket_with_references(self, ticket_id: str, depth: int = 0, parent_id: str = None) -> Optional[Dict[str, Any]]:
+    async def mine_many(
+        self,
+        ticket_ids: List[str],
+        concurrency: Optional[int] = None,
+        context: Optional[TraversalContext] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
         """
-        Fetch a Jira ticket by its ID and recursively process its references.
+        Extract several tickets in one shared traversal.
+        
+        All roots are crawled together, so a ticket referenced from many roots is fetched
+        once. Each root's bundle is then assembled from the shared store and is identical
+        to what ``get_ticket`` returns for that root on a fresh extractor. Deduplication
+        statistics are available in ``mining_stats`` afterwards.
+        
+        Args:
+            ticket_ids: The Jira ticket IDs to extract
+            concurrency: Maximum number of concurrent fetches (defaults to ``max_concurrency``)
+            context: Optional traversal context, to read its statistics after the call
+            
+        Returns:
+            Dict mapping each ticket ID to its bundle, or None if the ticket could not be fetched
+        """
+        context = context or self.new_context(concurrency)
+        normalized, graph = await self._crawl_normalized(ticket_ids, context)
+        bundles = normalized.expand_all()
+        
+        mining_stats = self._dedup_stats(bundles, graph)
+        logger.info(
+            f"Shared traversal fetched {mining_stats['unique_tickets']} unique ticket(s) "
+            f"for {mining_stats['ticket_references']} ticket reference(s) across {len(bundles)} bundle(s)"
+        )
+        self.mining_stats = mining_stats
+        return bundles
+
+    async def mine_many_normalized(
+        self,
+        ticket_ids: List[str],
+        concurrency: Optional[int] = None,
+        context: Optional[TraversalContext] = None
+    ) -> NormalizedBundle:
+        """
+        Extract several tickets in one shared traversal, in normalized form.
+        
+        Every ticket appears once in the node table however many paths reach it, and
+        each reference is an edge carrying the context it was found in. Use
+        ``NormalizedBundle.expand`` to get the nested bundle of a root.
+        
+        Args:
+            ticket_ids: The Jira ticket IDs to extract
+            concurrency: Maximum number of concurrent fetches (defaults to ``max_concurrency``)
+            context: Optional traversal context, to read its statistics after the call
+            
+        Returns:
+            NormalizedBundle holding every root
+        """
+        context = context or self.new_context(concurrency)
+        normalized, _ = await self._crawl_normalized(ticket_ids, context)
+        return normalized
+
+    async def get_ticket_normalized(self, ticket_id: str, context: Optional[TraversalContext] = None) -> NormalizedBundle:
+        """
+        Extract a single ticket and its references in normalized form.
+        
+        Args:
+            ticket_id: The Jira ticket ID (e.g., "PROJ-123")
+            context: Optional traversal context, to read its statistics after the call
+            
+        Returns:
+            NormalizedBundle whose only root is ``ticket_id``
+        """
+        return await self.mine_many_normalized([ticket_id], context=context)
+
+    async def _crawl_normalized(self, ticket_ids: List[str], context: TraversalContext) -> Tuple[NormalizedBundle, ReferenceGraph]:
+        """Crawl several roots in one traversal and normalize the result."""
+        roots = list(dict.fromkeys(ticket_ids))
+        logger.info(f"Extracting {len(roots)} ticket(s) in a shared traversal")
+        
+        graph = await self._crawl_references(roots, context, 0)
+        normalized = NormalizedBundle.from_graph(graph, roots, self.max_reference_depth)
+        self.fetch_stats = context.fetch_stats
+        return normalized, graph
+
+    async def stream_ticket(self, ticket_id: str, context: Optional[TraversalContext] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract a ticket and its references as a stream of records.
+        
+        The root ticket is yielded first, then every referenced ticket as soon as its
+        level of the traversal resolves. Records for the Confluence pages and
+        documentation a ticket references follow once they are fetched; other URLs
+        follow the ticket directly. Ticket records name their
+        parent and the context of the reference; references to tickets already emitted
+        under another parent are yielded as edge records, and tickets left unfetched by
+        the traversal budget as truncated records. Ticket and page data is not retained
+        after it is yielded: later references to a page or document already yielded
+        are marked ``is_processed_reference`` instead of carrying its data again.
+        
+        Args:
+            ticket_id: The Jira ticket ID (e.g., "PROJ-123")
+            context: Optional traversal context, to read its statistics after the stream ends
+            
+        Yields:
+            Record dictionaries (see ``bundle_stream``)
+        """
+        context = context or self.new_context()
+        logger.info(f"Streaming ticket: {ticket_id}")
+        
+        seen = set(context.processed_ids)
+        if ticket_id in seen:
+            return
+        seen.add(ticket_id)
+        emitted: Set[str] = set(context.processed_ids)
+        unavailable: Set[str] = set()
+        pending_edges: Dict[str, List[Tuple[str, str]]] = {}
+        pending_resources = []
+        frontier = [(ticket_id, None, None, 'root')]
+        depth = 0
+        
+        while frontier:
+            frontier, truncated = self._budget_frontier(frontier, context)
+            for key, parent, reference_context, _ in truncated:
+                unavailable.add(key)
+                yield truncated_record(key, parent, reference_context, context.truncated_reason)
+            if not frontier:
+                break
+            
+            keys = [key for key, _, _, _ in frontier]
+            payloads = await self._fetch_level_payloads(keys, depth, context)
+            context.tickets_fetched += len(keys)
+            
+            async def expand(entry, payload):
+                return entry, await self._expand_ticket(entry[0], payload, context)
+            
+            references_by_key = {}
+            for next_expansion in asyncio.as_completed([expand(entry, payload) for entry, payload in zip(frontier, payloads)]):
+                (key, parent, reference_context, _), expansion = await next_expansion
+                if expansion is None:
+                    unavailable.add(key)
+                    context.record_failure(f"{config.JIRA_URL}/browse/{key}")
+                    if key in context.timed_out:
+                        yield truncated_record(key, parent, reference_context, 'timeout', context.timed_out[key])
+                    continue
+                
+                ticket_data, references = expansion
+                emitted.add(key)
+                context.processed_ids.add(key)
+                if depth > 0:
+                    context.update_stats('jira', depth)
+                
+                yield ticket_record(ticket_data, depth, parent, reference_context)
+                scheduled = {id(reference): task for reference, task in self._schedule_resources(ticket_data, depth, context)}
+                for ref_type in RESOURCE_RECORDS:
+                    for reference in ticket_data['references'][ref_type]:
+                        if id(reference) in scheduled:
+                            pending_resources.append((ref_type, reference, key, depth, scheduled[id(reference)]))
+                        else:
+                            if ref_type in FETCHED_REFERENCES and resource_key(ref_type, reference) in context.streamed_resources:
+                                # Its data was yielded with an earlier record
+                                reference['is_processed_reference'] = True
+                            yield resource_record(ref_type, reference, key, depth)
+                for source, edge_context in pending_edges.pop(key, []):
+                    yield edge_record(source, key, edge_context)
+                references_by_key[key] = references
+                
+                for record in self._settled_resource_records(pending_resources, context):
+                    yield record
+            
+            # Edges to tickets of this level that failed or were truncated are dropped
+            pending_edges.clear()
+            await self._add_child_references(references_by_key, depth, context)
+            
+            next_frontier = []
+            for key in keys:
+                for reference in references_by_key.get(key, []):
+                    if reference.key in unavailable:
+                        continue
+                    if reference.key == key or reference.key in emitted:
+                        yield edge_record(key, reference.key, reference.context)
+                    elif reference.key in seen:
+                        pending_edges.setdefault(reference.key, []).append((key, reference.context))
+                    elif depth + 1 <= self.max_reference_depth:
+                        seen.add(reference.key)
+                        next_frontier.append((reference.key, key, reference.context, reference.kind))
+            
+            frontier = next_frontier
+            depth += 1
+        
+        # Pages still being fetched are yielded as they complete, until the deadline
+        while pending_resources:
+            tasks = list({id(entry[4]): entry[4] for entry in pending_resources}.values())
+            done, pending = await asyncio.wait(tasks, timeout=context.time_left(), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                await self._cancel_resources(pending)
+            for record in self._settled_resource_records(pending_resources, context):
+                yield record
+        
+        await self._flush_negative_cache()
+        self.fetch_stats = context.fetch_stats
+
+    def _settled_resource_records(self, pending_resources: List[Tuple], context: TraversalContext) -> List[Dict[str, Any]]:
+        """
+        Remove the completed fetches from a stream's pending resources and build their records.
+        
+        Once no pending reference waits for a fetch any more, the fetch and its result are
+        released and only the resource key is remembered, so memory stays bounded by the
+        resources in flight rather than growing with the crawl.
+        """
+        records = []
+        for entry in [entry for entry in pending_resources if entry[4].done()]:
+            ref_type, reference, parent, parent_depth, task = entry
+            pending_resources.remove(entry)
+            self._attach_resource(reference, task, context)
+            records.append(resource_record(ref_type, reference, parent, parent_depth))
+            if not any(other[4] is task for other in pending_resources):
+                key = resource_key(ref_type, reference)
+                context.resource_tasks.pop(key, None)
+                context.streamed_resources.add(key)
+        return records
+
+    async def stream_ticket_ndjson(self, ticket_id: str, context: Optional[TraversalContext] = None) -> AsyncIterator[str]:
+        """
+        Extract a ticket and its references as NDJSON lines.
+        
+        Args:
+            ticket_id: The Jira ticket ID (e.g., "PROJ-123")
+            context: Optional traversal context, to read its statistics after the stream ends
+            
+        Yields:
+            One JSON-encoded record per line, as produced by ``stream_ticket``
+        """
+        async for record in self.stream_ticket(ticket_id, context):
+            yield encode_record(record)
+
+    async def export_jql(self, jql: str, output_dir: str, config: Optional[BulkExportConfig] = None) -> ExportSummary:
+        """
+        Mine every ticket matching a JQL query into NDJSON shards.
+        
+        Running the same query against the same directory again resumes an interrupted
+        export without refetching the tickets already written.
+        
+        Args:
+            jql: JQL query selecting the tickets (e.g. "project = SUPPORT AND updated >= -7d")
+            output_dir: Directory for the shards and the checkpoint
+            config: Optional export configuration
+            
+        Returns:
+            ExportSummary
+        """
+        return await BulkExporter(self, output_dir, config).run(jql)
+
+    async def ticket_versions(self, ticket_ids: List[str], context: Optional[TraversalContext] = None) -> Dict[str, str]:
+        """
+        Get the current ``updated`` value of many tickets with bulk JQL searches.
+        
+        Args:
+            ticket_ids: Ticket IDs to check
+            context: Optional traversal context, to read its statistics after the call
+            
+        Returns:
+            Dict mapping ticket keys to their ``updated`` value. Deleted tickets and
+            tickets whose search failed are left out.
+        """
+        if not ticket_ids:
+            return {}
+        return await self._fetch_updated_timestamps(ticket_ids, context or self.new_context())
+
+    async def _get_ticket_with_references(self, ticket_id: str, context: TraversalContext, depth: int = 0, parent_id: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a Jira ticket and its references breadth-first.
         
         Args:
             ticket_id: The Jira ticket ID (e.g., 'SUPPORT-123')
-            depth: Current depth in reference chain
-            parent_id: ID of the parent ticket to create placeholder references
+            context: State of the current extraction
+            depth: Depth of ``ticket_id`` in the reference chain
+            parent_id: ID of the ticket referencing ``ticket_id``, if any
             
         Returns:
             Dict containing the ticket data and its references, or a reference to an already processed ticket
         """
-        # If this is a reference to the parent ticket, return a placeholder reference
         if parent_id and ticket_id == parent_id:
             logger.info(f"Creating placeholder reference for parent ticket {parent_id}")
-            return {
-                'id': ticket_id,
-                'url': f"{config.JIRA_URL}/browse/{ticket_id}",
-                'context': "Previously processed ticket",
-                'metadata': {
-                    'platform': 'knowledge_base',
-                    'resource_type': 'jira_ticket',
-                    'resource_id': ticket_id,
-                    'ticket_id': ticket_id,
-                    'is_parent_reference': True,
-                    'is_processed_reference': True
-                }
-            }
+            return self._placeholder_reference(ticket_id, is_parent_reference=True)
             
-        # Check if we've already processed this ticket
-        if ticket_id in self.processed_ids:
-            logger.info(f"Creating placeholder reference for {'parent' if ticket_id == parent_id else 'already processed'} ticket {ticket_id}")
-            # Return a reference to the already processed ticket
-            return {
-                'id': ticket_id,
-                'url': f"{config.JIRA_URL}/browse/{ticket_id}",
-                'context': "Previously processed ticket",
-                'metadata': {
-                    'platform': 'knowledge_base',
-                    'resource_type': 'jira_ticket',
-                    'resource_id': ticket_id,
-                    'ticket_id': ticket_id,
-                    'is_parent_reference': ticket_id == parent_id,
-                    'is_processed_reference': True
-                }
-            }
+        if ticket_id in context.processed_ids:
+            logger.info(f"Creating placeholder reference for already processed ticket {ticket_id}")
+            return self._placeholder_reference(ticket_id)
             
-        # Check depth limit
         if depth > self.max_reference_depth:
             logger.info(f"Reached max depth ({self.max_reference_depth}) for {ticket_id}")
             return None
+        
+        graph = await self._crawl_references([ticket_id], context, depth)
+        normalized = NormalizedBundle.from_graph(
+            graph, [ticket_id], self.max_reference_depth, depth=depth, claimed=context.processed_ids
+        )
+        return normalized.expand(ticket_id, claimed=context.processed_ids, depth=depth)
+
+    async def _crawl_references(self, root_ids: List[str], context: TraversalContext, depth: int = 0) -> ReferenceGraph:
+        """
+        Fetch the root tickets and every ticket they reference, breadth-first.
+        
+        Every ticket discovered at the same depth is fetched concurrently (bounded by
+        ``max_concurrency``), and each ticket is fetched once however many roots or
+        tickets reference it. Tickets are stored with their references in discovery
+        order, so bundles assembled from the graph do not depend on which fetch
+        completes first.
+        
+        Referenced Confluence pages and documentation are fetched in the background
+        while the crawl moves on to the next level, each kind in its own pool, and are
+        attached to their references before the graph is returned.
+        
+        Under a traversal budget, tickets at the same depth are fetched in priority order
+        (parents, issue links, children, description links, then comment mentions) and in slices, so
+        the crawl can stop once a limit is reached. Tickets left in the queue are marked
+        as truncated in the graph.
+        
+        Args:
+            root_ids: Ticket IDs to start from
+            context: State of the current extraction. Tickets it has already processed are not fetched again.
+            depth: Depth of the root tickets in the reference chain
+            
+        Returns:
+            ReferenceGraph holding every fetched ticket
+        """
+        if self.skeleton_crawl:
+            return await self._crawl_skeleton(root_ids, context, depth)
+            
+        graph = ReferenceGraph()
+        seen = set(context.processed_ids)
+        resources = []
+        queue = ReferenceQueue()
+        for root_id in root_ids:
+            if root_id not in seen:
+                seen.add(root_id)
+                queue.push(root_id, depth, 'root')
+        
+        while queue:
+            reason = context.exhausted_budget()
+            if reason:
+                truncated = queue.drain()
+                for key in truncated:
+                    graph.mark_truncated(key)
+                context.truncated_reason = reason
+                logger.warning(f"Traversal budget {reason} reached, {len(truncated)} ticket(s) left unfetched")
+                break
             
+            depth = queue.next_depth()
+            frontier = queue.pop_level(self._slice_size(context))
+            logger.info(f"Fetching {len(frontier)} ticket(s) at depth {depth}")
+            level = await self._expand_level_by_deadline(frontier, depth, graph, queue, context)
+            context.tickets_fetched += len(frontier)
+            if level is None:
+                break
+            
+            for key, (_, expansion) in zip(frontier, level):
+                if expansion is None:
+                    if key in context.timed_out:
+                        graph.mark_unfinished(key, 'timeout', context.timed_out[key])
+                    else:
+                        graph.add(key, depth, None)
+                    context.record_failure(f"{config.JIRA_URL}/browse/{key}")
+                    continue
+                    
+                ticket_data, references = expansion
+                graph.add(key, depth, ticket_data, references)
+                resources.extend(self._schedule_resources(ticket_data, depth, context))
+                if depth > 0:
+                    context.update_stats('jira', depth)
+                if depth + 1 > self.max_reference_depth:
+                    continue
+                    
+                for reference in references:
+                    if reference.key not in seen:
+                        seen.add(reference.key)
+                        queue.push(reference.key, depth + 1, reference.kind)
+        
+        await self._attach_resources(resources, context)
+        await self._flush_negative_cache()
+        self._log_fetch_stats(context)
+        return graph
+
+    async def _crawl_skeleton(self, root_ids: List[str], context: TraversalContext, depth: int = 0) -> ReferenceGraph:
+        """
+        Discover the reference graph from skeleton payloads, then complete the tickets discovered.
+        
+        Phase 1 fetches only the fields links are discovered from (issue links, the
+        hierarchy fields and the description) for the tickets within
+        ``max_reference_depth``, in the order and under the budget ``_crawl_references``
+        uses, so ``max_tickets`` stops discovery itself. Comments are not scanned for
+        links while discovering. Phase 2 fetches the remaining fields, comments included,
+        of the tickets discovered, level by level, and expands them in full. Tickets only
+        mentioned in comments are listed as truncated rather than fetched, and only
+        discovered tickets have their referenced pages fetched.
+        
+        Args:
+            root_ids: Ticket IDs to start from
+            context: State of the current extraction. Tickets it has already processed are not fetched again.
+            depth: Depth of the root tickets in the reference chain
+            
+        Returns:
+            ReferenceGraph holding every discovered ticket
+        """
+        graph = ReferenceGraph()
+        seen = set(context.processed_ids)
+        skeletons: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        order: List[str] = []
+        levels: Dict[int, List[str]] = {}
+        queue = ReferenceQueue()
+        for root_id in root_ids:
+            if root_id not in seen:
+                seen.add(root_id)
+                queue.push(root_id, depth, 'root')
+        
+        while queue:
+            reason = context.exhausted_budget()
+            if reason:
+                truncated = queue.drain()
+                for key in truncated:
+                    graph.mark_truncated(key)
+                context.truncated_reason = reason
+                logger.warning(f"Traversal budget {reason} reached, {len(truncated)} ticket(s) left undiscovered")
+                break
+            
+            depth = queue.next_depth()
+            frontier = queue.pop_level(self._slice_size(context))
+            logger.info(f"Fetching {len(frontier)} skeleton(s) at depth {depth}")
+            level = await self._expand_level_by_deadline(frontier, depth, graph, queue, context, discovery=True)
+            context.tickets_fetched += len(frontier)
+            if level is None:
+                break
+            
+            for key, (payload, expansion) in zip(frontier, level):
+                order.append(key)
+                if expansion is None:
+                    if key in context.timed_out:
+                        graph.mark_unfinished(key, 'timeout', context.timed_out[key])
+                    else:
+                        graph.add(key, depth, None)
+                    continue
+                    
+                ticket_data, references = expansion
+                graph.add(key, depth, ticket_data, references)
+                skeletons[key] = payload
+                levels.setdefault(depth, []).append(key)
+                if depth + 1 > self.max_reference_depth:
+                    continue
+                    
+                for reference in references:
+                    if reference.key not in seen:
+                        seen.add(reference.key)
+                        queue.push(reference.key, depth + 1, reference.kind)
+        
+        for level_depth, keys in sorted(levels.items()):
+            await self._complete_skeletons(keys, level_depth, skeletons, graph, context)
+            if level_depth + 1 > self.max_reference_depth:
+                continue
+            # Tickets first found in comments were not discovered, so they are listed unfetched
+            for key in keys:
+                node = graph.get(key)
+                for reference in (node.references if node is not None else []):
+                    if reference.key not in seen:
+                        seen.add(reference.key)
+                        graph.mark_truncated(reference.key)
+        
+        resources = []
+        for key in order:
+            node = graph.get(key)
+            if node is None or node.failed:
+                context.record_failure(f"{config.JIRA_URL}/browse/{key}")
+                continue
+            resources.extend(self._schedule_resources(node.data, node.depth, context))
+            if node.depth > 0:
+                context.update_stats('jira', node.depth)
+        
+        await self._attach_resources(resources, context)
+        await self._flush_negative_cache()
+        self._log_fetch_stats(context)
+        return graph
+
+    async def _complete_skeletons(
+        self,
+        ticket_ids: List[str],
+        depth: int,
+        skeletons: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+        graph: ReferenceGraph,
+        context: TraversalContext
+    ) -> None:
+        """
+        Fetch the fields a level's skeleton payloads left out and expand the tickets in full.
+        
+        Only the remaining fields, comments included, are requested, in bulk. Tickets
+        whose payload already holds them (for example, full payloads served by the ticket
+        cache) are not fetched again. Each ticket is then expanded from its completed
+        payload, so its data, comments and references match a normal crawl; the children
+        found while discovering are kept.
+        
+        Args:
+            ticket_ids: Discovered tickets of the level
+            depth: Depth of the tickets in the reference chain
+            skeletons: Skeleton (issue, comments) payloads by ticket key
+            graph: Graph holding the tickets; tickets that cannot be completed are marked failed
+            context: State of the current extraction
+        """
+        discovery = self._plan_for_depth(depth, skeleton=True)
+        remainder = self._plan_for_depth(depth).remainder()
+        payloads = {key: skeletons[key] for key in ticket_ids}
+        incomplete = [key for key in ticket_ids if remainder is not None and not remainder.covered_by(skeletons[key][0])]
+        
+        if incomplete:
+            completed = []
+            fetched = await self._fetch_level_payloads(incomplete, depth, context, plan=remainder, store=False)
+            for key, payload in zip(incomplete, fetched):
+                if payload is None:
+                    del payloads[key]
+                    if key in context.timed_out:
+                        graph.mark_unfinished(key, 'timeout', context.timed_out[key])
+                    else:
+                        graph.add(key, depth, None)
+                    continue
+                # Payloads may be shared with concurrent extractions, so merge into a copy
+                skeleton = skeletons[key][0]
+                issue = {**skeleton, 'fields': {**skeleton.get('fields', {}), **payload[0].get('fields', {})}}
+                payloads[key] = (issue, payload[1])
+                completed.append(key)
+            self._record_savings(context, self._plan_for_depth(depth), [payloads[key][0] for key in completed])
+            
+            if self.ticket_cache:
+                await self.transport.call(self.ticket_cache.put_many, [
+                    (key, payloads[key][0], payloads[key][1], tuple(discovery.fields) + remainder.fields)
+                    for key in completed
+                    if payloads[key][1] is not None
+                ])
+        
+        expansions = await asyncio.gather(*(self._expand_ticket(key, payloads[key], context) for key in payloads))
+        for key, expansion in zip(payloads, expansions):
+            if expansion is None:
+                graph.add(key, depth, None)
+                continue
+            ticket_data, references = expansion
+            # Children come from bulk searches made while discovering, not from the payload
+            by_key = {reference.key: reference for reference in references}
+            for reference in graph.get(key).references:
+                if reference.kind == 'child':
+                    self._add_ticket_reference(by_key, reference)
+            graph.add(key, depth, ticket_data, list(by_key.values()))
+
+    async def _expand_level(
+        self,
+        frontier: List[str],
+        depth: int,
+        context: TraversalContext,
+        discovery: bool = False
+    ) -> List[Tuple[Optional[Tuple[Dict[str, Any], Any]], Optional[Tuple[Dict[str, Any], List[TicketReference]]]]]:
+        """
+        Fetch and expand the tickets of a level, adding their children to their references.
+        
+        With ``discovery``, only the skeleton fields are fetched, the payloads are not
+        stored in the ticket cache, and comments are not scanned for references, even
+        when the cache holds them.
+        
+        Returns:
+            List of (payload, expansion) pairs in the order of ``frontier``
+        """
+        if discovery:
+            payloads = await self._fetch_level_payloads(
+                frontier, depth, context, plan=self._plan_for_depth(depth, skeleton=True), store=False
+            )
+            expanded = [payload and (payload[0], {'comments': []}) for payload in payloads]
+        else:
+            payloads = expanded = await self._fetch_level_payloads(frontier, depth, context)
+        expansions = await asyncio.gather(
+            *(self._expand_ticket(key, payload, context) for key, payload in zip(frontier, expanded))
+        )
+        await self._add_child_references(
+            {key: expansion[1] for key, expansion in zip(frontier, expansions) if expansion is not None},
+            depth,
+            context
+        )
+        return list(zip(payloads, expansions))
+
+    async def _expand_level_by_deadline(
+        self,
+        frontier: List[str],
+        depth: int,
+        graph: ReferenceGraph,
+        queue: ReferenceQueue,
+        context: TraversalContext,
+        discovery: bool = False
+    ) -> Optional[List[Tuple]]:
+        """
+        Expand a level, cancelling its in-flight requests if the extraction deadline passes first.
+        
+        When the deadline passes, the level's tickets are marked in the graph as cancelled,
+        with the time spent on them, and the tickets still queued as truncated.
+        
+        Returns:
+            The result of ``_expand_level``, or None if the level was cancelled
+        """
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(self._expand_level(frontier, depth, context, discovery), context.time_left())
+        except asyncio.TimeoutError:
+            if not context.deadline_passed:
+                raise
+        
+        elapsed = time.monotonic() - started
+        for key in frontier:
+            graph.mark_unfinished(key, 'cancelled', elapsed)
+        truncated = queue.drain()
+        for key in truncated:
+            graph.mark_truncated(key)
+        context.truncated_reason = 'deadline'
+        logger.warning(f"Deadline reached, {len(frontier)} ticket(s) cancelled and {len(truncated)} left unfetched")
+        return None
+
+    async def _add_child_references(
+        self,
+        references_by_key: Dict[str, List[TicketReference]],
+        depth: int,
+        context: TraversalContext
+    ) -> None:
+        """
+        Append the children of a level's tickets to their references.
+        
+        Children are found with bulk ``parent in (...)`` (and epic link) searches for the
+        whole level, so they enter the traversal one level deeper like any other
+        reference. Children a ticket already references are not added again.
+        
+        Args:
+            references_by_key: References of each expanded ticket, updated in place
+            depth: Depth of the tickets in the reference chain
+            context: State of the current extraction
+        """
+        hierarchy = self.hierarchy_config
+        if not hierarchy.enabled or not hierarchy.children or not references_by_key:
+            return
+        if depth + 1 > self.max_reference_depth:
+            return
+            
+        children = await self._fetch_children(list(references_by_key), context)
+        for key, child_references in children.items():
+            references = references_by_key[key]
+            referenced = {reference.key for reference in references}
+            for child_key, child_context in child_references[:hierarchy.max_children]:
+                if child_key not in referenced:
+                    referenced.add(child_key)
+                    references.append(TicketReference(child_key, child_context, 'child'))
+
+    async def _fetch_children(self, ticket_ids: List[str], context: TraversalContext) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Find the sub-tasks, child issues and epic children of tickets with paginated JQL searches.
+        
+        Tickets are searched in URL-length-bounded chunks; the pages of each search after
+        the first are fetched concurrently.
+        
+        Args:
+            ticket_ids: Parent ticket IDs
+            context: State of the current extraction
+            
+        Returns:
+            Dict mapping parent keys to (child key, context) pairs, ordered by child key.
+            Chunks whose search failed are left out.
+        """
+        hierarchy = self.hierarchy_config
+        fields = ','.join(f for f in ('parent', hierarchy.epic_link_field) if f)
+        # The query without keys bounds everything but the key lists
+        overhead = search_url_overhead(config.JIRA_URL, fields) + len(quote(build_children_jql([], hierarchy), safe=''))
+        batch_config = self.batch_config
+        if hierarchy.epic_link_field:
+            # Every key appears in both the parent and the epic link clause
+            batch_config = replace(batch_config, max_url_length=batch_config.max_url_length // 2)
+        
+        async def search_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            jql = build_children_jql(chunk, hierarchy)
+            
+            async def search_page(start: int) -> Dict[str, Any]:
+                async with context.semaphore:
+                    result = await self._call_jira(
+                        context,
+                        self.jira.jql,
+                        jql,
+                        fields=fields,
+                        start=start,
+                        limit=hierarchy.page_size,
+                        validate_query=KEY_SEARCH_VALIDATION
+                    )
+                if not isinstance(result, dict) or not isinstance(result.get('issues'), list):
+                    raise ValueError("Unexpected search response")
+                self._record_payload(context, result)
+                return result
+            
+            try:
+                first_page = await search_page(0)
+                pages = [first_page]
+                total = first_page.get('total', 0)
+                received = len(first_page['issues'])
+                if 0 < received < total:
+                    pages.extend(await asyncio.gather(
+                        *(search_page(start) for start in range(received, total, received))
+                    ))
+            except Exception as e:
+                logger.warning(f"Child search failed for {len(chunk)} ticket(s): {str(e)}")
+                return []
+            return [issue for page in pages for issue in page['issues']]
+        
+        parent_keys = set(ticket_ids)
+        children: Dict[str, List[Tuple[str, str]]] = {}
+        for issues in await asyncio.gather(
+            *(search_chunk(chunk) for chunk in chunk_keys(ticket_ids, batch_config, overhead))
+        ):
+            for issue in issues:
+                for parent_key, child_context in child_parents(issue.get('fields') or {}, parent_keys, hierarchy):
+                    children.setdefault(parent_key, []).append((issue['key'], child_context))
+        return children
+
+    async def _flush_negative_cache(self) -> None:
+        """Write the failures recorded during an extraction, once, without blocking the event loop."""
+        cache = self.negative_cache
+        if cache is None or cache.path is None or not cache.dirty:
+            return
         try:
-            issue = self.jira.issue(ticket_id)
-            
-            # Extract the most important fields
-            ticket_data = {
-                'id': issue['key'],
-                'summary': issue['fields']['summary'],
-                'description': issue['fields']['description'],
-                'status': issue['fields']['status']['name'],
-                'created': issue['fields']['created'],
-                'updated': issue['fields']['updated'],
-                'priority': issue['fields']['priority']['name'] if 'priority' in issue['fields'] else 'None',
-                'assignee': issue['fields']['assignee']['displayName'] if issue['fields'].get('assignee') else 'Unassigned',
-                'reporter': issue['fields']['reporter']['displayName'] if issue['fields'].get('reporter') else 'Unknown',
-                'labels': issue['fields'].get('labels', []),
-                'comments': [],
-                'references': {
-                    'confluence_pages': [],
-                    'jira_tickets': [],
-                    'other_urls': [],
-                    'scrapable_documentation': []
+            await self.transport.call(cache.flush)
+        except OSError as e:
+            logger.warning(f"Failed to write the negative cache: {str(e)}")
+
+    def _log_fetch_stats(self, context: TraversalContext) -> None:
+        """Log the payload statistics of a crawl."""
+        saved = context.fetch_stats.estimated_bytes_saved
+        logger.info(
+            f"Fetched {context.fetch_stats.payloads} payload(s), {context.fetch_stats.bytes_received} bytes"
+            + (f", ~{saved} bytes saved by field projection" if saved is not None else "")
+        )
+
+    def _schedule_resources(self, ticket_data: Dict[str, Any], depth: int, context: TraversalContext) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        """
+        Start fetching the Confluence pages and documentation a ticket references.
+        
+        Each resource is fetched once per extraction, however many tickets reference it.
+        
+        Args:
+            ticket_data: Ticket data whose references should be resolved
+            depth: Depth of the ticket in the reference chain
+            context: State of the current extraction
+            
+        Returns:
+            List of (reference, fetch) pairs, to pass to ``_attach_resources``
+        """
+        if not self.resource_config.enabled:
+            return []
+            
+        scheduled = []
+        for ref_type, pool in FETCHED_REFERENCES.items():
+            for reference in ticket_data['references'][ref_type]:
+                key = resource_key(ref_type, reference)
+                if key in context.streamed_resources:
+                    continue
+                if key not in context.resource_tasks:
+                    context.resource_tasks[key] = asyncio.ensure_future(
+                        self._fetch_resource(pool, key, reference['url'], depth, context)
+                    )
+                scheduled.append((reference, context.resource_tasks[key]))
+        return scheduled
+
+    async def _fetch_resource(
+        self,
+        pool: str,
+        key: str,
+        url: str,
+        depth: int,
+        context: TraversalContext
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Fetch a Confluence page or web page within its pool's concurrency limit.
+        
+        A fetch of the same resource already in flight for a concurrent extraction is
+        joined instead of repeated.
+        
+        Args:
+            pool: 'confluence' or 'webpage'
+            key: Key identifying the resource, from ``resource_key``
+            url: URL of the resource
+            depth: Depth of the referencing ticket
+            context: State of the current extraction
+            
+        Returns:
+            Tuple of (page data, error message, unfinished); exactly one of the first two is
+            None. Unfinished holds the status and seconds spent if the fetch timed out.
+        """
+        extractor = self.confluence_extractor if pool == 'confluence' else self.webpage_extractor
+        unfinished = None
+        known_failure = self.negative_cache.get(key) if self.negative_cache is not None else None
+        if known_failure:
+            context.record_failure(url)
+            return None, f"Skipped, failed recently ({known_failure.failure_class}): {known_failure.error}", None
+            
+        async with context.resource_semaphore(pool):
+            started = context.resource_started[url] = time.monotonic()
+            timeout = context.call_timeout()
+            fetch = (
+                (lambda: extractor.get_page_from_url(url)) if timeout is None
+                else (lambda: extractor.get_page_from_url(url, timeout=timeout))
+            )
+            try:
+                data = await self.single_flight.do((pool, key), fetch)
+            except asyncio.TimeoutError:
+                elapsed = time.monotonic() - started
+                logger.warning(f"Fetching {pool} resource {url} timed out after {elapsed:.1f}s")
+                data, error = None, f"Timed out after {elapsed:.1f}s"
+                unfinished = {'status': 'timeout', 'elapsed_seconds': round(elapsed, 3)}
+                failure_class = None if context.deadline_passed else 'timeout'
+            except Exception as e:
+                logger.error(f"Failed to fetch {pool} resource {url}: {str(e)}")
+                data, error = None, str(e)
+                failure_class = classify_failure(e)
+            else:
+                error = None if data else "Resource could not be fetched"
+                failure_class = None if data else 'unavailable'
+                
+        if data is None:
+            context.record_failure(url)
+            if self.negative_cache is not None and failure_class:
+                self.negative_cache.record(key, failure_class, error)
+        else:
+            context.update_stats(pool, depth)
+        return data, error, unfinished
+
+    async def _attach_resources(self, scheduled: List[Tuple[Dict[str, Any], asyncio.Future]], context: TraversalContext) -> None:
+        """Wait for scheduled resource fetches until the deadline and attach their results to the references."""
+        if not scheduled:
+            return
+        tasks = list({id(task): task for _, task in scheduled}.values())
+        _, pending = await asyncio.wait(tasks, timeout=context.time_left())
+        await self._cancel_resources(pending)
+        for reference, task in scheduled:
+            self._attach_resource(reference, task, context)
+
+    async def _cancel_resources(self, tasks: Iterable[asyncio.Future]) -> None:
+        """Cancel resource fetches and wait for them to clean up (e.g. close their browser)."""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        logger.warning(f"Deadline reached, cancelling {len(tasks)} resource fetch(es)")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _attach_resource(self, reference: Dict[str, Any], task: asyncio.Future, context: TraversalContext) -> None:
+        """Store a completed fetch on a reference as 'data', or 'error' if it failed or did not finish."""
+        if task.cancelled():
+            started = context.resource_started.get(reference['url'])
+            reference['error'] = "Cancelled at the extraction deadline"
+            reference['status'] = 'cancelled' if started is not None else 'not_started'
+            reference['elapsed_seconds'] = round(time.monotonic() - started, 3) if started is not None else None
+            return
+            
+        data, error, unfinished = task.result()
+        if data is not None:
+            reference['data'] = data
+        else:
+            reference['error'] = error
+        if unfinished:
+            reference.update(unfinished)
+
+    def _budget_frontier(
+        self,
+        frontier: List[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+        context: TraversalContext
+    ) -> Tuple[List[Tuple], List[Tuple]]:
+        """
+        Split a streamed level into the entries to fetch and those the budget leaves unfetched.
+        
+        Args:
+            frontier: Entries of (ticket key, parent, reference context, reference kind)
+            context: State of the current extraction
+            
+        Returns:
+            Tuple of (entries to fetch, truncated entries). When the budget allows only part
+            of the level, the highest-priority references are kept.
+        """
+        reason = context.exhausted_budget()
+        if reason:
+            context.truncated_reason = reason
+            return [], frontier
+        
+        remaining = context.remaining_tickets()
+        if remaining is None or remaining >= len(frontier):
+            return frontier, []
+        
+        context.truncated_reason = 'max_tickets'
+        ranked = sorted(
+            range(len(frontier)),
+            key=lambda index: REFERENCE_PRIORITY.get(frontier[index][3], len(REFERENCE_PRIORITY))
+        )
+        kept = set(ranked[:remaining])
+        return (
+            [entry for index, entry in enumerate(frontier) if index in kept],
+            [entry for index, entry in enumerate(frontier) if index not in kept]
+        )
+
+    def _slice_size(self, context: TraversalContext) -> Optional[int]:
+        """Number of tickets to fetch before checking the budget again, or None for a whole level."""
+        budget = context.budget
+        if not budget.limited:
+            return None
+        if budget.max_seconds is None and budget.max_bytes is None and budget.max_api_calls is None:
+            return context.remaining_tickets()
+        slice_size = self.batch_config.max_keys_per_query
+        remaining = context.remaining_tickets()
+        return slice_size if remaining is None else min(slice_size, remaining)
+
+    def _dedup_stats(self, bundles: Dict[str, Optional[Dict[str, Any]]], graph: ReferenceGraph) -> Dict[str, Any]:
+        """
+        Compare the resources embedded across bundles with what was actually fetched.
+        
+        Args:
+            bundles: Bundles assembled from the graph, keyed by root ticket ID
+            graph: The shared reference graph
+            
+        Returns:
+            Dict with per-resource reference counts, unique counts and deduplicated counts
+        """
+        ticket_references = 0
+        page_references = []
+        document_references = []
+        
+        for bundle in bundles.values():
+            stack = [bundle] if bundle else []
+            while stack:
+                ticket_data = stack.pop()
+                ticket_references += 1
+                references = ticket_data['references']
+                page_references.extend(ref.get('id') or ref.get('url') for ref in references['confluence_pages'])
+                document_references.extend(ref.get('url') for ref in references['scrapable_documentation'])
+                stack.extend(
+                    ref for ref in references['jira_tickets']
+                    if not ref.get('metadata', {}).get('is_processed_reference')
+                )
+        
+        unique_tickets = len(graph) - len(graph.failed_keys())
+        return {
+            'roots': len(bundles),
+            'ticket_references': ticket_references,
+            'unique_tickets': unique_tickets,
+            'tickets_deduplicated': max(0, ticket_references - unique_tickets),
+            'page_references': len(page_references),
+            'unique_pages': len(set(page_references)),
+            'document_references': len(document_references),
+            'unique_documents': len(set(document_references)),
+        }
+
+    def _plan_for_depth(self, depth: int, skeleton: bool = False) -> FetchPlan:
+        """Get the fetch plan for a depth, including the fields hierarchy expansion reads."""
+        plan = self.fetch_planner.plan_for_depth(depth)
+        if skeleton:
+            plan = plan.skeleton()
+        extra_fields = tuple(f for f in self.hierarchy_config.extra_fields if f not in plan.fields)
+        if not extra_fields or '*all' in plan.fields:
+            return plan
+        return replace(plan, fields=tuple(plan.fields) + extra_fields)
+
+    async def _fetch_level_payloads(
+        self,
+        ticket_ids: List[str],
+        depth: int,
+        context: TraversalContext,
+        plan: Optional[FetchPlan] = None,
+        store: bool = True
+    ) -> List[Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Fetch the raw issues and comments for every ticket of a depth level.
+        
+        Tickets are served from the ticket cache when possible. Otherwise only the fields
+        in the fetch plan for ``depth`` are requested, through ``key in (...)`` JQL searches
+        that include comments, chunked to respect URL-length limits. Tickets the searches
+        do not return (moved issues, failed searches) fall back to individual fetches.
+        Tickets whose comments are not all embedded get None comments, to be paginated
+        when the ticket is expanded; they are not cached. Tickets a concurrent extraction
+        is already fetching with the same plan are taken from that fetch, and tickets in
+        the negative cache are reported failed without a request.
+        
+        Args:
+            ticket_ids: Ticket IDs to fetch
+            depth: Depth of the tickets in the reference chain
+            context: State of the current extraction
+            plan: Fields to request instead of the fetch plan for ``depth``. Savings are
+                only estimated for issues fetched with the plan for ``depth``.
+            store: Whether to store the fetched payloads in the ticket cache
+            
+        Returns:
+            List of (issue, comments) tuples or None for failed fetches, in the order of ticket_ids.
+            Comments are None when they have to be paginated.
+        """
+        primary = plan is None
+        plan = plan or self._plan_for_depth(depth)
+        payloads: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        
+        if self.ticket_cache:
+            payloads.update(await self._cached_ticket_payloads(ticket_ids, plan, context))
+        
+        if self.negative_cache is not None:
+            # Tickets that failed recently are reported failed without a request
+            payloads.update(
+                (ticket_id, None) for ticket_id in ticket_ids
+                if ticket_id not in payloads and self.negative_cache.get(f"jira:{ticket_id}")
+            )
+        
+        to_fetch = [ticket_id for ticket_id in ticket_ids if ticket_id not in payloads]
+        flight_keys = {ticket_id: ('jira', ticket_id, plan.fields_param, plan.expand) for ticket_id in to_fetch}
+        flights = {ticket_id: self.single_flight.claim(flight_keys[ticket_id]) for ticket_id in to_fetch}
+        owned = [ticket_id for ticket_id in to_fetch if flights[ticket_id][1]]
+        joined = [ticket_id for ticket_id in to_fetch if not flights[ticket_id][1]]
+        
+        async def fetch_owned() -> Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+            try:
+                fetched = await self._fetch_uncached_payloads(owned, plan, context)
+            except BaseException:
+                for ticket_id in owned:
+                    self.single_flight.abandon(flight_keys[ticket_id], flights[ticket_id][0])
+                raise
+            for ticket_id in owned:
+                if ticket_id in context.timed_out:
+                    # Our deadline is not theirs: let the other extractions retry
+                    self.single_flight.abandon(flight_keys[ticket_id], flights[ticket_id][0])
+                else:
+                    self.single_flight.resolve(flight_keys[ticket_id], flights[ticket_id][0], fetched[ticket_id])
+            return fetched
+        
+        async def join_flights() -> Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+            results = await asyncio.gather(
+                *(asyncio.shield(flights[ticket_id][0]) for ticket_id in joined), return_exceptions=True
+            )
+            shared = {ticket_id: result for ticket_id, result in zip(joined, results) if not isinstance(result, BaseException)}
+            abandoned = [ticket_id for ticket_id in joined if ticket_id not in shared]
+            shared.update(zip(abandoned, await asyncio.gather(
+                *(self._fetch_ticket_payload(ticket_id, plan, context) for ticket_id in abandoned)
+            )))
+            return shared
+        
+        if joined:
+            logger.debug(f"Joining {len(joined)} ticket fetch(es) already in flight")
+        fetched, shared = await asyncio.gather(fetch_owned(), join_flights())
+        if primary:
+            self._record_savings(context, plan, [payload[0] for payload in fetched.values() if payload is not None])
+        
+        if self.ticket_cache and store:
+            await self.transport.call(self.ticket_cache.put_many, [
+                (ticket_id, payload[0], payload[1], plan.fields)
+                for ticket_id, payload in fetched.items()
+                if payload is not None and payload[1] is not None
+            ])
+        
+        payloads.update(fetched)
+        payloads.update(shared)
+        return [payloads[ticket_id] for ticket_id in ticket_ids]
+
+    async def _fetch_uncached_payloads(
+        self,
+        ticket_ids: List[str],
+        plan: FetchPlan,
+        context: TraversalContext
+    ) -> Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Fetch tickets through batched searches, falling back to individual fetches.
+        
+        Args:
+            ticket_ids: Ticket IDs to fetch
+            plan: Fields and expansions to request
+            context: State of the current extraction
+            
+        Returns:
+            Dict mapping every ticket ID to its (issue, comments) tuple, or None if the fetch failed
+        """
+        fetched: Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+        if self.batch_config.enabled and ticket_ids:
+            overhead = search_url_overhead(config.JIRA_URL, plan.fields_param, plan.expand)
+            chunks = chunk_keys(ticket_ids, self.batch_config, overhead)
+            for chunk_payloads in await asyncio.gather(
+                *(self._search_ticket_payloads(chunk, plan, context) for chunk in chunks)
+            ):
+                fetched.update(chunk_payloads)
+        
+        missing = [ticket_id for ticket_id in ticket_ids if ticket_id not in fetched]
+        fetched.update(zip(missing, await asyncio.gather(
+            *(self._fetch_ticket_payload(ticket_id, plan, context) for ticket_id in missing)
+        )))
+        return fetched
+
+    async def _cached_ticket_payloads(self, ticket_ids: List[str], plan: FetchPlan, context: TraversalContext) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Serve tickets from the ticket cache.
+        
+        Entries within the cache TTL are used as-is. Older entries are revalidated with a
+        bulk ``key in (...)`` search for the ``updated`` field only, and reused when the
+        ticket has not changed since it was cached.
+        
+        Args:
+            ticket_ids: Ticket IDs to look up
+            plan: Fields the caller needs
+            context: State of the current extraction
+            
+        Returns:
+            Dict mapping ticket keys to (issue, comments) tuples for cache hits
+        """
+        cache = self.ticket_cache
+        entries = await self.transport.call(cache.get_many, ticket_ids, plan.fields)
+        
+        fresh = [key for key, entry in entries.items() if cache.is_fresh(entry)]
+        stale = [key for key in entries if key not in fresh]
+        
+        revalidated = []
+        if stale and cache.config.revalidate:
+            current = await self._fetch_updated_timestamps(stale, context)
+            revalidated = [
+                key for key in stale
+                if key in current and current[key] == entries[key].updated
+            ]
+        
+        await self.transport.call(cache.mark_fresh, fresh)
+        await self.transport.call(cache.mark_fresh, revalidated, True)
+        cache.record_misses(len(ticket_ids) - len(fresh) - len(revalidated), len(stale) - len(revalidated))
+        
+        for key in fresh + revalidated:
+            self._record_payload(context, entries[key].issue, from_cache=True)
+        return {key: (entries[key].issue, entries[key].comments) for key in fresh + revalidated}
+
+    async def _fetch_updated_timestamps(self, ticket_ids: List[str], context: TraversalContext) -> Dict[str, str]:
+        """
+        Fetch only the ``updated`` field of tickets through bulk JQL searches.
+        
+        Args:
+            ticket_ids: Ticket IDs to check
+            context: State of the current extraction
+            
+        Returns:
+            Dict mapping ticket keys to their current ``updated`` value. Tickets whose
+            search failed are left out.
+        """
+        overhead = search_url_overhead(config.JIRA_URL, 'updated')
+        
+        async def search_chunk(chunk: List[str]) -> Dict[str, str]:
+            try:
+                async with context.semaphore:
+                    result = await self._call_jira(
+                        context,
+                        self.jira.jql,
+                        build_key_jql(chunk),
+                        fields='updated',
+                        start=0,
+                        limit=len(chunk),
+                        validate_query=KEY_SEARCH_VALIDATION
+                    )
+                return {
+                    issue['key']: issue['fields'].get('updated')
+                    for issue in result['issues']
                 }
-            }
+            except Exception as e:
+                if len(chunk) > 1 and is_rejected_search(e):
+                    # Split a rejected chunk so a key Jira still refuses costs only its own timestamp
+                    middle = len(chunk) // 2
+                    halves = await asyncio.gather(search_chunk(chunk[:middle]), search_chunk(chunk[middle:]))
+                    return {**halves[0], **halves[1]}
+                logger.warning(f"Failed to check the updated time of {len(chunk)} ticket(s): {str(e)}")
+                return {}
+        
+        timestamps = {}
+        for chunk_timestamps in await asyncio.gather(
+            *(search_chunk(chunk) for chunk in chunk_keys(ticket_ids, self.batch_config, overhead))
+        ):
+            timestamps.update(chunk_timestamps)
+        return timestamps
+
+    async def _search_ticket_payloads(self, ticket_ids: List[str], plan: FetchPlan, context: TraversalContext) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Fetch a chunk of tickets, including their comments, with paginated JQL searches.
+        
+        Args:
+            ticket_ids: Ticket IDs to fetch
+            plan: Fields and expansions to request
+            context: State of the current extraction
             
-            # Mark as processed BEFORE processing references to avoid cycles
-            self.processed_ids.add(ticket_id)
+        Returns:
+            Dict mapping ticket keys to (issue, comments) tuples, with None comments when the
+            response does not embed them all. Tickets the search did not return are left
+            out so the caller can fetch them individually.
+        """
+        jql = build_key_jql(ticket_ids)
+        page_size = self.batch_config.page_size
+        
+        async def search_page(start: int) -> Dict[str, Any]:
+            async with context.semaphore:
+                result = await self._call_jira(
+                    context,
+                    self.jira.jql,
+                    jql,
+                    fields=plan.fields_param,
+                    start=start,
+                    limit=page_size,
+                    expand=plan.expand,
+                    validate_query=KEY_SEARCH_VALIDATION
+                )
+            if not isinstance(result, dict) or not isinstance(result.get('issues'), list):
+                raise ValueError("Unexpected search response")
+            return result
+        
+        try:
+            first_page = await search_page(0)
+            pages = [first_page]
+            total = first_page.get('total', 0)
+            received = len(first_page['issues'])
+            if 0 < received < total:
+                pages.extend(await asyncio.gather(
+                    *(search_page(start) for start in range(received, total, received))
+                ))
+        except Exception as e:
+            logger.warning(f"Batch search failed for {len(ticket_ids)} ticket(s), fetching individually: {str(e)}")
+            return {}
+        
+        payloads = {}
+        for page in pages:
+            for issue in page['issues']:
+                self._record_payload(context, issue)
+                payloads[issue['key']] = (issue, self._embedded_comments(issue, plan))
+        
+        return payloads
+
+    async def _fetch_ticket_payload(self, ticket_id: str, plan: FetchPlan, context: TraversalContext) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Fetch the raw issue and comments for a ticket.
+        
+        Comments are requested with the issue. When the response does not embed the
+        complete list, they are paginated later by ``iter_comment_pages``.
+        
+        Args:
+            ticket_id: The Jira ticket ID
+            plan: Fields and expansions to request
+            context: State of the current extraction
             
-            # Track unique references by URL to avoid duplicates
-            processed_urls = set()
+        Returns:
+            Tuple of (issue, comments) or None if the fetch failed. Comments are None when
+            they have to be paginated.
+        """
+        async with context.semaphore:
+            started = time.monotonic()
+            try:
+                issue = await self._call_jira(
+                    context, self.jira.issue, ticket_id, fields=plan.fields_param, expand=plan.expand
+                )
+                self._record_payload(context, issue)
+                return issue, self._embedded_comments(issue, plan)
+            except asyncio.TimeoutError:
+                context.timed_out[ticket_id] = time.monotonic() - started
+                logger.warning(f"Fetching {ticket_id} timed out after {context.timed_out[ticket_id]:.1f}s")
+                if self.negative_cache is not None and not context.deadline_passed:
+                    self.negative_cache.record(f"jira:{ticket_id}", 'timeout', "Request timed out")
+                return None
+            except Exception as e:
+                logger.error(f"Error processing ticket {ticket_id}: {str(e)}")
+                if self.negative_cache is not None:
+                    self.negative_cache.record(f"jira:{ticket_id}", classify_failure(e), str(e))
+                return None
+
+    async def iter_comment_pages(
+        self,
+        ticket_id: str,
+        context: Optional[TraversalContext] = None,
+        total: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over a ticket's comments page by page, oldest first.
+        
+        Pages are requested with ``startAt``/``maxResults``, and up to ``prefetch_pages``
+        pages are fetched ahead of the one being consumed. With ``max_comments`` set, only
+        the newest comments are fetched.
+        
+        Args:
+            ticket_id: The Jira ticket ID
+            context: Optional traversal context whose semaphore and statistics the requests use
+            total: Number of comments, if known, so every page can be requested at once
+            
+        Yields:
+            Lists of raw Jira comments
+        """
+        context = context or self.new_context()
+        received = 0
+        if total is None:
+            try:
+                first_page = await self._fetch_comment_page(ticket_id, 0, context)
+            except Exception as e:
+                logger.warning(f"Paginated comments unavailable for {ticket_id}, fetching all at once: {str(e)}")
+                all_comments = await self._call_jira(context, self.jira.issue_get_comments, ticket_id)
+                self._record_payload(context, all_comments)
+                yield newest_comments(all_comments.get('comments', []), self.comment_config)
+                return
+            
+            page = first_page['comments']
+            received = len(page)
+            total = first_page.get('total', received)
+            skip = max(0, total - self.comment_config.max_comments) if self.comment_config.max_comments is not None else 0
+            if page[skip:]:
+                yield page[skip:]
+        
+        starts = iter(comment_page_starts(total, self.comment_config, first=received))
+        pending = deque()
+        
+        def prefetch():
+            while len(pending) < max(1, self.comment_config.prefetch_pages):
+                start = next(starts, None)
+                if start is None:
+                    return
+                pending.append(asyncio.ensure_future(self._fetch_comment_page(ticket_id, start, context)))
+        
+        prefetch()
+        try:
+            while pending:
+                next_page = await pending.popleft()
+                prefetch()
+                if next_page['comments']:
+                    yield next_page['comments']
+        finally:
+            # A consumer that stops early leaves prefetched pages in flight
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _fetch_comment_page(self, ticket_id: str, start: int, context: TraversalContext) -> Dict[str, Any]:
+        """Fetch one page of a ticket's comments."""
+        async with context.semaphore:
+            page = await self._call_jira(
+                context,
+                self.jira.get,
+                comment_path(ticket_id),
+                params={'startAt': start, 'maxResults': self.comment_config.page_size}
+            )
+        if not isinstance(page, dict) or not isinstance(page.get('comments'), list):
+            raise ValueError("Unexpected comment page response")
+        self._record_payload(context, page)
+        return page
+
+    async def _comment_pages(
+        self,
+        ticket_id: str,
+        issue: Dict[str, Any],
+        comments: Optional[Dict[str, Any]],
+        context: TraversalContext
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the embedded comments of a payload, or paginate them when they were not embedded."""
+        if comments is not None:
+            yield newest_comments(comments.get('comments', []), self.comment_config)
+            return
+            
+        comment_field = issue.get('fields', {}).get('comment')
+        total = comment_field.get('total') if isinstance(comment_field, dict) else None
+        async for page in self.iter_comment_pages(ticket_id, context, total):
+            yield page
+
+    def _embedded_comments(self, issue: Dict[str, Any], plan: FetchPlan) -> Optional[Dict[str, Any]]:
+        """
+        Get the comments embedded in an issue response.
+        
+        Returns:
+            Dict with a 'comments' list, or None if the complete list is not embedded
+        """
+        if not plan.include_comments:
+            return {'comments': []}
+            
+        comment_field = issue.get('fields', {}).get('comment')
+        if not isinstance(comment_field, dict):
+            return None
+            
+        comments = comment_field.get('comments', [])
+        # Responses may embed a truncated comment list
+        if comment_field.get('total', len(comments)) > len(comments):
+            return None
+        return {'comments': comments}
+
+    async def _call_jira(self, context: TraversalContext, func, *args, **kwargs) -> Any:
+        """
+        Call the Jira client on the transport, counting the request against the extraction.
+        
+        Raises:
+            asyncio.TimeoutError: If the request outlasts the node timeout or the extraction deadline.
+                The blocking call cannot be interrupted; its result is discarded.
+        """
+        context.fetch_stats.api_calls += 1
+        return await asyncio.wait_for(self.transport.call(func, *args, **kwargs), context.call_timeout())
+
+    def _record_payload(self, context: TraversalContext, payload: Any, from_cache: bool = False) -> None:
+        """Account for a payload in the fetch statistics of the current extraction."""
+        if from_cache:
+            context.fetch_stats.cache_hits += 1
+            return
+        context.fetch_stats.payloads += 1
+        context.fetch_stats.bytes_received += payload_size(payload)
+
+    def _record_savings(self, context: TraversalContext, plan: FetchPlan, issues: List[Dict[str, Any]]) -> None:
+        """Account for the bytes saved by fetching issues with a projected plan."""
+        for issue in issues:
+            saved = self.fetch_planner.bytes_saved(plan, issue)
+            if saved is not None:
+                context.fetch_stats.record_saving(saved)
+
+    async def calibrate_fetch_planner(self, ticket_ids: List[str]) -> int:
+        """
+        Measure the size of full issue payloads so projected fetches can report savings.
+        
+        Args:
+            ticket_ids: Sample ticket IDs to fetch with all fields
+            
+        Returns:
+            Average full payload size in bytes
+        """
+        full_payloads = []
+        for ticket_id in ticket_ids:
+            issue = await self.transport.call(self.jira.issue, ticket_id, fields='*all', expand='renderedFields')
+            comments = await self.transport.call(self.jira.issue_get_comments, ticket_id)
+            full_payloads.append({'issue': issue, 'comments': comments})
+        return self.fetch_planner.calibrate(full_payloads)
+
+    async def _expand_ticket(
+        self,
+        ticket_id: str,
+        payload: Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+        context: TraversalContext
+    ) -> Optional[Tuple[Dict[str, Any], List[TicketReference]]]:
+        """
+        Build the ticket data for a fetched ticket and collect the tickets it references.
+        
+        Confluence pages, documentation and other URLs are recorded directly on the ticket
+        data. Referenced Jira tickets are returned in discovery order (description, then
+        comments, then issue links, then the parent and epic when hierarchy expansion is
+        enabled), each with the context it was found in, so the
+        caller can claim and fetch them. A ticket referenced in several ways keeps the
+        kind with the highest traversal priority (see ``REFERENCE_PRIORITY``). Comments that were not embedded in the payload
+        are processed page by page as they arrive.
+        
+        Args:
+            ticket_id: The Jira ticket ID
+            payload: Tuple of (issue, comments) as returned by ``_fetch_ticket_payload``
+            context: State of the current extraction
+            
+        Returns:
+            Tuple of (ticket_data, ticket references) or None if the ticket could not be processed
+        """
+        if payload is None:
+            return None
+            
+        issue, comments = payload
+        try:
+            ticket_data = self._extract_ticket_data(issue)
+            references: Dict[str, TicketReference] = {}
+            
+            # Track unique references by resource (see ``canonical_key``) to avoid duplicates
+            processed_keys = set()
             
             # Process description URLs
             if ticket_data['description']:
                 url_matches = await self.url_analyzer.analyze_content(ticket_data['description'])
                 for match in url_matches:
-                    if match.url not in processed_urls:
-                        processed_urls.add(match.url)
-                        if match.url_type == 'jira':
-                            referenced_ticket = await self._get_ticket_with_references(
-                                match.resource_metadata.resource_id,
-                                depth=depth + 1,
-                                parent_id=ticket_id
-                            )
-                            if referenced_ticket:
-                                ticket_data['references']['jira_tickets'].append(referenced_ticket)
-                        elif match.url_type == 'confluence':
-                            ticket_data['references']['confluence_pages'].append({
-                                'id': match.resource_metadata.resource_id,
-                                'url': match.url,
-                                'context': match.context or 'Found in description',
-                                'metadata': match.resource_metadata
-                            })
-                        elif match.url_type == 'documentation':
-                            ticket_data['references']['scrapable_documentation'].append({
-                                'url': match.url,
-                                'context': match.context or 'Found in description',
-                                'metadata': match.resource_metadata
-                            })
-                        else:
-                            ticket_data['references']['other_urls'].append({
-                                'url': match.url,
-                                'context': match.context or 'Found in description',
-                                'metadata': match.resource_metadata
-                            })
+                    self._add_url_reference(
+                        ticket_data, match, 'Found in description', processed_keys, references, 'description'
+                    )
             
             # Process comments
-            comments = self.jira.issue_get_comments(ticket_id)
-            for comment in comments.get('comments', []):
-                # Skip bot comments
-                if comment['author']['displayName'].lower().endswith('bot'):
-                    continue
-                    
-                comment_data = {
-                    'author': comment['author']['displayName'],
-                    'body': comment['body'],
-                    'created': comment['created']
-                }
-                ticket_data['comments'].append(comment_data)
-                
-                # Process URLs in comment
-                url_matches = await self.url_analyzer.analyze_content(comment['body'])
-                for match in url_matches:
-                    if match.url not in processed_urls:
-                        processed_urls.add(match.url)
-                        if match.url_type == 'jira':
-                            referenced_ticket = await self._get_ticket_with_references(
-                                match.resource_metadata.resource_id,
-                                depth=depth + 1,
-                                parent_id=ticket_id
+            try:
+                async for page in self._comment_pages(ticket_id, issue, comments, context):
+                    for comment in page:
+                        # Skip bot comments
+                        if comment['author']['displayName'].lower().endswith('bot'):
+                            continue
+                            
+                        ticket_data['comments'].append({
+                            'author': comment['author']['displayName'],
+                            'body': comment['body'],
+                            'created': comment['created']
+                        })
+                        
+                        # Process URLs in comment
+                        url_matches = await self.url_analyzer.analyze_content(comment['body'])
+                        for match in url_matches:
+                            self._add_url_reference(
+                                ticket_data,
+                                match,
+                                f"Found in comment by {comment['author']['displayName']}",
+                                processed_keys,
+                                references,
+                                'comment'
                             )
-                            if referenced_ticket:
-                                ticket_data['references']['jira_tickets'].append(referenced_ticket)
-                        elif match.url_type == 'confluence':
-                            ticket_data['references']['confluence_pages'].append({
-                                'id': match.resource_metadata.resource_id,
-                                'url': match.url,
-                                'context': match.context or f"Found in comment by {comment['author']['displayName']}",
-                                'metadata': match.resource_metadata
-                            })
-                        elif match.url_type == 'documentation':
-                            ticket_data['references']['scrapable_documentation'].append({
-                                'url': match.url,
-                                'context': match.context or f"Found in comment by {comment['author']['displayName']}",
-                                'metadata': match.resource_metadata
-                            })
-                        else:
-                            ticket_data['references']['other_urls'].append({
-                                'url': match.url,
-                                'context': match.context or f"Found in comment by {comment['author']['displayName']}",
-                                'metadata': match.resource_metadata
-                            })
+            except Exception as e:
+                logger.error(f"Failed to fetch all comments of {ticket_id}: {str(e)}")
+                ticket_data['comments_incomplete'] = True
             
             # Process direct issue links
-            if 'issuelinks' in issue['fields']:
-                for link in issue['fields']['issuelinks']:
-                    linked_issue = None
-                    link_type = link.get('type', {}).get('name', 'linked')
-                    
-                    if 'inwardIssue' in link:
-                        linked_issue = link['inwardIssue']
-                    elif 'outwardIssue' in link:
-                        linked_issue = link['outwardIssue']
-                    
-                    if linked_issue:
-                        url = f"{config.JIRA_URL}/browse/{linked_issue['key']}"
-                        if url not in processed_urls:
-                            processed_urls.add(url)
-                            referenced_ticket = await self._get_ticket_with_references(
-                                linked_issue['key'],
-                                depth=depth + 1,
-                                parent_id=ticket_id
-                            )
-                            if referenced_ticket:
-                                ticket_data['references']['jira_tickets'].append(referenced_ticket)
+            for link in issue['fields'].get('issuelinks', []):
+                linked_issue = link.get('inwardIssue') or link.get('outwardIssue')
+                if linked_issue:
+                    self._add_ticket_reference(
+                        references, TicketReference(linked_issue['key'], self._issue_link_context(link), 'issuelink')
+                    )
+            
+            # Process parent and epic
+            for parent_key, parent_context in parent_references(issue['fields'], self.hierarchy_config):
+                self._add_ticket_reference(references, TicketReference(parent_key, parent_context, 'parent'))
             
-            return ticket_data
+            return ticket_data, list(references.values())
             
         except Exception as e:
             logger.error(f"Error processing ticket {ticket_id}: {str(e)}")
             return None
 
+    def _add_url_reference(
+        self,
+        ticket_data: Dict[str, Any],
+        match: URLMatch,
+        default_context: str,
+        processed_keys: Set[str],
+        references: Dict[str, TicketReference],
+        kind: str
+    ) -> None:
+        """Record a URL match on the ticket data, collecting Jira ticket references for traversal."""
+        if match.url_type == 'jira':
+            if match.resource_metadata:
+                self._add_ticket_reference(
+                    references, TicketReference(match.resource_metadata.resource_id, match.context or default_context, kind)
+                )
+            return
+        
+        key = canonical_key(match)
+        if key in processed_keys:
+            return
+        processed_keys.add(key)
+        
+        if match.url_type == 'confluence':
+            ticket_data['references']['confluence_pages'].append({
+                'id': match.resource_metadata.resource_id,
+                'url': match.url,
+                'context': match.context or default_context,
+                'metadata': match.resource_metadata
+            })
+        elif match.url_type == 'documentation':
+            ticket_data['references']['scrapable_documentation'].append({
+                'url': match.url,
+                'context': match.context or default_context,
+                'metadata': match.resource_metadata
+            })
+        else:
+            ticket_data['references']['other_urls'].append({
+                'url': match.url,
+                'context': match.context or default_context,
+                'metadata': match.resource_metadata
+            })
+
+    def _add_ticket_reference(self, references: Dict[str, TicketReference], reference: TicketReference) -> None:
+        """Collect a Jira ticket reference by key, keeping the kind with the highest traversal priority.
+
+        The reference keeps its first position, so tickets are still returned in discovery order.
+        """
+        existing = references.get(reference.key)
+        if existing is None or REFERENCE_PRIORITY[reference.kind] < REFERENCE_PRIORITY[existing.kind]:
+            references[reference.key] = reference
+
+    def _issue_link_context(self, link: Dict[str, Any]) -> str:
+        """Describe an issue link, e.g. "Linked issue (is blocked by)"."""
+        link_type = link.get('type') or {}
+        relation = link_type.get('inward') if link.get('inwardIssue') else link_type.get('outward')
+        return f"Linked issue ({relation})" if relation else "Linked issue"
+
+    def _placeholder_reference(self, ticket_id: str, is_parent_reference: bool = False) -> Dict[str, Any]:
+        """Create a placeholder for a ticket that is already part of the bundle."""
+        return placeholder_reference(ticket_id, is_parent_reference)
+
     def _extract_ticket_data(self, issue: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract basic ticket data from a Jira issue."""
+        """Extract basic ticket data from a Jira issue. Fields left out by the fetch plan are None."""
+        fields = issue['fields']
         return {
             'id': issue['key'],
-            'summary': issue['fields']['summary'],
-            'description': issue['fields']['description'],
-            'status': issue['fields']['status']['name'],
-            'created': issue['fields']['created'],
-            'updated': issue['fields']['updated'],
-            'priority': issue['fields']['priority']['name'] if 'priority' in issue['fields'] else 'None',
-            'assignee': issue['fields']['assignee']['displayName'] if issue['fields'].get('assignee') else 'Unassigned',
-            'reporter': issue['fields']['reporter']['displayName'] if issue['fields'].get('reporter') else 'Unknown',
-            'labels': issue['fields'].get('labels', []),
+            'summary': fields.get('summary'),
+            'description': fields.get('description'),
+            'status': fields['status']['name'] if fields.get('status') else None,
+            'created': fields.get('created'),
+            'updated': fields.get('updated'),
+            'priority': fields['priority']['name'] if fields.get('priority') else 'None',
+            'assignee': fields['assignee']['displayName'] if fields.get('assignee') else 'Unassigned',
+            'reporter': fields['reporter']['displayName'] if fields.get('reporter') else 'Unknown',
+            'labels': fields.get('labels', []),
             'comments': [],
             'references': {
                 'confluence_pages': [],
@@ -315,247 +1777,6 @@ class JiraExtractor(BaseExtractor):
             }
         }
 
-    def _create_ticket_reference(self, ticket_id: str, parent_id: str = None) -> Dict[str, Any]:
-        """Create a reference to an already processed ticket."""
-        is_parent = ticket_id == parent_id
-        url = f"{config.JIRA_URL}/browse/{ticket_id}"
-        
-        return {
-            'id': ticket_id,
-            'url': url,
-            'context': "Reference to parent ticket" if is_parent else "Previously processed ticket",
-            'metadata': {
-                'platform': 'knowledge_base',
-                'resource_type': 'jira_ticket',
-                'resource_id': ticket_id,
-                'ticket_id': ticket_id,
-                'is_parent_reference': is_parent,
-                'is_processed_reference': True
-            }
-        }
-
-    @memory_managed("process_issue_links")
-    async def _process_issue_links(self, issue: Dict[str, Any], ticket_data: Dict[str, Any], depth: int, parent_id: str = None) -> None:
-        """Process issue links with memory management."""
-        if 'issuelinks' not in issue['fields']:
-            return
-
-        # Process links in chunks
-        for chunk in self._memory_manager.chunk_generator(issue['fields']['issuelinks']):
-            for link in chunk:
-                linked_issue = None
-                link_type = link.get('type', {}).get('name', 'linked')
-                
-                if 'inwardIssue' in link:
-                    linked_issue = link['inwardIssue']
-                elif 'outwardIssue' in link:
-                    linked_issue = link['outwardIssue']
-                
-                if not linked_issue:
-                    continue
-
-                try:
-                    url = f"{config.JIRA_URL}/browse/{linked_issue['key']}"
-                    url_data = {
-                        'url': url,
-                        'type': 'jira',
-                        'domain': config.BASE_DOMAIN,
-                        'context': f"Direct issue link ({link_type})",
-                        'resource_metadata': {
-                            'platform': 'knowledge_base',
-                            'resource_type': 'jira_ticket',
-                            'resource_id': linked_issue['key'],
-                            'ticket_id': linked_issue['key']
-                        }
-                    }
-                    
-                    # Handle self-reference
-                    if linked_issue['key'] == ticket_data['id']:
-                        ticket_data['references']['jira_tickets'].append(
-                            self._create_ticket_reference(linked_issue['key'], parent_id)
-                        )
-                        continue
-                    
-                    # Try to fetch the linked ticket if not already processed
-                    referenced_ticket = None
-                    if linked_issue['key'] not in self.processed_ids:
-                        referenced_ticket = await self._get_ticket_with_references(
-                            linked_issue['key'], 
-                            depth=depth + 1, 
-                            parent_id=ticket_data['id']
-                        )
-                    
-                    if referenced_ticket:
-                        if referenced_ticket.get('metadata', {}).get('is_parent_reference'):
-                            ticket_data['references']['jira_tickets'].append(
-                                self._create_ticket_reference(ticket_data['id'], parent_id)
-                            )
-                        else:
-                            # Add full ticket data
-                            ticket_data['references']['jira_tickets'].append({
-                                'id': referenced_ticket['id'],
-                                'summary': referenced_ticket['summary'],
-                                'status': referenced_ticket['status'],
-                                'url': url,
-                                'context': url_data['context'],
-                                'metadata': url_data,
-                                'description': referenced_ticket['description'],
-                                'comments': referenced_ticket['comments'],
-                                'created': referenced_ticket['created'],
-                                'updated': referenced_ticket['updated'],
-                                'priority': referenced_ticket['priority'],
-                                'assignee': referenced_ticket['assignee'],
-                                'reporter': referenced_ticket['reporter'],
-                                'labels': referenced_ticket['labels'],
-                                'references': referenced_ticket['references']
-                            })
-                            self._update_stats('jira', depth)
-                    else:
-                        # Add placeholder reference for already processed tickets
-                        if linked_issue['key'] in self.processed_ids:
-                            ticket_data['references']['jira_tickets'].append(
-                                self._create_ticket_reference(linked_issue['key'], parent_id)
-                            )
-                
-                except Exception as e:
-                    logger.error(f"Failed to process linked ticket {linked_issue['key']}: {str(e)}")
-                    ticket_data['references']['jira_tickets'].append({
-                        'id': linked_issue['key'],
-                        'url': url,
-                        'context': f"Direct issue link ({link_type})",
-                        'metadata': url_data,
-                        'error': str(e)
-                    })
-                
-                self._memory_manager.check_memory()
-
-    def _check_duplicate_reference(self, references: Dict[str, List[Dict[str, Any]]], ref_type: str, item: Dict[str, Any]) -> bool:
-        """Check if a reference already exists in the references list."""
-        if ref_type == 'jira_tickets':
-            return any(ref.get('ticket_id') == item.get('ticket_id') for ref in references[ref_type])
-        elif ref_type == 'confluence_pages':
-            return any(ref.get('page_id') == item.get('page_id') for ref in references[ref_type])
-        else:
-            return any(ref.get('url') == item.get('url') for ref in references[ref_type])
-
-    @memory_managed("process_content_references")
-    async def _process_content_references(
-        self,
-        content: str,
-        source_id: str,
-        source_type: str,
-        depth: int,
-        references: Dict[str, List[Dict[str, Any]]],
-        author: str = None
-    ) -> None:
-        """Process content references with memory management."""
-        try:
-            # Analyze URLs in content
-            urls = await self.url_analyzer.analyze_content(content, source_id)
-
-            # Process each URL match
-            for url_match in urls:
-                try:
-                    if url_match.url_type == 'jira':
-                        # Extract ticket ID from URL
-                        ticket_id = url_match.resource_metadata.resource_id if url_match.resource_metadata else None
-                        if ticket_id:
-                            # Skip self-references
-                            if ticket_id == source_id:
-                                continue
-
-                            # Add to references if not already present
-                            if not any(ref.get('ticket_id') == ticket_id for ref in references['jira_tickets']):
-                                try:
-                                    ticket_data = await self._get_ticket_with_references(ticket_id, depth + 1)
-                                    if ticket_data:
-                                        references['jira_tickets'].append({
-                                            'type': 'jira',
-                                            'ticket_id': ticket_id,
-                                            'context': source_type,
-                                            'url': url_match.url,
-                                            'data': ticket_data
-                                        })
-                                except Exception as e:
-                                    logger.error(f"Failed to fetch ticket {ticket_id}: {str(e)}")
-                                    references['jira_tickets'].append({
-                                        'type': 'jira',
-                                        'ticket_id': ticket_id,
-                                        'context': source_type,
-                                        'url': url_match.url,
-                                        'error': str(e)
-                                    })
-
-                    elif url_match.url_type == 'confluence':
-                        # Extract page ID from URL
-                        page_id = url_match.resource_metadata.resource_id if url_match.resource_metadata else None
-                        if page_id:
-                            # Add to references if not already present
-                            if not any(ref.get('page_id') == page_id for ref in references['confluence_pages']):
-                                try:
-                                    page_data = await self.confluence_extractor.get_page_from_url(url_match.url)
-                                    if page_data:
-                                        references['confluence_pages'].append({
-                                            'type': 'confluence',
-                                            'page_id': page_id,
-                                            'context': source_type,
-                                            'url': url_match.url,
-                                            'data': page_data
-                                        })
-                                except Exception as e:
-                                    logger.error(f"Failed to fetch Confluence page {page_id}: {str(e)}")
-                                    references['confluence_pages'].append({
-                                        'type': 'confluence',
-                                        'page_id': page_id,
-                                        'context': source_type,
-                                        'url': url_match.url,
-                                        'error': str(e)
-                                    })
-
-                    elif url_match.should_scrape:
-                        # Add to scrapable documentation if not already present
-                        if not any(ref.get('url') == url_match.url for ref in references['scrapable_documentation']):
-                            try:
-                                content = await self.webpage_extractor.get_page_from_url(url_match.url)
-                                if content:
-                                    references['scrapable_documentation'].append({
-                                        'type': 'webpage',
-                                        'url': url_match.url,
-                                        'context': source_type,
-                                        'data': content
-                                    })
-                            except Exception as e:
-                                logger.error(f"Failed to fetch webpage {url_match.url}: {str(e)}")
-                                references['scrapable_documentation'].append({
-                                    'type': 'webpage',
-                                    'url': url_match.url,
-                                    'context': source_type,
-                                    'error': str(e)
-                                })
-
-                    else:
-                        # Add to other URLs if not already present
-                        if not any(ref.get('url') == url_match.url for ref in references['other_urls']):
-                            references['other_urls'].append({
-                                'type': 'external',
-                                'url': url_match.url,
-                                'context': source_type
-                            })
-
-                except Exception as e:
-                    logger.error(f"Failed to process URL {url_match.url}: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Failed to process content references: {str(e)}")
-            raise
-
-    def _update_stats(self, ref_type: str, depth: int) -> None:
-        """Update reference statistics."""
-        self.reference_stats['total_references'] += 1
-        self.reference_stats['by_type'][ref_type] = self.reference_stats['by_type'].get(ref_type, 0) + 1
-        self.reference_stats['by_depth'][depth] = self.reference_stats['by_depth'].get(depth, 0) + 1
-
     def _make_sync(self, async_func):
         """Convert an async function to sync."""
         def wrapper(*args, **kwargs):
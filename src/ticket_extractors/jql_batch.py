@@ -0,0 +1,96 @@
+"""Helpers for fetching batches of Jira tickets through JQL searches."""
+import logging
+from typing import List, Sequence
+from dataclasses import dataclass
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# Path of the search endpoint appended to the Jira base URL
+SEARCH_PATH = "/rest/api/2/search"
+# validateQuery value of key searches: Jira rejects a whole `key in (...)` query with
+# HTTP 400 when one key is deleted, moved or not visible, unless asked to only warn
+KEY_SEARCH_VALIDATION = "warn"
+
+@dataclass
+class JQLBatchConfig:
+    """Configuration for batched ticket fetching."""
+    enabled: bool = True
+    max_keys_per_query: int = 50  # Keys per `key in (...)` clause
+    page_size: int = 50  # maxResults requested per search page
+    max_url_length: int = 6000  # Conservative limit for the encoded search URL
+
+def build_key_jql(keys: Sequence[str]) -> str:
+    """Build a JQL query matching the given ticket keys.
+
+    Args:
+        keys: Ticket keys (e.g. ["PROJ-1", "PROJ-2"])
+
+    Returns:
+        JQL query string
+    """
+    return f"key in ({', '.join(keys)})"
+
+def is_rejected_search(error: BaseException) -> bool:
+    """Whether Jira rejected a search as invalid (HTTP 400) rather than failing to run it."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 400
+
+def search_url_overhead(base_url: str, fields: str = "*all", expand: str = None) -> int:
+    """Estimate the length of a search URL excluding the JQL itself.
+
+    Args:
+        base_url: Jira base URL
+        fields: Fields parameter sent with the search
+        expand: Expand parameter sent with the search
+
+    Returns:
+        Number of characters used by everything but the encoded JQL
+    """
+    overhead = len(base_url) + len(SEARCH_PATH) + len("?jql=")
+    overhead += len("&fields=") + len(quote(fields, safe=''))
+    overhead += len("&startAt=&maxResults=") + 12  # Room for the pagination numbers
+    overhead += len("&validateQuery=") + len(KEY_SEARCH_VALIDATION)
+    if expand:
+        overhead += len("&expand=") + len(quote(expand, safe=''))
+    return overhead
+
+def chunk_keys(keys: Sequence[str], config: JQLBatchConfig, overhead: int = 0) -> List[List[str]]:
+    """Split ticket keys into chunks whose search URLs stay within the configured limits.
+
+    Args:
+        keys: Ticket keys to fetch, in order
+        config: Batch configuration
+        overhead: Length of the search URL excluding the JQL (see search_url_overhead)
+
+    Returns:
+        List of key chunks, preserving the input order
+    """
+    prefix_length = len(quote("key in (", safe=''))
+    separator_length = len(quote(", ", safe=''))
+    suffix_length = len(quote(")", safe=''))
+
+    chunks = []
+    current: List[str] = []
+    current_length = overhead + prefix_length + suffix_length
+
+    for key in keys:
+        key_length = len(quote(key, safe=''))
+        added_length = key_length + (separator_length if current else 0)
+
+        if current and (
+            len(current) >= config.max_keys_per_query
+            or current_length + added_length > config.max_url_length
+        ):
+            chunks.append(current)
+            current = []
+            current_length = overhead + prefix_length + suffix_length
+            added_length = key_length
+
+        current.append(key)
+        current_length += added_length
+
+    if current:
+        chunks.append(current)
+
+    return chunks
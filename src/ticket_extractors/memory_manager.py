@@ -1,5 +1,6 @@
 """Memory management utilities for handling large data sets."""
 import os
+import time
 import psutil
 import logging
 import gc
@@ -15,13 +16,59 @@ class MemoryConfig:
     cleanup_threshold: float = 70.0  # Threshold to trigger cleanup
     chunk_size: int = 1000  # Number of items to process in each chunk
     enable_monitoring: bool = True
+    max_rss_bytes: Optional[int] = None  # Absolute limit on the resident set size
+    cleanup_rss_bytes: Optional[int] = None  # Resident set size that triggers cleanup
+    check_interval: float = 0.5  # Seconds between samples taken through should_check
+    check_every: int = 10_000  # Operations between samples, whichever comes first
 
 class MemoryError(Exception):
     """Raised when memory limits are exceeded."""
     pass
 
+class SamplingCadence:
+    """Operations counted and time of the next memory sample for one consumer of a manager.
+    
+    A manager shared by concurrent loops (e.g. the traversals of one extractor) gives
+    each loop its own cadence, so one loop's operations do not change when another
+    samples.
+    """
+    
+    def __init__(self, config: MemoryConfig):
+        """Initialize a cadence whose first check samples.
+        
+        Args:
+            config: Memory management configuration
+        """
+        self.config = config
+        self.operations = 0
+        self.next_check_at = 0.0
+    
+    def due(self) -> bool:
+        """Count an operation and tell whether a sample is due."""
+        if not self.config.enable_monitoring:
+            return False
+        self.operations += 1
+        return self.operations >= self.config.check_every or time.monotonic() >= self.next_check_at
+    
+    def sampled(self) -> None:
+        """Restart the count after a sample."""
+        self.operations = 0
+        self.next_check_at = time.monotonic() + self.config.check_interval
+
 class MemoryManager:
-    """Memory manager for handling large data sets."""
+    """Memory manager for handling large data sets.
+    
+    Reading the resident set size is a system call, too slow for hot loops. Loops
+    guard their checks with ``should_check``, which costs a counter increment and a
+    clock read, and only sample memory every ``check_interval`` seconds or
+    ``check_every`` operations:
+    
+        if memory.should_check():
+            memory.check_memory()
+    
+    Concurrent loops sharing a manager pass their own ``cadence()`` to
+    ``should_check`` and ``limit_exceeded``.
+    """
     
     def __init__(self, config: Optional[MemoryConfig] = None):
         """Initialize memory manager.
@@ -31,6 +78,39 @@ class MemoryManager:
         """
         self.config = config or MemoryConfig()
         self._process = psutil.Process(os.getpid())
+        self._total_memory = psutil.virtual_memory().total
+        self._cadence = self.cadence()
+        self.last_rss = 0  # Resident set size at the last sample, in bytes
+        self.samples = 0
+    
+    def cadence(self) -> SamplingCadence:
+        """Create a sampling cadence for a loop sharing this manager with others."""
+        return SamplingCadence(self.config)
+    
+    def should_check(self, cadence: Optional[SamplingCadence] = None) -> bool:
+        """Count an operation and tell whether a memory sample is due.
+        
+        Args:
+            cadence: Cadence of the calling loop, or None for the manager's own
+            
+        Returns:
+            True every ``check_every`` operations or ``check_interval`` seconds, and on the first call
+        """
+        return (cadence or self._cadence).due()
+    
+    def get_rss(self, cadence: Optional[SamplingCadence] = None) -> int:
+        """Sample the resident set size of the process.
+        
+        Args:
+            cadence: Cadence to restart, or None for the manager's own
+            
+        Returns:
+            Resident set size in bytes
+        """
+        self.last_rss = self._process.memory_info().rss
+        self.samples += 1
+        (cadence or self._cadence).sampled()
+        return self.last_rss
     
     def get_memory_usage(self) -> float:
         """Get current memory usage as percentage.
@@ -38,7 +118,31 @@ class MemoryManager:
         Returns:
             Memory usage percentage
         """
-        return self._process.memory_percent()
+        return self.get_rss() * 100.0 / self._total_memory
+    
+    def limit_exceeded(self, cadence: Optional[SamplingCadence] = None) -> Optional[str]:
+        """Sample memory usage, cleaning up above the cleanup thresholds, and compare it to the limits.
+        
+        Args:
+            cadence: Cadence of the calling loop, or None for the manager's own
+            
+        Returns:
+            Description of the exceeded limit, or None if memory usage is within the limits
+        """
+        rss = self.get_rss(cadence)
+        usage = rss * 100.0 / self._total_memory
+        
+        if usage > self.config.max_memory_percent:
+            return f"Memory usage ({usage:.1f}%) exceeds maximum limit ({self.config.max_memory_percent}%)"
+        if self.config.max_rss_bytes is not None and rss > self.config.max_rss_bytes:
+            return f"Memory usage ({rss} bytes) exceeds maximum limit ({self.config.max_rss_bytes} bytes)"
+            
+        if usage > self.config.cleanup_threshold or (
+            self.config.cleanup_rss_bytes is not None and rss > self.config.cleanup_rss_bytes
+        ):
+            logger.warning(f"Memory usage high ({usage:.1f}%, {rss} bytes), triggering cleanup")
+            self.cleanup()
+        return None
     
     def check_memory(self) -> None:
         """Check memory usage and cleanup if needed.
@@ -49,14 +153,9 @@ class MemoryManager:
         if not self.config.enable_monitoring:
             return
             
-        usage = self.get_memory_usage()
-        
-        if usage > self.config.max_memory_percent:
-            raise MemoryError(f"Memory usage ({usage:.1f}%) exceeds maximum limit ({self.config.max_memory_percent}%)")
-            
-        if usage > self.config.cleanup_threshold:
-            logger.warning(f"Memory usage high ({usage:.1f}%), triggering cleanup")
-            self.cleanup()
+        exceeded = self.limit_exceeded()
+        if exceeded:
+            raise MemoryError(exceeded)
     
     def cleanup(self) -> None:
         """Perform memory cleanup."""
@@ -0,0 +1,163 @@
+"""Negative cache: remember resources that failed to fetch so they are skipped for a while."""
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+from dataclasses import dataclass, asdict
+from .atomic_json import write_json
+
+logger = logging.getLogger(__name__)
+
+FAILURE_CLASSES = ('not_found', 'forbidden', 'unavailable', 'timeout', 'error')
+
+@dataclass
+class NegativeCacheConfig:
+    """Seconds a failure is remembered, by failure class. 0 disables caching the class."""
+    not_found_seconds: float = 24 * 3600.0  # 404, deleted or moved tickets and pages
+    forbidden_seconds: float = 6 * 3600.0  # 401 and 403
+    unavailable_seconds: float = 3600.0  # The fetcher returned nothing without saying why
+    timeout_seconds: float = 300.0  # Request timeouts (not the extraction deadline)
+    error_seconds: float = 60.0  # Anything else, e.g. 5xx responses
+    max_entries: int = 100_000  # Entries closest to expiry are dropped beyond this
+
+    def ttl(self, failure_class: str) -> float:
+        """Seconds a failure of the given class is remembered."""
+        return getattr(self, f"{failure_class}_seconds", self.error_seconds)
+
+@dataclass
+class NegativeEntry:
+    """A remembered failure."""
+    failure_class: str
+    error: str
+    expires_at: float  # time.time() value
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an error raised by requests, aiohttp or the Atlassian client, if any."""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+def classify_failure(error: BaseException) -> str:
+    """Map a fetch error to a failure class.
+
+    Args:
+        error: Exception raised by the fetch
+
+    Returns:
+        One of 'not_found', 'forbidden', 'timeout' or 'error'
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout'
+    status = _status_code(error)
+    name = type(error).__name__
+    message = str(error).lower()
+    if status == 404 or name == 'ApiNotFoundError' or 'does not exist' in message or 'not found' in message:
+        return 'not_found'
+    if status in (401, 403) or name == 'ApiPermissionError' or 'permission' in message:
+        return 'forbidden'
+    return 'error'
+
+class NegativeCache:
+    """Failed resources by canonical key ("jira:PROJ-1", "confluence:12345", "webpage:<url>").
+
+    One cache is shared by every extraction of an extractor, so a resource that failed
+    in one bundle is skipped instantly in the next until its entry expires. With a path,
+    the cache is loaded from and written to a JSON file, so it survives restarts.
+    Recording a failure only marks the cache dirty; ``flush`` writes it, which the
+    extractor does once at the end of every extraction.
+    """
+
+    def __init__(self, path: Optional[str] = None, config: Optional[NegativeCacheConfig] = None):
+        """Initialize the negative cache.
+
+        Args:
+            path: Optional JSON file persisting the cache. Loaded if it exists and
+                written by ``flush``. An unreadable file is ignored.
+            config: Time to live of each failure class
+        """
+        self.config = config or NegativeCacheConfig()
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, NegativeEntry] = {}
+        self.stats = {'hits': 0, 'recorded': 0}
+        self.dirty = False  # Failures were recorded since the file was last written
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[NegativeEntry]:
+        """Get the unexpired failure recorded for a resource, if any."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= (now if now is not None else time.time()):
+            del self.entries[key]
+            return None
+        self.stats['hits'] += 1
+        return entry
+
+    def record(self, key: str, failure_class: str, error: str) -> None:
+        """Remember that fetching a resource failed.
+
+        Args:
+            key: Canonical resource key
+            failure_class: One of FAILURE_CLASSES, e.g. from ``classify_failure``
+            error: Error message reported for skipped references
+        """
+        ttl = self.config.ttl(failure_class)
+        if ttl <= 0:
+            return
+        self.entries[key] = NegativeEntry(failure_class, error, time.time() + ttl)
+        self.stats['recorded'] += 1
+        self.dirty = True
+        logger.debug(f"Remembering {failure_class} failure of {key} for {ttl:.0f}s")
+        if len(self.entries) > self.config.max_entries:
+            self.prune()
+
+    def forget(self, key: str) -> None:
+        """Drop the failure recorded for a resource, e.g. after fixing its permissions."""
+        self.entries.pop(key, None)
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Drop expired entries, and the entries closest to expiry beyond ``max_entries``."""
+        now = now if now is not None else time.time()
+        live = sorted(
+            ((key, entry) for key, entry in self.entries.items() if entry.expires_at > now),
+            key=lambda item: item[1].expires_at,
+            reverse=True
+        )
+        self.entries = dict(live[:self.config.max_entries])
+
+    def flush(self) -> None:
+        """Write the cache if failures were recorded since it was last written."""
+        if self.dirty:
+            self.save()
+
+    def save(self) -> None:
+        """Write the cache to its JSON file atomically.
+
+        Safe to run on a worker thread while the event loop records failures: the
+        entries are copied in one step before they are serialized.
+        """
+        if self.path is None:
+            return
+        self.dirty = False
+        entries = self.entries.copy()
+        write_json(self.path, {key: asdict(entry) for key, entry in entries.items()})
+
+    def _load(self) -> None:
+        """Load a cache written by ``save``, starting empty if the file cannot be read."""
+        try:
+            with open(self.path) as f:
+                self.entries = {key: NegativeEntry(**entry) for key, entry in json.load(f).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable negative cache {self.path}: {str(e)}")
+            self.entries = {}
+            return
+        self.prune()
@@ -0,0 +1,226 @@
+"""Graph-normalized ticket bundles: a node table plus an edge list."""
+from typing import Dict, List, Any, Optional, Set, Iterable
+from dataclasses import dataclass, field
+from . import config
+from .reference_graph import ReferenceGraph, copy_ticket_data
+
+@dataclass(frozen=True)
+class ReferenceEdge:
+    """A reference from one ticket to another."""
+    source: str  # Referencing ticket key
+    target: str  # Referenced ticket key
+    context: str  # Where the reference was found, e.g. "Found in comment by Jane Doe"
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert the edge to a dictionary."""
+        return {'source': self.source, 'target': self.target, 'context': self.context}
+
+def placeholder_reference(ticket_id: str, is_parent_reference: bool = False) -> Dict[str, Any]:
+    """Create a placeholder for a ticket that is already part of a bundle."""
+    return {
+        'id': ticket_id,
+        'url': f"{config.JIRA_URL}/browse/{ticket_id}",
+        'context': "Previously processed ticket",
+        'metadata': {
+            'platform': 'knowledge_base',
+            'resource_type': 'jira_ticket',
+            'resource_id': ticket_id,
+            'ticket_id': ticket_id,
+            'is_parent_reference': is_parent_reference,
+            'is_processed_reference': True
+        }
+    }
+
+def truncated_reference(ticket_id: str, unfinished: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Create a marker for a referenced ticket left unfetched because a budget or deadline ran out.
+
+    Args:
+        ticket_id: The referenced ticket
+        unfinished: Status and seconds spent, for a ticket whose fetch was started but did not finish
+
+    Returns:
+        Marker dictionary
+    """
+    unfinished = unfinished or {'status': 'not_started', 'elapsed_seconds': None}
+    if unfinished['status'] == 'not_started':
+        reference_context = "Not fetched: traversal budget reached"
+    else:
+        reference_context = f"Not fetched: {unfinished['status']} after {unfinished['elapsed_seconds']:.1f}s"
+    return {
+        'id': ticket_id,
+        'url': f"{config.JIRA_URL}/browse/{ticket_id}",
+        'context': reference_context,
+        'metadata': {
+            'platform': 'knowledge_base',
+            'resource_type': 'jira_ticket',
+            'resource_id': ticket_id,
+            'ticket_id': ticket_id,
+            'is_truncated': True,
+            'status': unfinished['status'],
+            'elapsed_seconds': unfinished['elapsed_seconds']
+        }
+    }
+
+@dataclass
+class NormalizedBundle:
+    """Tickets stored once in a node table, linked by an edge list.
+
+    Nodes hold the ticket data with an empty ``references['jira_tickets']`` list;
+    Confluence pages, documentation and other URLs stay on the ticket that
+    references them. Edges keep their discovery order, which is all that is
+    needed to rebuild the nested bundles with ``expand``. Edges may point to
+    ``truncated`` tickets, which a traversal budget left unfetched; those that were
+    started but cut off by a deadline have their status in ``unfinished``.
+    """
+    roots: List[str]
+    nodes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    edges: List[ReferenceEdge] = field(default_factory=list)
+    max_depth: int = 2
+    truncated: List[str] = field(default_factory=list)
+    unfinished: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _adjacency: Optional[Dict[str, List[ReferenceEdge]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: ReferenceGraph,
+        roots: Iterable[str],
+        max_depth: int,
+        depth: int = 0,
+        claimed: Optional[Set[str]] = None
+    ) -> 'NormalizedBundle':
+        """Build a normalized bundle from a crawled reference graph.
+
+        Only tickets within ``max_depth`` of a root are kept. Tickets that failed to
+        fetch, and references to them, are left out.
+
+        Args:
+            graph: Crawled reference graph
+            roots: Root ticket IDs
+            max_depth: Maximum reference depth
+            depth: Depth of the root tickets in the reference chain
+            claimed: Ticket IDs already embedded elsewhere; references to them are kept
+                so they expand to placeholders
+
+        Returns:
+            NormalizedBundle
+        """
+        roots = list(dict.fromkeys(roots))
+        claimed = claimed or set()
+        levels: Dict[str, int] = {}
+        frontier = [root_id for root_id in roots if graph.is_available(root_id)]
+        for root_id in frontier:
+            levels[root_id] = depth
+
+        while frontier:
+            next_frontier = []
+            for key in frontier:
+                if levels[key] + 1 > max_depth:
+                    continue
+                for referenced_key in graph.get(key).referenced_keys:
+                    if referenced_key not in levels and graph.is_available(referenced_key):
+                        levels[referenced_key] = levels[key] + 1
+                        next_frontier.append(referenced_key)
+            frontier = next_frontier
+
+        edges = [
+            ReferenceEdge(source=key, target=reference.key, context=reference.context)
+            for key in levels
+            for reference in graph.get(key).references
+            if reference.key in levels or reference.key in claimed or reference.key in graph.truncated
+        ]
+        nodes = {key: graph.get(key).data for key in levels}
+        truncated = sorted(
+            {edge.target for edge in edges if edge.target in graph.truncated}
+            | {root_id for root_id in roots if root_id in graph.truncated}
+        )
+        unfinished = {key: graph.unfinished[key] for key in truncated if key in graph.unfinished}
+        return cls(roots=roots, nodes=nodes, edges=edges, max_depth=max_depth, truncated=truncated, unfinished=unfinished)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NormalizedBundle':
+        """Create a normalized bundle from the output of ``to_dict``."""
+        return cls(
+            roots=list(data['roots']),
+            nodes=dict(data['nodes']),
+            edges=[ReferenceEdge(**edge) for edge in data['edges']],
+            max_depth=data.get('max_depth', 2),
+            truncated=list(data.get('truncated', [])),
+            unfinished=dict(data.get('unfinished', {}))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the bundle to a dictionary."""
+        return {
+            'roots': list(self.roots),
+            'max_depth': self.max_depth,
+            'nodes': self.nodes,
+            'edges': [edge.to_dict() for edge in self.edges],
+            'truncated': list(self.truncated),
+            'unfinished': dict(self.unfinished)
+        }
+
+    def outgoing(self, key: str) -> List[ReferenceEdge]:
+        """Edges leaving a ticket, in discovery order."""
+        if self._adjacency is None:
+            adjacency: Dict[str, List[ReferenceEdge]] = {}
+            for edge in self.edges:
+                adjacency.setdefault(edge.source, []).append(edge)
+            self._adjacency = adjacency
+        return self._adjacency.get(key, [])
+
+    def expand(self, root_id: str, claimed: Optional[Set[str]] = None, depth: int = 0) -> Optional[Dict[str, Any]]:
+        """Rebuild the nested bundle of a root ticket.
+
+        Tickets are claimed breadth-first in discovery order: the first reference to a
+        ticket embeds its full data, later references get a "Previously processed ticket"
+        placeholder. References to truncated tickets get a truncation marker.
+
+        Args:
+            root_id: The root ticket ID
+            claimed: Ticket IDs already embedded elsewhere; updated with the tickets this bundle embeds
+            depth: Depth of the root ticket in the reference chain
+
+        Returns:
+            Dict containing the ticket data and its references, or None if the ticket could not be fetched
+        """
+        if root_id not in self.nodes:
+            return None
+
+        truncated = set(self.truncated)
+        claimed = set() if claimed is None else claimed
+        claimed.add(root_id)
+        bundle = copy_ticket_data(self.nodes[root_id])
+        copies = {root_id: bundle}
+        frontier = [root_id]
+
+        while frontier:
+            next_frontier = []
+            for key in frontier:
+                ticket_references = copies[key]['references']['jira_tickets']
+                for edge in self.outgoing(key):
+                    if edge.target == key:
+                        referenced_ticket = placeholder_reference(edge.target, is_parent_reference=True)
+                    elif edge.target in claimed:
+                        referenced_ticket = placeholder_reference(edge.target)
+                    elif depth + 1 > self.max_depth:
+                        continue
+                    elif edge.target in truncated:
+                        referenced_ticket = truncated_reference(edge.target, self.unfinished.get(edge.target))
+                    elif edge.target not in self.nodes:
+                        continue
+                    else:
+                        claimed.add(edge.target)
+                        referenced_ticket = copy_ticket_data(self.nodes[edge.target])
+                        copies[edge.target] = referenced_ticket
+                        next_frontier.append(edge.target)
+                    ticket_references.append(referenced_ticket)
+
+            frontier = next_frontier
+            depth += 1
+
+        return bundle
+
+    def expand_all(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Rebuild the nested bundle of every root, each with its own claims."""
+        return {root_id: self.expand(root_id) for root_id in self.roots}
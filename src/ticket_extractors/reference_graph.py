@@ -0,0 +1,111 @@
+"""Shared store of the tickets discovered while crawling references."""
+import logging
+from typing import Dict, List, Any, Optional, Iterator, Set
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class TicketReference:
+    """A reference from one ticket to another."""
+    key: str  # Referenced ticket key
+    context: str  # Where the reference was found, e.g. "Found in description"
+    kind: Optional[str] = None  # 'issuelink', 'description' or 'comment'
+
+@dataclass
+class TicketNode:
+    """A ticket fetched during a crawl."""
+    key: str
+    depth: int  # Shallowest depth at which the ticket was reached
+    data: Optional[Dict[str, Any]] = None  # Ticket data without Jira references; None if the fetch failed
+    references: List[TicketReference] = field(default_factory=list)  # Referenced tickets in discovery order
+
+    @property
+    def failed(self) -> bool:
+        """Whether the ticket could not be fetched."""
+        return self.data is None
+
+    @property
+    def referenced_keys(self) -> List[str]:
+        """Keys of the referenced tickets in discovery order."""
+        return [reference.key for reference in self.references]
+
+class ReferenceGraph:
+    """Tickets fetched by a crawl, shared by every bundle assembled from it.
+
+    Each ticket is stored once, with the keys it references in discovery order.
+    Bundles are assembled from the graph without fetching anything again.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, TicketNode] = {}
+        self.truncated: Set[str] = set()  # Tickets left unfetched because a budget ran out
+        self.unfinished: Dict[str, Dict[str, Any]] = {}  # Status and seconds spent of truncated tickets that were started
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.nodes
+
+    def __iter__(self) -> Iterator[TicketNode]:
+        return iter(self.nodes.values())
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get(self, key: str) -> Optional[TicketNode]:
+        """Get a node by ticket key."""
+        return self.nodes.get(key)
+
+    def add(self, key: str, depth: int, data: Optional[Dict[str, Any]], references: Optional[List[TicketReference]] = None) -> TicketNode:
+        """Add a fetched (or failed) ticket to the graph.
+
+        Args:
+            key: Ticket key
+            depth: Depth at which the ticket was reached
+            data: Ticket data, or None if the fetch failed
+            references: Tickets referenced by this ticket, in discovery order
+
+        Returns:
+            The stored node
+        """
+        node = TicketNode(key=key, depth=depth, data=data, references=list(references or []))
+        self.nodes[key] = node
+        return node
+
+    def remove(self, key: str) -> None:
+        """Remove a ticket from the graph."""
+        self.nodes.pop(key, None)
+
+    def is_available(self, key: str) -> bool:
+        """Whether a ticket was fetched successfully."""
+        node = self.nodes.get(key)
+        return node is not None and not node.failed
+
+    def mark_truncated(self, key: str) -> None:
+        """Record a referenced ticket that was not fetched because a budget ran out."""
+        self.truncated.add(key)
+
+    def mark_unfinished(self, key: str, status: str, elapsed: float) -> None:
+        """Record a ticket whose fetch was started but did not finish before its deadline.
+
+        Args:
+            key: Ticket key
+            status: 'timeout' if its own request timed out, 'cancelled' if the extraction deadline cancelled it
+            elapsed: Seconds spent on the ticket
+        """
+        self.nodes.pop(key, None)
+        self.truncated.add(key)
+        self.unfinished[key] = {'status': status, 'elapsed_seconds': round(elapsed, 3)}
+
+    def failed_keys(self) -> List[str]:
+        """Keys of tickets that could not be fetched."""
+        return [node.key for node in self.nodes.values() if node.failed]
+
+def copy_ticket_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy stored ticket data so a bundle can attach its own references.
+
+    Comments and reference entries are shared with the stored data; only the
+    containers a bundle appends to are copied.
+    """
+    copied = dict(data)
+    copied['references'] = {ref_type: list(refs) for ref_type, refs in data['references'].items()}
+    return copied
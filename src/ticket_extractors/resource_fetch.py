@@ -0,0 +1,34 @@
+"""Fetching of the Confluence pages and documentation referenced by tickets."""
+from typing import Dict, Any
+from dataclasses import dataclass
+from .url_analyzer import canonical_url
+
+# Reference lists whose entries are fetched, and the pool that fetches them
+FETCHED_REFERENCES = {
+    'confluence_pages': 'confluence',
+    'scrapable_documentation': 'webpage',
+}
+
+@dataclass
+class ResourceFetchConfig:
+    """Configuration for fetching referenced Confluence pages and documentation."""
+    enabled: bool = True  # False records references without fetching them
+    confluence_concurrency: int = 4  # Concurrent Confluence page fetches per extraction
+    webpage_concurrency: int = 2  # Concurrent browser scrapes per extraction
+
+    def pool_limits(self) -> Dict[str, int]:
+        """Concurrency limit of each resource pool."""
+        return {
+            'confluence': max(1, self.confluence_concurrency),
+            'webpage': max(1, self.webpage_concurrency),
+        }
+
+def resource_key(ref_type: str, reference: Dict[str, Any]) -> str:
+    """Key identifying the resource behind a reference, so it is fetched once per extraction.
+
+    Confluence pages are keyed by their numeric id. A title alone (from /display/SPACE/Title
+    links) is only unique within its space, so such pages are keyed by their URL.
+    """
+    if ref_type == 'confluence_pages' and str(reference.get('id') or '').isdigit():
+        return f"confluence:{reference['id']}"
+    return f"{FETCHED_REFERENCES.get(ref_type, ref_type)}:{canonical_url(reference['url'])}"
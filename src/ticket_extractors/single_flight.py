@@ -0,0 +1,115 @@
+"""Request coalescing: concurrent requests for the same resource share one fetch."""
+import asyncio
+import logging
+from typing import Dict, Any, Awaitable, Callable, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class _Flight:
+    """An in-flight fetch and the number of callers waiting for it."""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+class SingleFlight:
+    """Shares one in-flight future among concurrent requests for the same key.
+
+    Keys are tuples whose first element names the kind of resource ('jira',
+    'confluence' or 'webpage'); statistics are kept per kind. A key is forgotten as
+    soon as its fetch completes, so nothing is cached beyond the fetch itself.
+    """
+
+    def __init__(self):
+        """Initialize an empty single-flight group."""
+        self._flights: Dict[Tuple[int, Hashable], _Flight] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: Tuple, stat: str) -> None:
+        kind_stats = self.stats.setdefault(key[0], {'fetches': 0, 'coalesced': 0})
+        kind_stats[stat] += 1
+
+    def _flight_key(self, key: Tuple) -> Tuple[int, Hashable]:
+        # Futures belong to an event loop, so flights are never shared across loops
+        return id(asyncio.get_running_loop()), key
+
+    def in_flight(self, key: Tuple) -> bool:
+        """Whether a fetch for a key is in flight."""
+        return self._flight_key(key) in self._flights
+
+    async def do(self, key: Tuple, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Run a fetch, or join the one already in flight for the same key.
+
+        A caller that is cancelled stops waiting without cancelling the fetch for the
+        other callers; the fetch is cancelled when its last caller is.
+
+        Args:
+            key: Resource key, e.g. ('confluence', '12345')
+            fetch: Coroutine function performing the fetch
+
+        Returns:
+            Result of the fetch
+
+        Raises:
+            Exception: Any exception raised by the fetch, to every caller
+        """
+        flight_key = self._flight_key(key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fetch()))
+            self._flights[flight_key] = flight
+            flight.future.add_done_callback(lambda _: self._forget(flight_key, flight))
+            self._count(key, 'fetches')
+        else:
+            self._count(key, 'coalesced')
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.future.done():
+                flight.future.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def claim(self, key: Tuple) -> Tuple[asyncio.Future, bool]:
+        """Claim a key for a fetch the caller performs itself, e.g. as part of a batch.
+
+        Returns:
+            Tuple of (future, owner). When ``owner`` is True the caller must call
+            ``resolve`` or ``abandon`` for the key; otherwise it awaits the future of
+            the fetch already in flight.
+        """
+        flight_key = self._flight_key(key)
+        flight = self._flights.get(flight_key)
+        if flight is not None:
+            self._count(key, 'coalesced')
+            return flight.future, False
+
+        flight = _Flight(asyncio.get_running_loop().create_future())
+        self._flights[flight_key] = flight
+        self._count(key, 'fetches')
+        return flight.future, True
+
+    def resolve(self, key: Tuple, future: asyncio.Future, result: Any) -> None:
+        """Complete a claimed fetch, handing its result to every waiting caller."""
+        if not future.done():
+            future.set_result(result)
+        self._forget(self._flight_key(key), None, future)
+
+    def abandon(self, key: Tuple, future: asyncio.Future) -> None:
+        """Give up a claimed fetch; waiting callers see it cancelled and fetch for themselves."""
+        if not future.done():
+            future.cancel()
+        self._forget(self._flight_key(key), None, future)
+
+    def _forget(self, flight_key: Tuple[int, Hashable], flight: Any = None, future: asyncio.Future = None) -> None:
+        current = self._flights.get(flight_key)
+        if current is not None and (current is flight or current.future is future):
+            del self._flights[flight_key]
+
+    def __len__(self) -> int:
+        return len(self._flights)
@@ -0,0 +1,243 @@
+"""Persistent on-disk cache for Jira issue payloads."""
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) clauses below SQLite's host parameter limit
+_MAX_PARAMS = 500
+
+def _chunks(keys: Sequence[str]) -> List[Sequence[str]]:
+    """Split keys into chunks small enough for a single statement."""
+    return [keys[i:i + _MAX_PARAMS] for i in range(0, len(keys), _MAX_PARAMS)]
+
+@dataclass
+class TicketCacheConfig:
+    """Configuration for the ticket cache."""
+    ttl_seconds: float = 300.0  # Entries younger than this are served without revalidation
+    revalidate: bool = True  # Revalidate older entries by comparing their `updated` field
+    max_bytes: int = 512 * 1024 * 1024  # Size bound for stored payloads
+    eviction_target: float = 0.9  # Evict down to this fraction of max_bytes
+    busy_timeout: float = 30.0  # Seconds to wait for another process holding the database lock
+
+@dataclass
+class CachedTicket:
+    """A cached issue payload."""
+    key: str
+    issue: Dict[str, Any]
+    comments: Dict[str, Any]
+    fields: Tuple[str, ...]
+    updated: Optional[str]
+    fetched_at: float
+
+    def covers(self, fields: Sequence[str]) -> bool:
+        """Check whether the cached payload was fetched with at least the given fields."""
+        return '*all' in self.fields or set(fields).issubset(self.fields)
+
+class TicketCache:
+    """SQLite-backed cache of Jira issues and their comments, keyed by ticket key.
+
+    The database lives in a directory that several processes can share: SQLite's
+    locking serializes writers and WAL mode lets readers proceed concurrently.
+    """
+
+    DB_NAME = "tickets.sqlite3"
+
+    def __init__(self, cache_dir: str, config: Optional[TicketCacheConfig] = None):
+        """Initialize the ticket cache.
+
+        Args:
+            cache_dir: Directory holding the cache database. Created if missing.
+            config: Cache configuration
+        """
+        self.config = config or TicketCacheConfig()
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / self.DB_NAME
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.config.busy_timeout,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                key TEXT PRIMARY KEY,
+                updated TEXT,
+                fields TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tickets_accessed ON tickets (accessed_at)")
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset cache statistics."""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stale': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+    def get_many(self, keys: Sequence[str], fields: Sequence[str]) -> Dict[str, CachedTicket]:
+        """Look up cached payloads that cover the requested fields.
+
+        Lookups are not counted as hits or misses until the caller decides whether the
+        entries are fresh (see is_fresh, mark_fresh and record_misses).
+
+        Args:
+            keys: Ticket keys to look up
+            fields: Fields the caller needs
+
+        Returns:
+            Dict mapping ticket keys to cached entries
+        """
+        if not keys:
+            return {}
+
+        rows = []
+        with self._lock:
+            for chunk in _chunks(list(keys)):
+                placeholders = ', '.join('?' for _ in chunk)
+                rows.extend(self._conn.execute(
+                    f"SELECT key, updated, fields, payload, fetched_at FROM tickets WHERE key IN ({placeholders})",
+                    list(chunk)
+                ).fetchall())
+
+        entries = {}
+        for key, updated, cached_fields, payload, fetched_at in rows:
+            try:
+                issue, comments = json.loads(payload)
+            except (ValueError, TypeError):
+                logger.warning(f"Discarding corrupt cache entry for {key}")
+                continue
+            entry = CachedTicket(
+                key=key,
+                issue=issue,
+                comments=comments,
+                fields=tuple(cached_fields.split(',')),
+                updated=updated,
+                fetched_at=fetched_at
+            )
+            if entry.covers(fields):
+                entries[key] = entry
+        return entries
+
+    def is_fresh(self, entry: CachedTicket, now: Optional[float] = None) -> bool:
+        """Check whether an entry is young enough to be served without revalidation."""
+        now = time.time() if now is None else now
+        return now - entry.fetched_at < self.config.ttl_seconds
+
+    def mark_fresh(self, keys: Sequence[str], revalidated: bool = False) -> None:
+        """Record cache hits, refreshing the entries' timestamps.
+
+        Args:
+            keys: Ticket keys served from the cache
+            revalidated: Whether the entries were confirmed unchanged against Jira
+        """
+        if not keys:
+            return
+
+        now = time.time()
+        with self._lock:
+            for chunk in _chunks(list(keys)):
+                placeholders = ', '.join('?' for _ in chunk)
+                if revalidated:
+                    self._conn.execute(
+                        f"UPDATE tickets SET fetched_at = ?, accessed_at = ? WHERE key IN ({placeholders})",
+                        [now, now, *chunk]
+                    )
+                else:
+                    self._conn.execute(
+                        f"UPDATE tickets SET accessed_at = ? WHERE key IN ({placeholders})",
+                        [now, *chunk]
+                    )
+        self.stats['hits'] += len(keys)
+        if revalidated:
+            self.stats['revalidated'] += len(keys)
+
+    def record_misses(self, count: int, stale: int = 0) -> None:
+        """Record cache misses.
+
+        Args:
+            count: Number of lookups that could not be served from the cache
+            stale: How many of them had an outdated entry
+        """
+        self.stats['misses'] += count
+        self.stats['stale'] += stale
+
+    def put_many(self, entries: Sequence[Tuple[str, Dict[str, Any], Dict[str, Any], Sequence[str]]]) -> None:
+        """Store fetched payloads and evict old entries if the cache grows too large.
+
+        Args:
+            entries: Tuples of (ticket key, issue, comments, fields fetched)
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = []
+        for key, issue, comments, fields in entries:
+            payload = json.dumps([issue, comments], separators=(',', ':'), default=str)
+            updated = (issue.get('fields') or {}).get('updated')
+            rows.append((key, updated, ','.join(fields), payload, len(payload), now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tickets (key, updated, fields, payload, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self.stats['stores'] += len(rows)
+        self._evict_if_needed()
+
+    def invalidate(self, keys: Sequence[str]) -> None:
+        """Remove entries from the cache."""
+        if not keys:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM tickets WHERE key = ?", [(key,) for key in keys])
+
+    def size_bytes(self) -> int:
+        """Total size of the stored payloads."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM tickets").fetchone()[0]
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently accessed entries until the cache is within its size bound."""
+        total = self.size_bytes()
+        if total <= self.config.max_bytes:
+            return
+
+        target = int(self.config.max_bytes * self.config.eviction_target)
+        evicted = []
+        with self._lock:
+            rows = self._conn.execute("SELECT key, size FROM tickets ORDER BY accessed_at ASC").fetchall()
+            for key, size in rows:
+                if total <= target:
+                    break
+                evicted.append(key)
+                total -= size
+            self._conn.executemany("DELETE FROM tickets WHERE key = ?", [(key,) for key in evicted])
+
+        self.stats['evictions'] += len(evicted)
+        logger.info(f"Evicted {len(evicted)} ticket(s) from cache {self.db_path}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
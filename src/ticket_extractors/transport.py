@@ -0,0 +1,99 @@
+"""Non-blocking transport for the synchronous Atlassian API clients."""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TypeVar, Callable, Optional, Dict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+@dataclass
+class TransportConfig:
+    """Configuration for the executor transport."""
+    max_workers: int = 16  # Maximum number of blocking calls in flight
+    thread_name_prefix: str = "atlassian-transport"
+
+class ExecutorTransport:
+    """Runs blocking API client calls on a managed thread pool.
+
+    The atlassian-python-api clients are synchronous. Awaiting them through this
+    transport keeps the event loop free, so concurrent coroutines actually overlap
+    their HTTP round trips instead of running serially.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """Initialize the transport.
+
+        Args:
+            config: Transport configuration
+        """
+        self.config = config or TransportConfig()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            'calls': 0,
+            'errors': 0
+        }
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The underlying thread pool, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix=self.config.thread_name_prefix
+                )
+            return self._executor
+
+    async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking function on the thread pool and await its result.
+
+        Args:
+            func: Blocking function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result from func
+
+        Raises:
+            Exception: Any exception raised by func
+        """
+        loop = asyncio.get_running_loop()
+        self.stats['calls'] += 1
+        try:
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the thread pool. It is recreated if the transport is used again.
+
+        Args:
+            wait: Whether to wait for in-flight calls to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+_default_transport: Optional[ExecutorTransport] = None
+_default_transport_lock = threading.Lock()
+
+def get_default_transport() -> ExecutorTransport:
+    """Get the process-wide transport shared by extractors created without one.
+
+    Returns:
+        Shared ExecutorTransport instance
+    """
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = ExecutorTransport()
+        return _default_transport
@@ -0,0 +1,185 @@
+"""Per-call state for reference traversals."""
+import time
+import heapq
+import asyncio
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from .fetch_planner import FetchStats
+from .memory_manager import MemoryManager, SamplingCadence
+
+# Fetch order of references at the same depth: parents and direct issue links first,
+# comment mentions last
+REFERENCE_PRIORITY = {
+    'root': 0,
+    'parent': 1,
+    'issuelink': 2,
+    'child': 3,
+    'description': 4,
+    'comment': 5,
+}
+
+@dataclass
+class TraversalBudget:
+    """Limits for a single extraction. None means unlimited."""
+    max_tickets: Optional[int] = None  # Tickets fetched, including the roots
+    max_seconds: Optional[float] = None  # Wall-clock time since the extraction started
+    max_bytes: Optional[int] = None  # Payload bytes received from Jira
+    max_api_calls: Optional[int] = None  # Requests sent to Jira
+
+    @property
+    def limited(self) -> bool:
+        """Whether any limit is set."""
+        return any(limit is not None for limit in (
+            self.max_tickets, self.max_seconds, self.max_bytes, self.max_api_calls
+        ))
+
+@dataclass
+class TimeoutConfig:
+    """Deadlines for a single extraction. None means no deadline."""
+    node_seconds: Optional[float] = None  # Each Jira request, Confluence page fetch or web page scrape
+    bundle_seconds: Optional[float] = None  # The whole extraction; unfinished work is cancelled
+
+class ReferenceQueue:
+    """Tickets waiting to be fetched, shallowest and highest-priority first."""
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, int, str]] = []
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, key: str, depth: int, kind: str) -> None:
+        """Queue a ticket reached at a depth through a reference of the given kind."""
+        priority = REFERENCE_PRIORITY.get(kind, len(REFERENCE_PRIORITY))
+        heapq.heappush(self._heap, (depth, priority, self._counter, key))
+        self._counter += 1
+
+    def next_depth(self) -> int:
+        """Depth of the next ticket in the queue."""
+        return self._heap[0][0]
+
+    def pop_level(self, limit: Optional[int] = None) -> List[str]:
+        """Pop up to ``limit`` tickets of the shallowest queued depth, in priority order."""
+        depth = self.next_depth()
+        keys = []
+        while self._heap and self._heap[0][0] == depth and (limit is None or len(keys) < limit):
+            keys.append(heapq.heappop(self._heap)[3])
+        return keys
+
+    def drain(self) -> List[str]:
+        """Pop every queued ticket in priority order."""
+        keys = [entry[3] for entry in sorted(self._heap)]
+        self._heap = []
+        return keys
+
+def _new_reference_stats() -> Dict[str, Any]:
+    return {
+        'total_references': 0,
+        'by_type': {},
+        'by_depth': {},
+        'failed_fetches': 0
+    }
+
+@dataclass
+class TraversalContext:
+    """State of a single extraction.
+
+    Every get_ticket or mine_many call works on its own context, so one extractor
+    can serve many concurrent extractions without them seeing each other's
+    processed tickets or statistics. Pass a context explicitly to read its
+    statistics after the call.
+    """
+    max_concurrency: int = 10
+    processed_ids: Set[str] = field(default_factory=set)  # Tickets already embedded in the bundle
+    failed_urls: List[str] = field(default_factory=list)  # Resources that could not be fetched
+    reference_stats: Dict[str, Any] = field(default_factory=_new_reference_stats)
+    fetch_stats: FetchStats = field(default_factory=FetchStats)
+    budget: TraversalBudget = field(default_factory=TraversalBudget)
+    tickets_fetched: int = 0
+    truncated_reason: Optional[str] = None  # Why the traversal stopped early, if it did
+    started_at: float = field(default_factory=time.monotonic)
+    resource_limits: Dict[str, int] = field(default_factory=dict)  # Concurrency of each resource pool
+    resource_tasks: Dict[str, 'asyncio.Future'] = field(default_factory=dict, repr=False)  # Fetches by resource key
+    streamed_resources: Set[str] = field(default_factory=set, repr=False)  # Resources a stream yielded and released
+    node_timeout: Optional[float] = None  # Seconds allowed for each request
+    deadline: Optional[float] = None  # time.monotonic() value by which the extraction must finish
+    timed_out: Dict[str, float] = field(default_factory=dict)  # Tickets whose fetch timed out, with the seconds spent
+    resource_started: Dict[str, float] = field(default_factory=dict, repr=False)  # Start times of resource fetches by URL
+    memory: Optional[MemoryManager] = field(default=None, repr=False, compare=False)  # Governor stopping the traversal at its memory limits
+    memory_cadence: Optional[SamplingCadence] = field(default=None, repr=False, compare=False)  # This traversal's own sampling of ``memory``
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+    _resource_semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding the concurrent requests of this extraction."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        return self._semaphore
+
+    def resource_semaphore(self, pool: str) -> asyncio.Semaphore:
+        """Semaphore bounding the concurrent fetches of one resource pool, separate from Jira's."""
+        if pool not in self._resource_semaphores:
+            self._resource_semaphores[pool] = asyncio.Semaphore(max(1, self.resource_limits.get(pool, 1)))
+        return self._resource_semaphores[pool]
+
+    @property
+    def truncated(self) -> bool:
+        """Whether a budget cut the traversal short."""
+        return self.truncated_reason is not None
+
+    def time_left(self) -> Optional[float]:
+        """Seconds until the extraction deadline, or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def deadline_passed(self) -> bool:
+        """Whether the extraction deadline has been reached."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def call_timeout(self) -> Optional[float]:
+        """Seconds a request started now may take: the node timeout, capped by the deadline."""
+        time_left = self.time_left()
+        if self.node_timeout is None:
+            return time_left
+        return self.node_timeout if time_left is None else min(self.node_timeout, time_left)
+
+    def exhausted_budget(self) -> Optional[str]:
+        """Name the first budget limit that has been reached, or None."""
+        if self.deadline_passed:
+            return 'deadline'
+        if self.memory is not None:
+            if self.memory_cadence is None:
+                self.memory_cadence = self.memory.cadence()
+            if self.memory.should_check(self.memory_cadence) and self.memory.limit_exceeded(self.memory_cadence):
+                return 'memory'
+        budget = self.budget
+        if budget.max_tickets is not None and self.tickets_fetched >= budget.max_tickets:
+            return 'max_tickets'
+        if budget.max_seconds is not None and time.monotonic() - self.started_at >= budget.max_seconds:
+            return 'max_seconds'
+        if budget.max_bytes is not None and self.fetch_stats.bytes_received >= budget.max_bytes:
+            return 'max_bytes'
+        if budget.max_api_calls is not None and self.fetch_stats.api_calls >= budget.max_api_calls:
+            return 'max_api_calls'
+        return None
+
+    def remaining_tickets(self) -> Optional[int]:
+        """Number of tickets that may still be fetched, or None if unlimited."""
+        if self.budget.max_tickets is None:
+            return None
+        return max(0, self.budget.max_tickets - self.tickets_fetched)
+
+    def update_stats(self, ref_type: str, depth: int) -> None:
+        """Count a resolved reference."""
+        self.reference_stats['total_references'] += 1
+        self.reference_stats['by_type'][ref_type] = self.reference_stats['by_type'].get(ref_type, 0) + 1
+        self.reference_stats['by_depth'][depth] = self.reference_stats['by_depth'].get(depth, 0) + 1
+
+    def record_failure(self, url: str) -> None:
+        """Count a resource that could not be fetched."""
+        self.failed_urls.append(url)
+        self.reference_stats['failed_fetches'] += 1
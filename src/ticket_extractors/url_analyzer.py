@@ -1,19 +1,42 @@
 import re
 import json
+from functools import partial
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Mapping, TextIO, Tuple, Union
 from dataclasses import dataclass
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlunparse, parse_qsl, urlencode
 from datetime import datetime
 import os
 from pathlib import Path
 from . import config
-from .rate_limiter import rate_limited
 from .memory_manager import MemoryManager
+from .url_classifier import URLClassifier, ClassificationCache, ClassificationCacheConfig, Classification
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Query parameters that track where a link was clicked rather than select content
+TRACKING_PARAMS = re.compile(
+    r'^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|_ga|_gl|_hsenc|_hsmi|ref_src|focusedCommentId|focusedWorklogId|focusedId)$'
+)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+URL_PATTERN = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
+# Characters that cannot be part of a URL match, so a text can be split after any of them
+URL_DELIMITER = re.compile(r'[\s<>"]')
+LAST_URL_DELIMITER = re.compile(r'[\s<>"][^\s<>"]*\Z')
+STREAM_CHUNK_SIZE = 64 * 1024
+MAX_URL_TOKEN_LENGTH = 64 * 1024
+
+def _last_delimiter(text: str) -> int:
+    """Index of the last character of a text that cannot be part of a URL, or -1."""
+    match = LAST_URL_DELIMITER.search(text)
+    return match.start() if match else -1
+
+def _first_delimiter(text: str) -> int:
+    """Index of the first character of a text that cannot be part of a URL, or its length."""
+    match = URL_DELIMITER.search(text)
+    return match.start() if match else len(text)
+
 @dataclass
 class ResourceMetadata:
     """Metadata about a resource extracted from a URL."""
@@ -30,14 +53,62 @@ class URLMatch:
     resource_metadata: Optional[ResourceMetadata] = None
     context: Optional[str] = None
 
+def canonical_url(url: str) -> str:
+    """Normalize a URL so that links to the same document compare equal.
+
+    The scheme and host are lowercased, default ports, fragments, tracking parameters
+    and trailing slashes are dropped, and the remaining query parameters are sorted.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or 'https'
+    host = (parsed.hostname or '').lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(name)
+    ))
+    return urlunparse((scheme, netloc, parsed.path.rstrip('/'), '', query, ''))
+
+def canonical_key(match: 'URLMatch') -> str:
+    """Key identifying the resource behind a URL match, used to deduplicate references.
+
+    Jira tickets are identified by their key and Confluence pages by their numeric id,
+    whatever URL form links to them; other URLs, including Confluence links that only
+    carry a page title such as /display/SPACE/Title, by their canonical form.
+
+    Args:
+        match: URL match
+
+    Returns:
+        Key such as "jira:PROJ-123", "confluence:12345" or "url:https://docs.example.com/guide"
+    """
+    resource = match.resource_metadata
+    if resource is not None and resource.resource_id:
+        if match.url_type == 'jira':
+            return f"jira:{resource.resource_id}"
+        if match.url_type == 'confluence' and resource.resource_id.isdigit():
+            return f"confluence:{resource.resource_id}"
+    return f"url:{canonical_url(match.url)}"
+
 class URLAnalyzer:
     """Analyzes URLs to determine their type and whether they should be scraped."""
 
-    def __init__(self, patterns_file: Optional[str] = None):
+    def __init__(self, patterns_file: Optional[str] = None, cache_config: Optional[ClassificationCacheConfig] = None):
         """Initialize the URL analyzer.
 
         Args:
             patterns_file: Optional path to a JSON file containing custom URL patterns.
+            cache_config: Optional size bound and persistence of the URL classification cache.
         """
         self.domain_to_platform = {}
         self.platform_patterns = {}
@@ -54,6 +125,24 @@ class URLAnalyzer:
             self._load_custom_patterns(patterns_file)
         else:
             self._load_builtin_patterns()
+        self.classifier = URLClassifier(self.platform_patterns, self.domain_to_platform, self.base_domain)
+        self.classification_cache = ClassificationCache(self.classifier.fingerprint, cache_config)
+
+    def reload_patterns(self, patterns_file: Optional[str] = None):
+        """Replace the URL patterns, invalidating memoized classifications.
+
+        Args:
+            patterns_file: Optional path to a JSON file containing custom URL patterns.
+                The built-in patterns are used without one.
+        """
+        self.domain_to_platform = {}
+        self.platform_patterns = {}
+        if patterns_file:
+            self._load_custom_patterns(patterns_file)
+        else:
+            self._load_builtin_patterns()
+        self.classifier = URLClassifier(self.platform_patterns, self.domain_to_platform, self.base_domain)
+        self.classification_cache.reset(self.classifier.fingerprint)
 
     def _load_builtin_patterns(self):
         """Load built-in patterns for Jira and Confluence."""
@@ -113,72 +202,31 @@ class URLAnalyzer:
 
     def _should_scrape(self, platform: str, path: str) -> bool:
         """Determine if a URL should be scraped based on platform config."""
-        config = self.platform_patterns.get(platform)
-        if not config:
-            return False
-            
-        # Check if scraping is enabled for this platform
-        if not config.get("scrape", False):
-            return False
-            
-        # Check exclude patterns
-        exclude_patterns = config.get("exclude_patterns", [])
-        for pattern in exclude_patterns:
-            # Use re.match to ensure pattern matches from the start of the path
-            # and compile the pattern first for better performance
-            try:
-                logger.info(f"Checking pattern '{pattern}' against path '{path}'")
-                if re.match(pattern, path):
-                    logger.info(f"Pattern '{pattern}' matched path '{path}', excluding from scraping")
-                    return False
-            except re.error:
-                # If the pattern is invalid, log a warning and continue
-                logger.warning(f"Invalid exclude pattern: {pattern}")
-                continue
-                
-        return True
+        return self.classifier.should_scrape(platform, path)
 
     def _extract_resource_metadata(self, platform: str, path: str) -> Optional[ResourceMetadata]:
         """Extract resource metadata from a URL path using platform-specific patterns."""
-        config = self.platform_patterns.get(platform)
-        if not config or "resource_patterns" not in config:
-            return None
-            
-        # Sort patterns by length (descending) to match most specific patterns first
-        patterns = sorted(
-            config["resource_patterns"],
-            key=lambda p: len(p["pattern"]),
-            reverse=True
-        )
-        
-        for pattern_config in patterns:
-            match = re.search(pattern_config["pattern"], path)
-            if match:
-                # Extract resource ID and parent ID if specified
-                resource_id = pattern_config["extract_id"]
-                parent_id = pattern_config.get("parent_id")
-                
-                # Replace capture group references ($1, $2, etc.) with actual values
-                for i, group in enumerate(match.groups(), 1):
-                    resource_id = resource_id.replace(f"${i}", group)
-                    if parent_id:
-                        parent_id = parent_id.replace(f"${i}", group)
-                
-                return ResourceMetadata(
-                    resource_type=pattern_config["type"],
-                    resource_id=resource_id,
-                    parent_id=parent_id
-                )
-                
-        return None
-
-    @rate_limited()
-    async def analyze_content(self, content: str, source_id: str) -> List[URLMatch]:
+        resource = self.classifier.extract_resource(platform, path)
+        return ResourceMetadata(*resource) if resource else None
+
+    def _classify(self, domain: str, path: str) -> Classification:
+        """Classify a URL by its lowercased host and its path without trailing slash."""
+        url_type, platform, resource = self.classifier.classify(domain, path)
+        should_scrape = False
+        if platform:
+            should_scrape = self._should_scrape(platform, path)
+            if not resource:
+                resource = self.classifier.extract_resource(platform, path)
+        return url_type, should_scrape, resource
+
+    async def analyze_content(self, content: str, source_id: Optional[str] = None) -> List[URLMatch]:
         """Analyze content to find and categorize URLs.
 
+        Analysis is local text processing, so it is not rate limited.
+
         Args:
             content: The text content to analyze
-            source_id: ID of the source content (e.g. ticket ID)
+            source_id: Optional ID of the source content (e.g. ticket ID)
 
         Returns:
             List of URLMatch objects containing information about each URL found
@@ -186,100 +234,128 @@ class URLAnalyzer:
         Raises:
             MemoryError: If memory usage exceeds configured limits
         """
-        matches = []
-        
-        # Find all URLs in the content
-        urls = re.finditer(r'https?://[^\s<>"]+|www\.[^\s<>"]+', content)
-        
-        for url_match in urls:
-            # Check memory usage before processing each URL
-            self.memory_manager.check_memory()
+        return self._analyze(content)
+
+    async def analyze_many(
+        self,
+        documents: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+    ) -> Dict[str, List[URLMatch]]:
+        """Analyze many documents in one call, e.g. a ticket's description and comments or a corpus.
+
+        Args:
+            documents: Mapping or iterable of (source ID, content) pairs. Content of a
+                repeated source ID is added to that source's matches.
+
+        Returns:
+            Dict mapping each source ID to the URLMatch objects found in its content
+
+        Raises:
+            MemoryError: If memory usage exceeds configured limits
+        """
+        items = documents.items() if isinstance(documents, Mapping) else documents
+        results: Dict[str, List[URLMatch]] = {}
+        for source_id, content in items:
+            results.setdefault(source_id, []).extend(self._analyze(content) if content else [])
+        return results
+
+    def analyze_stream(
+        self,
+        source: Union[Iterable[str], TextIO],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        max_token_length: int = MAX_URL_TOKEN_LENGTH
+    ) -> Iterator[URLMatch]:
+        """Find and categorize URLs in text read chunk by chunk, e.g. a large log or attachment.
+
+        Only the unfinished whitespace-delimited token at the end of each chunk is kept
+        between chunks, so URLs straddling chunk boundaries are found and memory use does
+        not grow with the size of the text. Matches are the same as ``analyze_content``
+        would return for the whole text, except inside tokens longer than
+        ``max_token_length``, which are skipped.
+
+        Args:
+            source: Iterable of text chunks, or a text file-like object
+            chunk_size: Characters read at a time from a file-like object
+            max_token_length: Longest run of characters without whitespace that is kept
+                across chunks
+
+        Yields:
+            URLMatch objects in the order the URLs appear
+
+        Raises:
+            MemoryError: If memory usage exceeds configured limits
+        """
+        chunks = iter(partial(source.read, chunk_size), '') if hasattr(source, 'read') else source
+
+        carry = ''
+        skipping = False  # Inside an oversized token whose start was dropped
+        for chunk in chunks:
+            text = carry + chunk
+            boundary = _last_delimiter(text)
+            if boundary < 0:
+                carry = text
+                if len(carry) > max_token_length:
+                    if not skipping:
+                        logger.warning(f"Skipping a token longer than {max_token_length} characters")
+                    carry, skipping = '', True
+                continue
+            complete, carry = text[:boundary + 1], text[boundary + 1:]
+            if skipping:
+                # The rest of the oversized token, up to its first delimiter, is not scanned
+                complete = complete[_first_delimiter(complete):]
+                skipping = False
+            yield from self._iter_matches(complete)
+        if carry and not skipping:
+            yield from self._iter_matches(carry)
+
+    def _analyze(self, content: str) -> List[URLMatch]:
+        """Find and categorize the URLs in a text."""
+        return list(self._iter_matches(content))
+
+    def _iter_matches(self, content: str) -> Iterator[URLMatch]:
+        """Find and categorize the URLs in a text, one at a time."""
+        memory = self.memory_manager
+        for url_match in URL_PATTERN.finditer(content):
+            # Check memory usage before processing each URL, sampling it only when due
+            if memory.should_check():
+                memory.check_memory()
             
-            url = url_match.group()
+            match = self._match_url(url_match.group())
+            if match is not None:
+                yield match
+
+    def _match_url(self, url: str) -> Optional[URLMatch]:
+        """Categorize a URL found in a text, or return None if it cannot be analyzed."""
+        # Normalize URL
+        if url.startswith('www.'):
+            url = f'https://{url}'
             
-            # Normalize URL
-            if url.startswith('www.'):
-                url = f'https://{url}'
-                
-            try:
-                # Parse URL
-                parsed = urlparse(url)
-                domain = parsed.netloc.lower()
-                path = parsed.path.rstrip('/')
-                
-                # Default values
-                url_type = 'external'
-                platform = None
-                should_scrape = False
-                resource_metadata = None
-                
-                # Check if it's a help center URL
-                if any(pattern in domain.lower() for pattern in [f"help.{self.base_domain}", f"support.{self.base_domain}", 'help.', 'support.']):
-                    url_type = 'help_center'
-                    platform = 'help_center'
-                # Check if it's a developer docs URL
-                elif any(pattern in domain.lower() for pattern in [
-                    f"developers.{self.base_domain}",
-                    f"developer.{self.base_domain}",
-                    f"docs.{self.base_domain}",
-                    f"documentation.{self.base_domain}",
-                    'developers.',
-                    'developer.',
-                    'docs.',
-                    'documentation.'
-                ]):
-                    url_type = 'documentation'
-                    platform = 'documentation'
-                # Check if it's a collaboration tool URL
-                elif domain.endswith('atlassian.net') or any(domain.endswith(d) for d in [
-                    f"jira.{self.base_domain}",
-                    f"confluence.{self.base_domain}",
-                    f"wiki.{self.base_domain}"
-                ]):
-                    if '/browse/' in path or '/issues/' in path:
-                        url_type = 'jira'
-                        platform = 'jira'
-                        # Extract ticket ID
-                        match = re.search(r'/browse/([A-Z]+-[0-9]+)', path)
-                        if match:
-                            resource_metadata = ResourceMetadata(
-                                resource_type='jira_ticket',
-                                resource_id=match.group(1)
-                            )
-                    elif '/display/' in path or '/spaces/' in path or '/wiki/' in path:
-                        url_type = 'confluence'
-                        platform = 'confluence'
-                        # Extract page ID
-                        if '/pages/' in path:
-                            page_id = path.split('/pages/')[-1].split('/')[0]
-                            resource_metadata = ResourceMetadata(
-                                resource_type='confluence_page',
-                                resource_id=page_id
-                            )
-                
-                # Check if domain is in our platform mappings
-                if domain in self.domain_to_platform:
-                    platform = self.domain_to_platform[domain]
-                    url_type = platform
-                
-                # Determine if URL should be scraped
-                if platform:
-                    should_scrape = self._should_scrape(platform, path)
-                    if not resource_metadata:
-                        resource_metadata = self._extract_resource_metadata(platform, path)
-                
-                matches.append(URLMatch(
-                    url=url,
-                    url_type=url_type,
-                    should_scrape=should_scrape,
-                    resource_metadata=resource_metadata
-                ))
-                
-            except Exception as e:
-                logger.error(f"Error analyzing URL {url}: {str(e)}")
-                continue
-        
-        return matches
+        try:
+            # Strip wiki link markup and trailing punctuation
+            url = self._clean_url(url)
+            
+            # Parse URL
+            parsed = urlparse(url)
+            domain = parsed.netloc.lower()
+            path = parsed.path.rstrip('/')
+            
+            # Classification depends on the host and path only
+            key = domain + path
+            classification = self.classification_cache.get(key)
+            if classification is None:
+                classification = self._classify(domain, path)
+                self.classification_cache.put(key, classification)
+            url_type, should_scrape, resource = classification
+            
+            return URLMatch(
+                url=url,
+                url_type=url_type,
+                should_scrape=should_scrape,
+                resource_metadata=ResourceMetadata(*resource) if resource else None
+            )
+            
+        except Exception as e:
+            logger.error(f"Error analyzing URL {url}: {str(e)}")
+            return None
 
     def _clean_url(self, url: str) -> str:
         """Clean and normalize a URL."""
@@ -287,8 +363,11 @@ class URLAnalyzer:
         if '|' in url:
             url = url.split('|')[0]
         
-        # Remove any trailing punctuation or brackets
-        url = re.sub(r'[\]\)\.\,]+$', '', url)
+        # Remove any trailing punctuation or brackets, keeping balanced parentheses
+        while url and url[-1] in '].,;:!?\'*)':
+            if url[-1] == ')' and url.count('(') >= url.count(')'):
+                break
+            url = url[:-1]
         
         # Remove any markdown link formatting
         url = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', r'\2', url)
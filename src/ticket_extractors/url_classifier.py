@@ -0,0 +1,299 @@
+"""URL classification compiled once per pattern configuration."""
+import re
+import json
+import hashlib
+import logging
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Pattern, Tuple
+from dataclasses import dataclass, field
+from .atomic_json import write_json
+
+logger = logging.getLogger(__name__)
+
+# A host is a help center or documentation site when one of its labels (other than the
+# top-level one) ends with one of these words, e.g. "help.example.com"
+HELP_CENTER_HINTS = ('help', 'support')
+DOCUMENTATION_HINTS = ('developers', 'developer', 'docs', 'documentation')
+
+JIRA_TICKET_PATTERN = re.compile(r'/browse/([A-Z]+-[0-9]+)')
+PORT_SUFFIX = re.compile(r':\d*$')
+# Backreferences, which would point at the wrong group once a pattern is combined with others
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+# Flags a pattern compiles with when it sets none inline
+DEFAULT_FLAGS = re.compile('').flags
+
+# (url_type, should_scrape, (resource_type, resource_id, parent_id) or None)
+Classification = Tuple[str, bool, Optional[Tuple[str, str, Optional[str]]]]
+
+class DomainTrie:
+    """Maps domain suffixes to values, matching whole labels from the right.
+
+    A lookup walks the labels of a host from the top-level domain down, so it costs
+    O(labels) however many suffixes are stored.
+    """
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self._root: Dict[str, Any] = {}
+
+    def add(self, suffix: str, value: Any) -> None:
+        """Map a suffix (e.g. "atlassian.net") and every host below it to a value."""
+        node = self._root
+        for label in reversed(suffix.lower().split('.')):
+            node = node.setdefault(label, {})
+        node[None] = value
+
+    def match(self, host: str) -> Optional[Any]:
+        """Get the value of the longest suffix matching a host, or None."""
+        node = self._root
+        value = None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            value = node.get(None, value)
+        return value
+
+@dataclass
+class ResourceRule:
+    """A resource pattern of a platform, compiled."""
+    resource_type: str
+    extract_id: str
+    parent_id: Optional[str]
+    pattern: Pattern  # The pattern compiled on its own
+    group: str  # Name of the group wrapping the pattern in the combined regex
+
+@dataclass
+class CompiledPlatform:
+    """Scraping rules and resource patterns of a platform, compiled."""
+    scrape: bool = False
+    exclude_patterns: List[Pattern] = field(default_factory=list)
+    resource_rules: List[ResourceRule] = field(default_factory=list)
+    resource_regex: Optional[Pattern] = None  # All resource patterns, most specific first, if they combine
+
+def _combinable(pattern: Pattern) -> bool:
+    """Check that a pattern means the same inside a combined regex as on its own.
+
+    Global inline flags such as "(?i)" would apply to every other pattern (and are
+    rejected by ``re`` anywhere but at the start), and numbered backreferences would
+    point at another pattern's groups.
+    """
+    return pattern.flags == DEFAULT_FLAGS and not BACKREFERENCE.search(pattern.pattern)
+
+def _compile_platform(name: str, config: Dict[str, Any]) -> CompiledPlatform:
+    """Compile a platform's exclude and resource patterns.
+
+    Resource patterns are also combined into one regex when they can be; otherwise
+    ``resource_regex`` stays None and they are searched one at a time.
+    """
+    compiled = CompiledPlatform(scrape=config.get("scrape", False))
+    for pattern in config.get("exclude_patterns", []):
+        try:
+            compiled.exclude_patterns.append(re.compile(pattern))
+        except re.error:
+            logger.warning(f"Invalid exclude pattern: {pattern}")
+
+    # Most specific (longest) patterns first
+    for pattern_config in sorted(config.get("resource_patterns", []), key=lambda p: len(p["pattern"]), reverse=True):
+        try:
+            pattern = re.compile(pattern_config["pattern"])
+        except re.error:
+            logger.warning(f"Invalid resource pattern for {name}: {pattern_config['pattern']}")
+            continue
+        compiled.resource_rules.append(ResourceRule(
+            resource_type=pattern_config["type"],
+            extract_id=pattern_config["extract_id"],
+            parent_id=pattern_config.get("parent_id"),
+            pattern=pattern,
+            group=f"r{len(compiled.resource_rules)}"
+        ))
+
+    # Each alternative is a lookahead from the start of the path, so the first pattern
+    # found anywhere wins, as with searching for each pattern in turn
+    if compiled.resource_rules and all(_combinable(rule.pattern) for rule in compiled.resource_rules):
+        alternatives = [rf"(?=[\s\S]*?(?P<{rule.group}>{rule.pattern.pattern}))" for rule in compiled.resource_rules]
+        try:
+            compiled.resource_regex = re.compile('|'.join(alternatives))
+        except re.error:
+            logger.debug(f"Resource patterns for {name} cannot be combined, searching them one at a time")
+    return compiled
+
+class URLClassifier:
+    """Classifies URLs by platform and extracts resource identifiers.
+
+    Domain hints, domain suffixes and every platform's patterns are compiled when the
+    classifier is built, so classifying a URL costs a walk over its host labels and one
+    regex match per platform.
+    """
+
+    def __init__(self, platform_patterns: Dict[str, Dict[str, Any]], domain_to_platform: Dict[str, str], base_domain: str):
+        """Build the classifier.
+
+        Args:
+            platform_patterns: Pattern configuration of each platform
+            domain_to_platform: Exact domains of the configured platforms
+            base_domain: Base domain of the organisation's own Jira and Confluence
+        """
+        self.domain_to_platform = dict(domain_to_platform)
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [platform_patterns, self.domain_to_platform, base_domain], sort_keys=True, default=str
+        ).encode('utf-8')).hexdigest()
+        self.platforms = {name: _compile_platform(name, config) for name, config in platform_patterns.items()}
+        # Hosts served by Jira or Confluence, whose type is decided by the URL path
+        self.collaboration_domains = DomainTrie()
+        for suffix in ("atlassian.net", f"jira.{base_domain}", f"confluence.{base_domain}", f"wiki.{base_domain}"):
+            self.collaboration_domains.add(suffix, True)
+
+    def classify(self, domain: str, path: str) -> Tuple[str, Optional[str], Optional[Tuple[str, str, None]]]:
+        """Determine the type and platform of a URL.
+
+        Args:
+            domain: Lowercased network location of the URL
+            path: URL path without its trailing slash
+
+        Returns:
+            Tuple of (url_type, platform, resource) where resource is a
+            (resource_type, resource_id, None) tuple found from the path, or None
+        """
+        url_type, platform, resource = 'external', None, None
+        host = PORT_SUFFIX.sub('', domain)
+        labels = host.split('.')[:-1]
+
+        if any(label.endswith(hint) for label in labels for hint in HELP_CENTER_HINTS):
+            url_type = platform = 'help_center'
+        elif any(label.endswith(hint) for label in labels for hint in DOCUMENTATION_HINTS):
+            url_type = platform = 'documentation'
+        elif self.collaboration_domains.match(host):
+            if '/browse/' in path or '/issues/' in path:
+                url_type = platform = 'jira'
+                match = JIRA_TICKET_PATTERN.search(path)
+                if match:
+                    resource = ('jira_ticket', match.group(1), None)
+            elif '/display/' in path or '/spaces/' in path or '/wiki/' in path:
+                url_type = platform = 'confluence'
+                if '/pages/' in path:
+                    resource = ('confluence_page', path.split('/pages/')[-1].split('/')[0], None)
+
+        if domain in self.domain_to_platform:
+            url_type = platform = self.domain_to_platform[domain]
+        return url_type, platform, resource
+
+    def should_scrape(self, platform: str, path: str) -> bool:
+        """Determine if a URL should be scraped based on its platform's configuration."""
+        compiled = self.platforms.get(platform)
+        if compiled is None or not compiled.scrape:
+            return False
+        for pattern in compiled.exclude_patterns:
+            if pattern.match(path):
+                logger.debug(f"Pattern '{pattern.pattern}' matched path '{path}', excluding from scraping")
+                return False
+        return True
+
+    def extract_resource(self, platform: str, path: str) -> Optional[Tuple[str, str, Optional[str]]]:
+        """Extract a resource from a URL path using the platform's resource patterns.
+
+        Returns:
+            Tuple of (resource_type, resource_id, parent_id), or None if no pattern matches
+        """
+        compiled = self.platforms.get(platform)
+        if compiled is None:
+            return None
+        if compiled.resource_regex is not None:
+            match = compiled.resource_regex.match(path)
+            if match is None:
+                return None
+            rule = next(rule for rule in compiled.resource_rules if match.group(rule.group) is not None)
+            base = compiled.resource_regex.groupindex[rule.group]
+            values = [match.group(base + i) for i in range(1, rule.pattern.groups + 1)]
+        else:
+            for rule in compiled.resource_rules:
+                match = rule.pattern.search(path)
+                if match:
+                    values = list(match.groups())
+                    break
+            else:
+                return None
+
+        resource_id, parent_id = rule.extract_id, rule.parent_id
+        # Replace capture group references ($1, $2, etc.) with actual values
+        for i, value in enumerate(values, 1):
+            value = value or ''
+            resource_id = resource_id.replace(f"${i}", value)
+            if parent_id:
+                parent_id = parent_id.replace(f"${i}", value)
+        return rule.resource_type, resource_id, parent_id
+
+@dataclass
+class ClassificationCacheConfig:
+    """Configuration for memoizing URL classifications."""
+    max_entries: int = 10_000  # Least recently used classifications are evicted beyond this
+    path: Optional[str] = None  # JSON file persisting the cache between runs
+
+class ClassificationCache:
+    """Bounded LRU memo of URL classifications, keyed by host and path.
+
+    Classifications only hold for the pattern configuration they were computed with,
+    identified by the classifier's fingerprint: a persisted cache written with other
+    patterns is discarded when loaded.
+    """
+
+    def __init__(self, fingerprint: str, config: Optional[ClassificationCacheConfig] = None):
+        """Initialize the cache, loading it from ``config.path`` if that file exists.
+
+        Args:
+            fingerprint: Fingerprint of the pattern configuration
+            config: Cache configuration
+        """
+        self.config = config or ClassificationCacheConfig()
+        self.fingerprint = fingerprint
+        self._entries: OrderedDict = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if self.config.path and Path(self.config.path).exists():
+            self._load(self.config.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Classification]:
+        """Get a memoized classification, marking it recently used."""
+        classification = self._entries.get(key)
+        if classification is None:
+            self.stats['misses'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return classification
+
+    def put(self, key: str, classification: Classification) -> None:
+        """Memoize a classification, evicting the least recently used beyond ``max_entries``."""
+        self._entries[key] = classification
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(0, self.config.max_entries):
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def reset(self, fingerprint: str) -> None:
+        """Drop every classification, e.g. after the patterns were reloaded."""
+        self.fingerprint = fingerprint
+        self._entries.clear()
+
+    def save(self) -> None:
+        """Write the cache to ``config.path`` atomically. Does nothing without a path."""
+        if not self.config.path:
+            return
+        write_json(self.config.path, {'fingerprint': self.fingerprint, 'entries': list(self._entries.items())})
+
+    def _load(self, path: str) -> None:
+        """Load a cache written by ``save`` for the same pattern configuration."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable URL classification cache {path}: {str(e)}")
+            return
+        if data.get('fingerprint') != self.fingerprint:
+            logger.info(f"URL patterns changed since {path} was written, starting with an empty cache")
+            return
+        for key, (url_type, should_scrape, resource) in data.get('entries', [])[-max(0, self.config.max_entries):]:
+            self._entries[key] = (url_type, should_scrape, tuple(resource) if resource else None)
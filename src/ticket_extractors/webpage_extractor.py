@@ -1,4 +1,5 @@
 import os
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from playwright.async_api import async_playwright
@@ -12,6 +13,14 @@ from .base_extractor import BaseExtractor
 # Configure logging
 logger = logging.getLogger(__name__)
 
+class PageStatusError(Exception):
+    """A web page answered with an HTTP error status."""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} fetching {url}")
+        self.url = url
+        self.status = status
+
 class WebPageExtractor(BaseExtractor):
     def __init__(self):
         super().__init__()
@@ -25,15 +34,19 @@ class WebPageExtractor(BaseExtractor):
         self.get_page_from_url_sync = self._make_sync(self.get_page_from_url)
         self._fetch_page_content_sync = self._make_sync(self._fetch_page_content)
 
-    async def _fetch_page_content(self, url: str) -> Optional[str]:
+    async def _fetch_page_content(self, url: str, timeout: Optional[float] = None) -> Optional[str]:
         """
         Fetch raw page content using Playwright.
         
         Args:
             url: The URL to fetch
+            timeout: Optional seconds allowed for each browser operation (30 by default)
             
         Returns:
             Raw HTML content or None if failed
+            
+        Raises:
+            PageStatusError: If the page answered with an HTTP error status
         """
         try:
             async with async_playwright() as p:
@@ -75,12 +88,15 @@ class WebPageExtractor(BaseExtractor):
                 page = await context.new_page()
                 
                 # Set default timeout for all operations
-                page.set_default_timeout(30000)  # 30 second timeout
+                page.set_default_timeout(int((timeout or 30) * 1000))
                 
                 logger.info(f"Fetching page: {url}")
                 
                 # Go to URL and wait for content to load
-                await page.goto(url, wait_until='networkidle')
+                response = await page.goto(url, wait_until='networkidle')
+                if response is not None and response.status >= 400:
+                    await browser.close()
+                    raise PageStatusError(url, response.status)
                 
                 # Wait for any dynamic content to load
                 await page.wait_for_timeout(2000)  # 2 second wait for dynamic content
@@ -93,20 +109,36 @@ class WebPageExtractor(BaseExtractor):
                 
                 return content
                 
+        except PageStatusError:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch page {url}: {str(e)}")
             return None
 
-    async def get_page_from_url(self, url: str) -> Optional[Dict[str, Any]]:
+    async def get_page_from_url(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch and extract content from a web page.
         
+        With a timeout, a page that never settles is abandoned: the browser is closed
+        and asyncio.TimeoutError is raised.
+        
         Args:
             url: The URL to fetch
+            timeout: Optional seconds allowed for the whole fetch
             
         Returns:
             Dict containing the page data or None if failed
+            
+        Raises:
+            asyncio.TimeoutError: If the page could not be fetched within ``timeout``
+            PageStatusError: If the page answered with an HTTP error status
         """
+        if timeout is not None:
+            return await asyncio.wait_for(self._get_page_from_url(url, timeout), timeout)
+        return await self._get_page_from_url(url)
+
+    async def _get_page_from_url(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Fetch and extract content from a web page, passing the timeout to the browser."""
         try:
             # Validate URL
             parsed_url = urlparse(url)
@@ -115,7 +147,7 @@ class WebPageExtractor(BaseExtractor):
                 return None
 
             # Fetch page content
-            content = await self._fetch_page_content(url)
+            content = await self._fetch_page_content(url, timeout)
             if not content:
                 return None
 
@@ -149,6 +181,8 @@ class WebPageExtractor(BaseExtractor):
             
             return page_data
                 
+        except PageStatusError:
+            raise
         except Exception as e:
             logger.error(f"Failed to process page {url}: {str(e)}")
             return None
@@ -5,6 +5,8 @@ from pathlib import Path
 import tempfile
 import sqlite3
 import sys
+import requests
+from unittest.mock import Mock
 
 # Add the project root directory to Python path
 project_root = Path(__file__).parent.parent
@@ -46,4 +48,49 @@ def save_sample_ticket(test_data_dir, sample_ticket):
     with open(ticket_path, "w") as f:
         json.dump(sample_ticket, f, indent=2)
     
-    return ticket_path 
\ No newline at end of file
+    return ticket_path 
+
+def _rejected_query(message):
+    """The error the Atlassian client raises when Jira answers a search with HTTP 400."""
+    response = requests.Response()
+    response.status_code = 400
+    return requests.HTTPError(message, response=response)
+
+@pytest.fixture
+def jql_search():
+    """Factory of mock ``Jira.jql`` methods that behave like Jira's search endpoint.
+
+    ``jql_search(get_issue, parents=None, strict=False)`` answers ``key in (...)``
+    searches with ``get_issue(key, fields)``, which returns None for tickets that do
+    not exist, and ``parent in (...) ORDER BY key ASC`` searches from ``parents``
+    (child key -> parent key). Like Jira, a query naming a ticket that does not exist
+    is rejected with HTTP 400 unless it is sent with ``validate_query='warn'``; with
+    ``strict`` it is rejected either way, like a server ignoring the flag.
+    """
+    def make(get_issue, parents=None, strict=False):
+        def search(jql, fields='*all', start=0, limit=None, validate_query=None, **kwargs):
+            if jql.startswith('key in ('):
+                searched = jql[len('key in ('):-1].split(', ')
+            else:
+                assert jql.startswith('parent in (') and jql.endswith(') ORDER BY key ASC')
+                searched = jql[len('parent in ('):-len(') ORDER BY key ASC')].split(', ')
+            found = {key: get_issue(key, fields) for key in searched}
+            missing = [key for key, issue in found.items() if issue is None]
+            if missing and (strict or validate_query != 'warn'):
+                raise _rejected_query(f"An issue with key '{missing[0]}' does not exist for the field.")
+            
+            if jql.startswith('key in ('):
+                issues = [issue for issue in found.values() if issue is not None]
+            else:
+                issues = [
+                    {'key': child, 'fields': {'parent': {'key': parent}}}
+                    for child, parent in sorted((parents or {}).items()) if parent in searched
+                ]
+            result = {'startAt': start, 'total': len(issues), 'issues': issues[start:start + (limit or 50)]}
+            if missing:
+                result['warningMessages'] = [f"The issue key '{key}' for field 'key' is invalid." for key in missing]
+            return result
+        
+        return Mock(side_effect=search)
+    
+    return make
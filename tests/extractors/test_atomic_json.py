@@ -0,0 +1,31 @@
+import json
+from ticket_extractors.atomic_json import write_json
+
+def test_write_json_replaces_file(tmp_path):
+    """Test that a JSON file is replaced whole, without leaving its temporary file behind."""
+    path = tmp_path / 'state.json'
+    write_json(path, {'version': 1})
+    write_json(str(path), {'version': 2})
+    
+    assert json.loads(path.read_text()) == {'version': 2}
+    assert [p.name for p in tmp_path.iterdir()] == ['state.json']
+
+def test_concurrent_writers_use_own_temporary_files(tmp_path, monkeypatch):
+    """Test that two writers of the same file never share a temporary file."""
+    import os
+    
+    path = tmp_path / 'state.json'
+    replaced = []
+    original_replace = os.replace
+    
+    def tracking_replace(source, destination):
+        replaced.append(source)
+        original_replace(source, destination)
+    
+    monkeypatch.setattr(os, 'replace', tracking_replace)
+    write_json(path, {'writer': 1})
+    write_json(path, {'writer': 2})
+    
+    assert len(set(replaced)) == 2
+    assert all(os.path.dirname(source) == str(tmp_path) for source in replaced)
+    assert json.loads(path.read_text()) == {'writer': 2}
@@ -0,0 +1,134 @@
+import json
+import threading
+import pytest
+from unittest.mock import Mock, AsyncMock
+from ticket_extractors import JiraExtractor
+from ticket_extractors.bulk_export import BulkExporter, BulkExportConfig
+from ticket_extractors.jql_batch import JQLBatchConfig
+
+KEYS = [f"SUP-{i}" for i in range(1, 8)]
+
+def _export_jira(keys):
+    """Create a mock Jira client where a project query matches ``keys`` and each ticket has no links."""
+    mock = Mock()
+    
+    def mock_issue(key, *args, **kwargs):
+        if key == 'SUP-4':
+            raise Exception("Issue SUP-4 not found")
+        return {
+            'key': key,
+            'fields': {
+                'summary': f"Summary {key}",
+                'description': None,
+                'issuelinks': [],
+                'comment': {'comments': [], 'total': 0}
+            }
+        }
+    
+    def mock_jql(jql, fields='*all', start=0, limit=None, **kwargs):
+        assert jql == 'project = SUP'
+        assert fields == 'key'
+        page = keys[start:start + limit]
+        return {'startAt': start, 'total': len(keys), 'issues': [{'key': key} for key in page]}
+    
+    mock.issue = Mock(side_effect=mock_issue)
+    mock.jql = Mock(side_effect=mock_jql)
+    return mock
+
+@pytest.fixture
+def extractor():
+    extractor = JiraExtractor(jira=_export_jira(KEYS), batch_config=JQLBatchConfig(enabled=False))
+    extractor.url_analyzer = Mock()
+    extractor.url_analyzer.analyze_content = AsyncMock(return_value=[])
+    return extractor
+
+def _read_shards(output_dir, shards):
+    lines = []
+    for shard in shards:
+        with open(output_dir / shard) as f:
+            lines.extend(json.loads(line) for line in f)
+    return lines
+
+@pytest.mark.asyncio
+async def test_search_keys_pages(extractor, tmp_path):
+    """Test that every page of the search results is listed once."""
+    exporter = BulkExporter(extractor, tmp_path, BulkExportConfig(page_size=3))
+    
+    assert await exporter.search_keys('project = SUP') == KEYS
+    assert extractor.jira.jql.call_count == 3
+
+@pytest.mark.asyncio
+async def test_export_shards(extractor, tmp_path):
+    """Test that bundles are written to size-bounded shards and failures are reported."""
+    config = BulkExportConfig(page_size=3, batch_size=2, shard_max_bytes=400)
+    
+    summary = await extractor.export_jql('project = SUP', str(tmp_path), config)
+    
+    assert summary.total == 7
+    assert summary.exported == 6
+    assert summary.failed == ['SUP-4']
+    assert len(summary.shards) > 1
+    exported = _read_shards(tmp_path, summary.shards)
+    assert [line['id'] for line in exported] == [key for key in KEYS if key != 'SUP-4']
+    assert exported[0]['bundle']['summary'] == 'Summary SUP-1'
+
+@pytest.mark.asyncio
+async def test_export_resumes(extractor, tmp_path):
+    """Test that an interrupted export resumes without refetching or duplicating tickets."""
+    config = BulkExportConfig(page_size=3, batch_size=2)
+    exporter = BulkExporter(extractor, tmp_path, config)
+    real_mine_many = extractor.mine_many
+    calls = []
+    
+    async def crashing_mine_many(batch):
+        calls.append(list(batch))
+        if len(calls) == 2:
+            # Simulate a crash after part of a batch reached the shard
+            with open(tmp_path / 'bundles-00000.ndjson', 'a') as f:
+                f.write('{"id": "partial"')
+            raise RuntimeError("crash")
+        return await real_mine_many(batch)
+    
+    extractor.mine_many = crashing_mine_many
+    with pytest.raises(RuntimeError):
+        await exporter.run('project = SUP')
+    
+    extractor.mine_many = real_mine_many
+    extractor.jira.issue.reset_mock()
+    summary = await BulkExporter(extractor, tmp_path, config).run('project = SUP')
+    
+    assert summary.resumed_from == 2
+    fetched = [call.args[0] for call in extractor.jira.issue.call_args_list]
+    assert 'SUP-1' not in fetched and 'SUP-2' not in fetched
+    exported = _read_shards(tmp_path, summary.shards)
+    assert [line['id'] for line in exported] == ['SUP-1', 'SUP-2', 'SUP-3', 'SUP-5', 'SUP-6', 'SUP-7']
+
+@pytest.mark.asyncio
+async def test_export_writes_off_the_event_loop(extractor, tmp_path):
+    """Test that shard appends and checkpoint writes run on the transport's threads."""
+    exporter = BulkExporter(extractor, tmp_path, BulkExportConfig(page_size=3, batch_size=3))
+    loop_thread = threading.get_ident()
+    writer_threads = []
+    
+    def recording(method):
+        def wrapper(*args):
+            writer_threads.append(threading.get_ident())
+            return method(*args)
+        return wrapper
+    
+    exporter._write_lines = recording(exporter._write_lines)
+    exporter._save_checkpoint = recording(exporter._save_checkpoint)
+    summary = await exporter.run('project = SUP')
+    
+    assert summary.exported == 6
+    # One initial checkpoint, then a shard append and a checkpoint per batch
+    assert len(writer_threads) == 7
+    assert loop_thread not in writer_threads
+
+@pytest.mark.asyncio
+async def test_checkpoint_belongs_to_query(extractor, tmp_path):
+    """Test that a directory holding another query's export is not reused."""
+    await BulkExporter(extractor, tmp_path).run('project = SUP')
+    
+    with pytest.raises(ValueError):
+        await BulkExporter(extractor, tmp_path).run('project = OTHER')
@@ -0,0 +1,46 @@
+import json
+from ticket_extractors.url_analyzer import ResourceMetadata
+from ticket_extractors.bundle_stream import ticket_record, resource_record, edge_record, encode_record
+
+def _ticket_data():
+    return {
+        'id': 'PROJ-1',
+        'summary': 'Summary',
+        'references': {
+            'confluence_pages': [{'id': '123', 'url': 'https://wiki/123', 'context': 'Found in description'}],
+            'jira_tickets': [],
+            'other_urls': [],
+            'scrapable_documentation': []
+        }
+    }
+
+def test_ticket_record_strips_references():
+    """Test that ticket records leave references to their own records."""
+    ticket_data = _ticket_data()
+    
+    record = ticket_record(ticket_data, 1, 'ROOT-1', 'Linked issue')
+    
+    assert record['type'] == 'jira_ticket'
+    assert record['parent'] == 'ROOT-1'
+    assert record['data']['references']['confluence_pages'] == []
+    assert len(ticket_data['references']['confluence_pages']) == 1
+
+def test_resource_and_edge_records():
+    """Test that resource and edge records carry their context."""
+    reference = _ticket_data()['references']['confluence_pages'][0]
+    
+    page = resource_record('confluence_pages', reference, 'PROJ-1', 0)
+    edge = edge_record('PROJ-1', 'PROJ-2', 'Found in comment by Jane Doe')
+    
+    assert page['context'] == 'Found in description'
+    assert page['parent'] == 'PROJ-1'
+    assert edge == {'type': 'edge', 'source': 'PROJ-1', 'target': 'PROJ-2', 'context': 'Found in comment by Jane Doe'}
+
+def test_encode_record():
+    """Test that records encode to a single JSON line, including dataclass metadata."""
+    reference = {'url': 'https://docs/x', 'metadata': ResourceMetadata(resource_type='page', resource_id='x')}
+    
+    line = encode_record(resource_record('scrapable_documentation', reference, 'PROJ-1', 0))
+    
+    assert line.endswith('\n') and line.count('\n') == 1
+    assert json.loads(line)['data']['metadata']['resource_id'] == 'x'
@@ -0,0 +1,28 @@
+from ticket_extractors.comments import CommentConfig, comment_path, comment_page_starts, newest_comments
+
+def test_comment_path():
+    """Test the comment endpoint path."""
+    assert comment_path('PROJ-1') == 'rest/api/2/issue/PROJ-1/comment'
+
+def test_page_starts():
+    """Test that page offsets cover every comment."""
+    config = CommentConfig(page_size=100)
+    
+    assert comment_page_starts(250, config) == [0, 100, 200]
+    assert comment_page_starts(250, config, first=100) == [100, 200]
+    assert comment_page_starts(0, config) == []
+
+def test_page_starts_newest_only():
+    """Test that max_comments skips the oldest comments."""
+    config = CommentConfig(page_size=100, max_comments=120)
+    
+    assert comment_page_starts(250, config) == [130, 230]
+    assert comment_page_starts(50, config) == [0]
+
+def test_newest_comments():
+    """Test that the cap keeps the newest comments of a chronological list."""
+    comments = [{'id': i} for i in range(5)]
+    
+    assert newest_comments(comments, CommentConfig()) == comments
+    assert newest_comments(comments, CommentConfig(max_comments=2)) == comments[3:]
+    assert newest_comments(comments, CommentConfig(max_comments=0)) == []
@@ -90,4 +90,32 @@ async def test_page_not_found(extractor):
     """Test handling of non-existent pages."""
     url = "https://example.atlassian.net/wiki/spaces/TEST/pages/99999"
     page_data = await extractor.get_page_from_url(url)
-    assert page_data is None 
\ No newline at end of file
+    assert page_data is None
+
+
+@pytest.mark.asyncio
+async def test_get_page_versions(extractor, mock_confluence):
+    """Test checking the versions of many pages with chunked CQL searches."""
+    def mock_cql(cql, limit=None, expand=None):
+        page_ids = cql[len('id in ('):-1].split(', ')
+        return {'results': [
+            {'content': {'id': page_id, 'version': {'number': 3}}}
+            for page_id in page_ids if page_id != '404'
+        ]}
+    
+    mock_confluence.cql = Mock(side_effect=mock_cql)
+    versions = await extractor.get_page_versions(['1', '2', '404'], chunk_size=2)
+    
+    assert versions == {'1': 3, '2': 3}
+    assert mock_confluence.cql.call_count == 2
+
+@pytest.mark.asyncio
+async def test_rejected_request_is_raised(extractor, mock_confluence):
+    """Test that Confluence rejecting a request reaches the caller instead of being reported as no page."""
+    from requests import HTTPError
+    
+    mock_confluence.get_page_by_id = Mock(side_effect=HTTPError("403 Forbidden", response=Mock(status_code=403)))
+    url = "https://example.atlassian.net/wiki/spaces/TEST/pages/12345"
+    
+    with pytest.raises(HTTPError):
+        await extractor.get_page_from_url(url)
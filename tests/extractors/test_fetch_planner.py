@@ -0,0 +1,72 @@
+import pytest
+from ticket_extractors.fetch_planner import FetchPlanner, FetchPlan, FetchStats, BUNDLE_FIELDS, payload_size
+
+def test_default_plan_includes_comments():
+    """Test that the default plan requests only bundle fields, including comments."""
+    plan = FetchPlanner().plan_for_depth(0)
+    
+    assert plan.fields == BUNDLE_FIELDS
+    assert plan.include_comments
+    assert '*all' not in plan.fields_param
+
+def test_plan_for_depth():
+    """Test that depth plans apply from their depth onwards."""
+    thin = FetchPlan(fields=('summary', 'issuelinks'))
+    thinner = FetchPlan(fields=('issuelinks',))
+    planner = FetchPlanner(depth_plans={1: thin, 3: thinner})
+    
+    assert planner.plan_for_depth(0) == planner.default_plan
+    assert planner.plan_for_depth(1) is thin
+    assert planner.plan_for_depth(2) is thin
+    assert planner.plan_for_depth(5) is thinner
+    assert not thin.include_comments
+
+def test_estimated_bytes_saved():
+    """Test estimating savings from the fields a plan leaves out."""
+    issue = {'key': 'A-1', 'fields': {'summary': 'Thin'}}
+    thin = FetchPlan(fields=('summary', 'comment'))
+    planner = FetchPlanner(field_bytes={'summary': 10, 'comment': 300, 'customfield_1': 5000, 'renderedFields': 2000})
+    
+    assert planner.bytes_saved(thin, issue) == 7000
+    assert planner.bytes_saved(FetchPlan(fields=thin.fields, expand='renderedFields'), issue) == 5000
+    assert planner.bytes_saved(FetchPlan(fields=('*all',)), issue) == 2000
+    assert FetchPlanner(full_payload_bytes=1000).bytes_saved(thin, issue) == 1000 - payload_size(issue)
+    assert FetchPlanner().bytes_saved(thin, issue) is None
+    
+    stats = FetchStats(payloads=4, bytes_received=500)
+    assert stats.estimated_bytes_saved is None
+    stats.record_saving(7000)
+    stats.record_saving(5000)
+    assert stats.to_dict()['projected_payloads'] == 2
+    assert stats.to_dict()['estimated_bytes_saved'] == 12000
+
+def test_calibrate():
+    """Test measuring the full payload baseline and the size of each field."""
+    planner = FetchPlanner()
+    payloads = [
+        {'issue': {'key': 'A-1', 'fields': {'summary': 'One'}}, 'comments': {'comments': []}},
+        {'issue': {'key': 'A-12345', 'fields': {'summary': 'Two', 'description': 'Long ' * 20}, 'renderedFields': {}}, 'comments': {'comments': []}}
+    ]
+    
+    average = planner.calibrate(payloads)
+    
+    assert average == (payload_size(payloads[0]) + payload_size(payloads[1])) // 2
+    assert planner.full_payload_bytes == average
+    assert planner.field_bytes == {
+        'summary': payload_size({'summary': 'One'}),
+        'description': payload_size({'description': 'Long ' * 20}) // 2,
+        'renderedFields': payload_size({}) // 2,
+        'comment': payload_size({'comments': []})
+    }
+    with pytest.raises(ValueError):
+        planner.calibrate([])
+
+def test_skeleton_and_remainder():
+    """Test splitting a plan into the skeleton fields and the rest."""
+    plan = FetchPlan(fields=('summary', 'description', 'issuelinks', 'comment', 'updated'), expand='renderedFields')
+    
+    assert plan.skeleton().fields == ('description', 'issuelinks')
+    assert plan.remainder() == FetchPlan(fields=('summary', 'comment', 'updated'), expand='renderedFields')
+    assert plan.skeleton().remainder() is None
+    assert plan.remainder().covered_by({'fields': {'summary': None, 'comment': None, 'updated': None}})
+    assert not plan.remainder().covered_by({'fields': {'description': 'x'}})
@@ -46,7 +46,11 @@ def mock_confluence():
         'title': 'Example Documentation Page',
         'body': {'storage': {'value': 'Test content'}},
         'space': {'key': 'TEST'},
-        'version': {'number': 1},
+        'version': {
+            'number': 1,
+            'when': '2025-02-14T13:00:00.000+0000',
+            'by': {'displayName': 'Bob Jones'}
+        },
         'history': {
             'createdDate': '2025-02-14T12:00:00.000+0000',
             'createdBy': {'displayName': 'Alice Smith'},
@@ -73,6 +77,9 @@ async def test_gos13312_confluence_link(mock_jira, mock_confluence, mock_url_ana
     
     extractor = JiraExtractor(jira=mock_jira, max_reference_depth=2)
     extractor.url_analyzer = mock_url_analyzer  # Use our mock URL analyzer
+    extractor.confluence_extractor.confluence = mock_confluence
+    mock_confluence.get_page_by_title.return_value = {'id': 'Page1'}
+    mock_confluence.get_attachments_from_content.return_value = {'results': []}
     ticket_data = await extractor.get_ticket(ticket_id)
     
     assert ticket_data is not None
@@ -87,4 +94,6 @@ async def test_gos13312_confluence_link(mock_jira, mock_confluence, mock_url_ana
     assert confluence_ref['url'].startswith('https://confluence.example.com/')
     assert confluence_ref['context'] == 'Found in content'
     assert confluence_ref['metadata'].resource_type == 'confluence_page'
-    assert confluence_ref['metadata'].resource_id == 'Page1' 
\ No newline at end of file
+    assert confluence_ref['metadata'].resource_id == 'Page1' 
+    assert confluence_ref['data']['title'] == 'Example Documentation Page'
+    assert confluence_ref['data']['labels'] == ['test', 'documentation']
@@ -0,0 +1,38 @@
+from ticket_extractors.hierarchy import (
+    HierarchyConfig, build_children_jql, child_parents, epic_link_clause, parent_references
+)
+
+def test_children_jql():
+    """Test the child search query with and without an epic link field."""
+    config = HierarchyConfig(enabled=True)
+    assert build_children_jql(['A-1', 'B-2'], config) == "parent in (A-1, B-2) ORDER BY key ASC"
+    
+    config.epic_link_field = 'customfield_10014'
+    assert build_children_jql(['A-1'], config) == "parent in (A-1) OR cf[10014] in (A-1) ORDER BY key ASC"
+    
+    config.children = False
+    assert build_children_jql(['A-1'], config) is None
+
+def test_epic_link_clause():
+    """Test naming the epic link field in JQL."""
+    assert epic_link_clause('customfield_10014') == 'cf[10014]'
+    assert epic_link_clause('Epic Link') == '"Epic Link"'
+
+def test_parent_references():
+    """Test reading the parent and epic of an issue."""
+    fields = {'parent': {'key': 'EPIC-1'}, 'customfield_10014': 'EPIC-2'}
+    
+    assert parent_references(fields, HierarchyConfig()) == []
+    assert parent_references(fields, HierarchyConfig(enabled=True)) == [('EPIC-1', 'Parent ticket')]
+    assert parent_references(fields, HierarchyConfig(enabled=True, epic_link_field='customfield_10014')) == [
+        ('EPIC-1', 'Parent ticket'), ('EPIC-2', 'Epic')
+    ]
+    assert HierarchyConfig(enabled=True, parents=False).extra_fields == ()
+
+def test_child_parents():
+    """Test matching a child search result to the searched tickets."""
+    config = HierarchyConfig(enabled=True, epic_link_field='customfield_10014')
+    fields = {'parent': {'key': 'A-1'}, 'customfield_10014': 'EPIC-1'}
+    
+    assert child_parents(fields, {'A-1', 'EPIC-1'}, config) == [('A-1', 'Child issue'), ('EPIC-1', 'Issue in epic')]
+    assert child_parents(fields, {'B-1'}, config) == []
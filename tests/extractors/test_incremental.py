@@ -0,0 +1,161 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from ticket_extractors import JiraExtractor
+from ticket_extractors.url_analyzer import URLMatch
+from ticket_extractors.incremental import (
+    BundleDependencies, DependencyIndex, IncrementalMiner, bundle_dependencies
+)
+from ticket_extractors.jql_batch import JQLBatchConfig
+
+PAGE_URL = "https://confluence.example.com/wiki/spaces/TEST/pages/100"
+
+def _corpus_jira(links, updated, jql_search, descriptions=None):
+    """Create a mock Jira client whose tickets' `updated` values can be changed between runs.
+
+    Tickets removed from ``updated`` are deleted.
+    """
+    mock = Mock()
+    descriptions = descriptions or {}
+    
+    def mock_issue(key, *args, **kwargs):
+        if key not in updated:
+            raise Exception(f"Issue {key} not found")
+        return {
+            'key': key,
+            'fields': {
+                'summary': f"Summary {key}",
+                'description': descriptions.get(key),
+                'updated': updated[key],
+                'issuelinks': [{'outwardIssue': {'key': linked}} for linked in links[key]],
+                'comment': {'comments': [], 'total': 0}
+            }
+        }
+    
+    def search_issue(key, fields):
+        assert fields == 'updated'
+        return {'key': key, 'fields': {'updated': updated[key]}} if key in updated else None
+    
+    mock.issue = Mock(side_effect=mock_issue)
+    mock.jql = jql_search(search_issue)
+    return mock
+
+async def _analyze_content(content):
+    if PAGE_URL in content:
+        return [URLMatch(url=PAGE_URL, url_type='confluence', should_scrape=True, context=None, resource_metadata=Mock(resource_id='100'))]
+    return []
+
+@pytest.fixture
+def corpus(jql_search):
+    """Two bundles sharing B-1; only A-1 references the Confluence page."""
+    links = {'A-1': ['B-1'], 'C-1': ['B-1'], 'B-1': []}
+    updated = {key: '2024-03-20T10:00:00.000+0000' for key in links}
+    extractor = JiraExtractor(
+        jira=_corpus_jira(links, updated, jql_search, {'A-1': f"See {PAGE_URL}"}),
+        batch_config=JQLBatchConfig(enabled=False)
+    )
+    extractor.url_analyzer = Mock()
+    extractor.url_analyzer.analyze_content = AsyncMock(side_effect=_analyze_content)
+    extractor.confluence_extractor = Mock()
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(return_value={'id': '100', 'version': 1})
+    extractor.confluence_extractor.get_page_versions = AsyncMock(return_value={'100': 1})
+    return extractor, updated
+
+def test_bundle_dependencies():
+    """Test that embedded tickets and fetched pages are dependencies, placeholders are not."""
+    bundle = {
+        'id': 'A-1',
+        'updated': 't1',
+        'references': {
+            'confluence_pages': [{'url': PAGE_URL, 'data': {'id': '100', 'version': 4}}, {'url': 'x', 'error': 'boom'}],
+            'jira_tickets': [
+                {'id': 'B-1', 'updated': 't2', 'references': {'confluence_pages': [], 'jira_tickets': []}},
+                {'id': 'A-1', 'metadata': {'is_processed_reference': True}},
+                {'id': 'D-1', 'metadata': {'is_truncated': True}},
+            ]
+        }
+    }
+    
+    assert bundle_dependencies(bundle) == BundleDependencies(tickets={'A-1': 't1', 'B-1': 't2'}, pages={'100': 4})
+
+def test_reverse_index(tmp_path):
+    """Test that the reverse index follows recorded bundles and survives a round trip."""
+    index = DependencyIndex()
+    index.record('A-1', BundleDependencies(tickets={'A-1': 't1', 'B-1': 't1'}, pages={'100': 1}))
+    index.record('C-1', BundleDependencies(tickets={'C-1': 't1', 'B-1': 't1'}))
+    
+    assert index.bundles_for_ticket('B-1') == {'A-1', 'C-1'}
+    assert index.bundles_for_page('100') == {'A-1'}
+    
+    index.record('A-1', BundleDependencies(tickets={'A-1': 't2'}))
+    assert index.bundles_for_ticket('B-1') == {'C-1'}
+    assert index.pages() == []
+    
+    index.save(str(tmp_path / 'deps.json'))
+    loaded = DependencyIndex.load(str(tmp_path / 'deps.json'))
+    assert loaded.to_dict() == index.to_dict()
+    assert loaded.bundles_for_ticket('B-1') == {'C-1'}
+
+def test_changed_bundles():
+    """Test that bundles are stale when a dependency changed or disappeared."""
+    index = DependencyIndex()
+    index.record('A-1', BundleDependencies(tickets={'A-1': 't1', 'B-1': 't1'}, pages={'100': 1}))
+    index.record('C-1', BundleDependencies(tickets={'C-1': 't1', 'B-1': 't1'}))
+    
+    assert index.changed_bundles({'A-1': 't1', 'B-1': 't1', 'C-1': 't1'}, {'100': 1}) == []
+    assert index.changed_bundles({'A-1': 't1', 'B-1': 't2', 'C-1': 't1'}, {'100': 1}) == ['A-1', 'C-1']
+    assert index.changed_bundles({'A-1': 't1', 'B-1': 't1', 'C-1': 't2'}, {'100': 1}) == ['C-1']
+    assert index.changed_bundles({'A-1': 't1', 'B-1': 't1', 'C-1': 't1'}, {'100': 2}) == ['A-1']
+    assert index.changed_bundles({'B-1': 't1', 'C-1': 't1'}, {'100': 1}) == ['A-1']
+
+@pytest.mark.asyncio
+async def test_refresh_unchanged(corpus):
+    """Test that a refresh without changes only checks versions."""
+    extractor, _ = corpus
+    miner = IncrementalMiner(extractor)
+    await miner.mine(['A-1', 'C-1'])
+    extractor.jira.issue.reset_mock()
+    
+    assert await miner.refresh() == {}
+    assert extractor.jira.issue.call_count == 0
+    assert extractor.jira.jql.call_count == 1
+
+@pytest.mark.asyncio
+async def test_refresh_changed_ticket(corpus):
+    """Test that a changed shared ticket rebuilds every bundle including it, and only those."""
+    extractor, updated = corpus
+    miner = IncrementalMiner(extractor)
+    await miner.mine(['A-1', 'C-1'])
+    
+    updated['B-1'] = '2024-03-21T10:00:00.000+0000'
+    refreshed = await miner.refresh()
+    
+    assert set(refreshed) == {'A-1', 'C-1'}
+    assert refreshed['A-1']['references']['jira_tickets'][0]['updated'] == updated['B-1']
+    assert miner.index.bundles['C-1'].tickets['B-1'] == updated['B-1']
+    assert await miner.refresh() == {}
+
+@pytest.mark.asyncio
+async def test_stale_bundles_with_deleted_ticket(corpus):
+    """Test that a deleted ticket only makes the bundles including it stale."""
+    extractor, updated = corpus
+    miner = IncrementalMiner(extractor)
+    await miner.mine(['A-1', 'C-1'])
+    
+    del updated['A-1']
+    
+    assert await miner.stale_bundles() == ['A-1']
+    assert extractor.jira.jql.call_args.kwargs['validate_query'] == 'warn'
+
+@pytest.mark.asyncio
+async def test_refresh_changed_page(corpus):
+    """Test that a new page version rebuilds only the bundles that embed the page."""
+    extractor, _ = corpus
+    miner = IncrementalMiner(extractor)
+    await miner.mine(['A-1', 'C-1'])
+    
+    extractor.confluence_extractor.get_page_versions.return_value = {'100': 2}
+    extractor.confluence_extractor.get_page_from_url.return_value = {'id': '100', 'version': 2}
+    refreshed = await miner.refresh()
+    
+    assert list(refreshed) == ['A-1']
+    assert miner.index.bundles['A-1'].pages == {'100': 2}
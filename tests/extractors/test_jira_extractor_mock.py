@@ -1,8 +1,11 @@
 import pytest
-from unittest.mock import Mock, patch
+import asyncio
+import requests
+from unittest.mock import Mock, AsyncMock, patch
 from ticket_extractors import JiraExtractor
-from ticket_extractors.url_analyzer import URLMatch
+from ticket_extractors.url_analyzer import URLMatch, ResourceMetadata
 from ticket_extractors import config
+from ticket_extractors.jql_batch import JQLBatchConfig
 import json
 from datetime import datetime, timezone
 import os
@@ -84,7 +87,7 @@ def mock_jira():
     """Create a mock Jira client that returns our test data."""
     mock = Mock()
     
-    def mock_issue(key):
+    def mock_issue(key, *args, **kwargs):
         if key == MOCK_MAIN_TICKET['key']:
             return MOCK_MAIN_TICKET
         elif key in MOCK_REFERENCED_TICKETS:
@@ -107,6 +110,7 @@ def extractor(mock_jira, mock_url_analyzer):
     """Create a JiraExtractor instance with our mock clients."""
     extractor = JiraExtractor(jira=mock_jira, max_reference_depth=2)
     extractor.url_analyzer = mock_url_analyzer
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(return_value={'id': 'Page1', 'title': 'Page 1'})
     return extractor
 
 @pytest.mark.asyncio
@@ -220,6 +224,7 @@ async def test_confluence_references(extractor):
         assert 'metadata' in ref
         assert ref['metadata']['type'] == 'confluence_page'
         assert ref['metadata']['resource_type'] == 'confluence_page'
+        assert ref['data']['title'] == 'Page 1'
 
 @pytest.mark.asyncio
 async def test_external_urls(extractor):
@@ -241,4 +246,1082 @@ async def test_external_urls(extractor):
         assert 'context' in url
         assert 'metadata' in url
         assert url['metadata']['type'] == 'external'
-        assert url['metadata']['resource_type'] == 'external_url' 
\ No newline at end of file
+        assert url['metadata']['resource_type'] == 'external_url'
+
+
+@pytest.fixture
+def graph_jira(jql_search):
+    """Factory of mock Jira clients serving tickets linked as described by ``links``, projected to the requested fields.
+
+    With ``comments`` (comment bodies by key), every ticket embeds its comments.
+    """
+    def make(links, searchable=False, descriptions=None, comments=None):
+        mock = Mock()
+        descriptions = descriptions or {}
+        
+        def project(issue, fields):
+            if fields and fields != '*all':
+                requested = fields.split(',')
+                issue['fields'] = {name: value for name, value in issue['fields'].items() if name in requested}
+            return issue
+        
+        def mock_issue(key, *args, fields=None, **kwargs):
+            if key not in links:
+                raise Exception(f"Issue {key} not found")
+            issue = {
+                'key': key,
+                'fields': {
+                    'summary': f"Summary {key}",
+                    'description': descriptions.get(key),
+                    'status': {'name': 'Open'},
+                    'created': '2024-03-20T10:00:00.000+0000',
+                    'updated': '2024-03-20T11:00:00.000+0000',
+                    'labels': [],
+                    'issuelinks': [{'outwardIssue': {'key': linked}} for linked in links[key]]
+                }
+            }
+            if comments is not None:
+                bodies = comments.get(key, [])
+                issue['fields']['comment'] = {'total': len(bodies), 'comments': [
+                    {'author': {'displayName': 'Support Agent'}, 'body': body, 'created': '2024-03-20T12:00:00.000+0000'}
+                    for body in bodies
+                ]}
+            return project(issue, fields)
+        
+        def search_issue(key, fields):
+            if key not in links:
+                return None
+            issue = mock_issue(key)
+            issue['fields']['comment'] = {'comments': [], 'total': 0}
+            return project(issue, fields)
+        
+        mock.issue = Mock(side_effect=mock_issue)
+        mock.issue_get_comments = Mock(return_value={'comments': []})
+        if searchable:
+            mock.jql = jql_search(search_issue)
+        return mock
+    
+    return make
+
+@pytest.mark.asyncio
+async def test_breadth_first_traversal(mock_url_analyzer, graph_jira):
+    """Test that a ticket reachable at several depths is expanded at the shallowest one."""
+    links = {
+        'ROOT-1': ['A-1', 'B-1'],
+        'A-1': ['B-1', 'C-1'],
+        'B-1': ['ROOT-1'],
+        'C-1': ['MISSING-1'],
+    }
+    extractor = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    a_ticket, b_ticket = ticket_data['references']['jira_tickets']
+    assert a_ticket['summary'] == 'Summary A-1'
+    assert b_ticket['summary'] == 'Summary B-1'
+    
+    # B-1 is expanded as a direct reference of the root, so A-1 only gets a placeholder
+    b_placeholder, c_ticket = a_ticket['references']['jira_tickets']
+    assert b_placeholder['context'] == "Previously processed ticket"
+    assert b_placeholder['metadata']['is_parent_reference'] is False
+    assert c_ticket['summary'] == 'Summary C-1'
+    
+    # Tickets beyond the maximum depth are not fetched
+    assert c_ticket['references']['jira_tickets'] == []
+    assert b_ticket['references']['jira_tickets'][0]['id'] == 'ROOT-1'
+
+@pytest.mark.asyncio
+async def test_failed_references_are_dropped(mock_url_analyzer, graph_jira):
+    """Test that tickets which cannot be fetched are left out of the bundle."""
+    links = {
+        'ROOT-1': ['MISSING-1', 'A-1'],
+        'A-1': ['MISSING-1'],
+    }
+    extractor = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    context = extractor.new_context()
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert [ref['id'] for ref in ticket_data['references']['jira_tickets']] == ['A-1']
+    assert ticket_data['references']['jira_tickets'][0]['references']['jira_tickets'] == []
+    assert 'MISSING-1' not in context.processed_ids
+    assert context.reference_stats['failed_fetches'] == 1
+    assert context.failed_urls[0].endswith('/browse/MISSING-1')
+
+@pytest.mark.asyncio
+async def test_negative_cache_skips_known_failures(mock_url_analyzer, graph_jira, tmp_path):
+    """Test that tickets and pages that failed are not requested again by later extractions."""
+    from ticket_extractors.negative_cache import NegativeCache
+    
+    links = {'ROOT-1': ['MISSING-1'], 'ROOT-2': ['MISSING-1']}
+    descriptions = {
+        'ROOT-1': 'See https://confluence.example.com/display/TEST/Page1',
+        'ROOT-2': 'See https://confluence.example.com/display/TEST/Page1',
+    }
+    extractor = JiraExtractor(
+        jira=graph_jira(links, descriptions=descriptions),
+        max_reference_depth=2,
+        negative_cache=NegativeCache(str(tmp_path / 'failures.json'))
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    # The real Confluence extractor, whose client rejects the page
+    confluence = extractor.confluence_extractor.confluence
+    confluence.get_page_by_title = Mock(return_value={'id': '12345'})
+    confluence.get_page_by_id = Mock(side_effect=requests.HTTPError("HTTP 403", response=Mock(status_code=403)))
+    
+    await extractor.get_ticket('ROOT-1')
+    context = extractor.new_context()
+    ticket_data = await extractor.get_ticket('ROOT-2', context=context)
+    
+    fetched = [call.args[0] for call in extractor.jira.issue.call_args_list]
+    assert fetched.count('MISSING-1') == 1
+    assert confluence.get_page_by_id.call_count == 1
+    assert ticket_data['references']['jira_tickets'] == []
+    page = ticket_data['references']['confluence_pages'][0]
+    assert page['error'] == "Skipped, failed recently (forbidden): HTTP 403"
+    assert context.reference_stats['failed_fetches'] == 2
+    assert extractor.negative_cache.get('jira:MISSING-1').failure_class == 'not_found'
+    # Written once per extraction rather than once per failure
+    assert not extractor.negative_cache.dirty
+    assert NegativeCache(str(tmp_path / 'failures.json')).get('confluence:https://confluence.example.com/display/TEST/Page1')
+
+@pytest.mark.asyncio
+async def test_concurrent_extractions_are_independent(mock_url_analyzer, graph_jira):
+    """Test that one extractor can serve repeated and concurrent get_ticket calls."""
+    links = {
+        'ROOT-1': ['A-1'],
+        'ROOT-2': ['A-1'],
+        'A-1': [],
+    }
+    extractor = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    first = await extractor.get_ticket('ROOT-1')
+    again = await extractor.get_ticket('ROOT-1')
+    assert again == first
+    assert again['summary'] == 'Summary ROOT-1'
+    
+    contexts = [extractor.new_context(), extractor.new_context()]
+    one, two = await asyncio.gather(
+        extractor.get_ticket('ROOT-1', context=contexts[0]),
+        extractor.get_ticket('ROOT-2', context=contexts[1])
+    )
+    
+    for bundle in (one, two):
+        linked = bundle['references']['jira_tickets'][0]
+        assert linked['id'] == 'A-1'
+        assert linked['summary'] == 'Summary A-1'
+    assert contexts[0].processed_ids == {'ROOT-1', 'A-1'}
+    assert contexts[1].processed_ids == {'ROOT-2', 'A-1'}
+    assert contexts[0].reference_stats['total_references'] == 1
+
+@pytest.mark.asyncio
+async def test_level_fetches_run_concurrently(mock_url_analyzer, graph_jira):
+    """Test that tickets at the same depth are fetched concurrently up to max_concurrency."""
+    import threading
+    import time
+    
+    links = {'ROOT-1': [f"A-{i}" for i in range(1, 7)]}
+    links.update({f"A-{i}": [] for i in range(1, 7)})
+    jira = graph_jira(links)
+    graph_issue = jira.issue.side_effect
+    lock = threading.Lock()
+    in_flight = {'current': 0, 'peak': 0}
+    
+    def slow_issue(key, *args, **kwargs):
+        with lock:
+            in_flight['current'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['current'])
+        time.sleep(0.05)
+        with lock:
+            in_flight['current'] -= 1
+        return graph_issue(key)
+    
+    jira.issue = slow_issue
+    extractor = JiraExtractor(jira=jira, max_reference_depth=1, max_concurrency=3)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    assert [ref['id'] for ref in ticket_data['references']['jira_tickets']] == [f"A-{i}" for i in range(1, 7)]
+    assert 1 < in_flight['peak'] <= 3
+
+@pytest.mark.asyncio
+async def test_levels_fetched_through_batched_search(mock_url_analyzer, graph_jira):
+    """Test that each depth level is fetched with JQL searches instead of per-ticket calls."""
+    links = {'ROOT-1': ['A-1', 'A-2', 'A-3', 'MISSING-1'], 'A-1': ['B-1'], 'A-2': [], 'A-3': [], 'B-1': []}
+    jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(
+        jira=jira,
+        max_reference_depth=2,
+        batch_config=JQLBatchConfig(max_keys_per_query=2, page_size=1)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    a_tickets = ticket_data['references']['jira_tickets']
+    assert [ref['id'] for ref in a_tickets] == ['A-1', 'A-2', 'A-3']
+    assert a_tickets[0]['references']['jira_tickets'][0]['id'] == 'B-1'
+    
+    searched = [call.args[0] for call in jira.jql.call_args_list]
+    assert 'key in (A-1, A-2)' in searched
+    assert 'key in (A-3, MISSING-1)' in searched
+    # Only the ticket the search did not return is fetched individually
+    assert [call.args[0] for call in jira.issue.call_args_list] == ['MISSING-1']
+    jira.issue_get_comments.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_missing_key_does_not_fail_batch(mock_url_analyzer, graph_jira):
+    """Test that a deleted ticket in a chunk does not make Jira reject the search for the others."""
+    links = {'ROOT-1': ['A-1', 'MISSING-1', 'A-2'], 'A-1': [], 'A-2': []}
+    jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=1)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    assert [ref['id'] for ref in ticket_data['references']['jira_tickets']] == ['A-1', 'A-2']
+    assert [call.args[0] for call in jira.jql.call_args_list] == ['key in (ROOT-1)', 'key in (A-1, MISSING-1, A-2)']
+    assert all(call.kwargs['validate_query'] == 'warn' for call in jira.jql.call_args_list)
+    assert [call.args[0] for call in jira.issue.call_args_list] == ['MISSING-1']
+
+@pytest.mark.asyncio
+async def test_fetch_plan_per_depth(mock_url_analyzer, graph_jira):
+    """Test that deeper levels are fetched with their own projection and payloads are accounted."""
+    from ticket_extractors.fetch_planner import FetchPlanner, FetchPlan
+    
+    links = {'ROOT-1': ['A-1'], 'A-1': ['B-1'], 'B-1': []}
+    jira = graph_jira(links, searchable=True)
+    thin_plan = FetchPlan(fields=('summary', 'status', 'updated', 'issuelinks'))
+    planner = FetchPlanner(depth_plans={1: thin_plan}, full_payload_bytes=100000)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2, fetch_planner=planner)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    fields_by_query = {call.args[0]: call.kwargs['fields'] for call in jira.jql.call_args_list}
+    assert 'comment' in fields_by_query['key in (ROOT-1)'].split(',')
+    assert fields_by_query['key in (A-1)'] == 'summary,status,updated,issuelinks'
+    assert fields_by_query['key in (B-1)'] == 'summary,status,updated,issuelinks'
+    assert ticket_data['references']['jira_tickets'][0]['comments'] == []
+    
+    assert extractor.fetch_stats.payloads == 3
+    assert 0 < extractor.fetch_stats.bytes_received < 300000
+    assert extractor.fetch_stats.estimated_bytes_saved == 300000 - extractor.fetch_stats.bytes_received
+
+@pytest.mark.asyncio
+async def test_savings_count_primary_payloads_once(mock_url_analyzer, graph_jira):
+    """Test that savings are estimated once per ticket, not for comment pages or skeleton completions."""
+    from ticket_extractors.fetch_planner import FetchPlanner, FetchPlan
+    
+    links = {'ROOT-1': ['A-1'], 'A-1': ['B-1'], 'B-1': []}
+    thin_plan = FetchPlan(fields=('summary', 'status', 'updated', 'issuelinks'))
+    field_bytes = {'summary': 50, 'description': 1000, 'comment': 3000, 'customfield_10001': 20000}
+    
+    for skeleton_crawl in (False, True):
+        jira = graph_jira(links)
+        planner = FetchPlanner(depth_plans={1: thin_plan}, field_bytes=field_bytes)
+        extractor = JiraExtractor(jira=jira, max_reference_depth=2, fetch_planner=planner, skeleton_crawl=skeleton_crawl)
+        extractor.url_analyzer = mock_url_analyzer
+        
+        await extractor.get_ticket('ROOT-1')
+        
+        # The root's comments are paginated separately: a payload, but not a projected one
+        assert extractor.fetch_stats.payloads > 3
+        assert extractor.fetch_stats.projected_payloads == 3
+        assert extractor.fetch_stats.estimated_bytes_saved == 20000 + 2 * 24000
+
+@pytest.mark.asyncio
+async def test_ticket_cache_revalidation(mock_url_analyzer, tmp_path, graph_jira):
+    """Test that cached tickets are reused after an `updated`-only revalidation search."""
+    from ticket_extractors.ticket_cache import TicketCache, TicketCacheConfig
+    
+    links = {'ROOT-1': ['A-1'], 'A-1': []}
+    cache = TicketCache(str(tmp_path), TicketCacheConfig(ttl_seconds=0))
+    
+    first_jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(jira=first_jira, max_reference_depth=1, ticket_cache=cache)
+    extractor.url_analyzer = mock_url_analyzer
+    first = await extractor.get_ticket('ROOT-1')
+    assert cache.stats['stores'] == 2
+    
+    second_jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(jira=second_jira, max_reference_depth=1, ticket_cache=cache)
+    extractor.url_analyzer = mock_url_analyzer
+    second = await extractor.get_ticket('ROOT-1')
+    
+    assert second == first
+    assert cache.stats['hits'] == 2
+    assert cache.stats['revalidated'] == 2
+    assert extractor.fetch_stats.cache_hits == 2
+    assert {call.kwargs['fields'] for call in second_jira.jql.call_args_list} == {'updated'}
+    second_jira.issue.assert_not_called()
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_ticket_cache_revalidation_with_deleted_ticket(mock_url_analyzer, tmp_path, graph_jira):
+    """Test that a ticket deleted since it was cached does not prevent revalidating the others."""
+    from ticket_extractors.ticket_cache import TicketCache, TicketCacheConfig
+    
+    links = {'ROOT-1': ['A-1', 'A-2'], 'A-1': [], 'A-2': []}
+    cache = TicketCache(str(tmp_path), TicketCacheConfig(ttl_seconds=0))
+    extractor = JiraExtractor(jira=graph_jira(links, searchable=True), max_reference_depth=1, ticket_cache=cache)
+    extractor.url_analyzer = mock_url_analyzer
+    await extractor.get_ticket('ROOT-1')
+    
+    del links['A-2']
+    jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=1, ticket_cache=cache)
+    extractor.url_analyzer = mock_url_analyzer
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    assert [ref['id'] for ref in ticket_data['references']['jira_tickets']] == ['A-1']
+    assert cache.stats['revalidated'] == 2
+    assert [call.args[0] for call in jira.jql.call_args_list] == ['key in (ROOT-1)', 'key in (A-1, A-2)', 'key in (A-2)']
+    # Only the deleted ticket is refetched, and found missing
+    assert [call.args[0] for call in jira.issue.call_args_list] == ['A-2']
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_rejected_timestamp_search_is_split(jql_search):
+    """Test that a key search Jira rejects outright is split until only the bad key is left out."""
+    jira = Mock()
+    # A server that rejects unknown keys even when asked to only warn
+    jira.jql = jql_search(
+        lambda key, fields: None if key == 'BAD-1' else {'key': key, 'fields': {'updated': f"updated {key}"}},
+        strict=True
+    )
+    extractor = JiraExtractor(jira=jira)
+    
+    versions = await extractor.ticket_versions(['A-1', 'A-2', 'BAD-1', 'A-3'])
+    
+    assert versions == {key: f"updated {key}" for key in ('A-1', 'A-2', 'A-3')}
+    assert jira.jql.call_count == 5
+
+@pytest.mark.asyncio
+async def test_mine_many_shares_fetches(mock_url_analyzer, graph_jira):
+    """Test that roots mined together fetch shared tickets once and get independent bundles."""
+    links = {
+        'ROOT-1': ['SHARED-1', 'A-1'],
+        'ROOT-2': ['SHARED-1'],
+        'SHARED-1': ['DEEP-1'],
+        'A-1': [],
+        'DEEP-1': [],
+    }
+    jira = graph_jira(links)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2, batch_config=JQLBatchConfig(enabled=False))
+    extractor.url_analyzer = mock_url_analyzer
+    
+    bundles = await extractor.mine_many(['ROOT-1', 'ROOT-2', 'ROOT-1'], concurrency=4)
+    
+    assert list(bundles) == ['ROOT-1', 'ROOT-2']
+    fetched = [call.args[0] for call in jira.issue.call_args_list]
+    assert sorted(fetched) == sorted(links)
+    
+    for root_id in bundles:
+        single = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+        single.url_analyzer = mock_url_analyzer
+        assert bundles[root_id] == await single.get_ticket(root_id)
+    
+    # Each bundle embeds the shared ticket, but with its own reference lists
+    shared_1 = bundles['ROOT-1']['references']['jira_tickets'][0]
+    shared_2 = bundles['ROOT-2']['references']['jira_tickets'][0]
+    assert shared_1 == shared_2 and shared_1 is not shared_2
+    
+    stats = extractor.mining_stats
+    assert stats['roots'] == 2
+    assert stats['unique_tickets'] == 5
+    assert stats['ticket_references'] == 7
+    assert stats['tickets_deduplicated'] == 2
+
+@pytest.mark.asyncio
+async def test_mine_many_normalized(mock_url_analyzer, graph_jira):
+    """Test that normalized output stores each ticket once and expands to the nested bundles."""
+    links = {
+        'ROOT-1': ['SHARED-1', 'A-1'],
+        'ROOT-2': ['SHARED-1'],
+        'SHARED-1': ['DEEP-1'],
+        'A-1': ['SHARED-1'],
+        'DEEP-1': [],
+    }
+    extractor = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    normalized = await extractor.mine_many_normalized(['ROOT-1', 'ROOT-2'])
+    
+    assert sorted(normalized.nodes) == sorted(links)
+    assert all(node['references']['jira_tickets'] == [] for node in normalized.nodes.values())
+    assert [(edge.source, edge.target) for edge in normalized.edges] == [
+        ('ROOT-1', 'SHARED-1'), ('ROOT-1', 'A-1'), ('ROOT-2', 'SHARED-1'),
+        ('SHARED-1', 'DEEP-1'), ('A-1', 'SHARED-1'),
+    ]
+    assert normalized.edges[0].context == "Linked issue"
+    
+    for root_id in normalized.roots:
+        single = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+        single.url_analyzer = mock_url_analyzer
+        assert normalized.expand(root_id) == await single.get_ticket(root_id)
+
+@pytest.mark.asyncio
+async def test_stream_ticket(mock_url_analyzer, graph_jira):
+    """Test that streaming yields the root first, then tickets with their parent and edges."""
+    links = {
+        'ROOT-1': ['A-1', 'B-1', 'MISSING-1'],
+        'A-1': ['B-1', 'C-1'],
+        'B-1': ['C-1', 'ROOT-1'],
+        'C-1': ['D-1'],
+    }
+    extractor = JiraExtractor(jira=graph_jira(links), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    records = [record async for record in extractor.stream_ticket('ROOT-1')]
+    
+    tickets = [record for record in records if record['type'] == 'jira_ticket']
+    assert tickets[0]['id'] == 'ROOT-1' and tickets[0]['parent'] is None
+    assert {(t['id'], t['parent'], t['depth']) for t in tickets} == {
+        ('ROOT-1', None, 0), ('A-1', 'ROOT-1', 1), ('B-1', 'ROOT-1', 1), ('C-1', 'A-1', 2)
+    }
+    assert all(t['data']['references']['jira_tickets'] == [] for t in tickets)
+    
+    edges = {(r['source'], r['target']) for r in records if r['type'] == 'edge'}
+    assert edges == {('A-1', 'B-1'), ('B-1', 'C-1'), ('B-1', 'ROOT-1')}
+    
+    # Every ticket is emitted before any edge pointing to it
+    positions = {t['id']: records.index(t) for t in tickets}
+    for index, record in enumerate(records):
+        if record['type'] == 'edge':
+            assert positions[record['target']] < index
+    
+    lines = [line async for line in extractor.stream_ticket_ndjson('ROOT-1')]
+    assert sorted(json.loads(line)['type'] for line in lines) == sorted(record['type'] for record in records)
+
+@pytest.mark.asyncio
+async def test_stream_releases_yielded_resources(mock_url_analyzer, graph_jira):
+    """Test that a streamed page is fetched once and its data is not kept once yielded."""
+    page_url = 'https://confluence.example.com/display/TEST/Page1'
+    links = {'ROOT-1': ['A-1'], 'A-1': ['B-1'], 'B-1': []}
+    descriptions = {'ROOT-1': f"See {page_url}", 'B-1': f"Also {page_url}"}
+    extractor = JiraExtractor(jira=graph_jira(links, descriptions=descriptions), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(return_value={'title': 'Page 1'})
+    context = extractor.new_context()
+    
+    pages = []
+    async for record in extractor.stream_ticket('ROOT-1', context=context):
+        if record['type'] == 'confluence_pages':
+            pages.append(record)
+            assert context.resource_tasks == {}
+    
+    assert [(page['parent'], 'data' in page['data']) for page in pages] == [('ROOT-1', True), ('B-1', False)]
+    assert pages[1]['data']['is_processed_reference'] is True
+    assert extractor.confluence_extractor.get_page_from_url.call_count == 1
+
+@pytest.mark.asyncio
+async def test_budget_prefers_issue_links(mock_url_analyzer, graph_jira):
+    """Test that a ticket budget fetches issue links before description mentions and marks the rest."""
+    from ticket_extractors.traversal import TraversalBudget
+    
+    links = {
+        'ROOT-1': ['A-1', 'B-1'],
+        'A-1': ['C-1'],
+        'B-1': [],
+        'C-1': [],
+        'PROJ-5678': [],
+    }
+    jira = graph_jira(links, descriptions={'ROOT-1': 'See PROJ-5678'})
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2, budget=TraversalBudget(max_tickets=3))
+    extractor.url_analyzer = mock_url_analyzer
+    
+    context = extractor.new_context()
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    mention, a_ticket, b_ticket = ticket_data['references']['jira_tickets']
+    assert mention['id'] == 'PROJ-5678'
+    assert mention['metadata']['is_truncated'] is True
+    assert a_ticket['summary'] == 'Summary A-1'
+    assert b_ticket['summary'] == 'Summary B-1'
+    assert a_ticket['references']['jira_tickets'][0]['metadata']['is_truncated'] is True
+    assert context.truncated_reason == 'max_tickets'
+    assert context.tickets_fetched == 3
+
+@pytest.mark.asyncio
+async def test_reference_keeps_highest_priority_kind(mock_url_analyzer, graph_jira):
+    """Test that a ticket both mentioned in the description and issue-linked is queued as an issue link."""
+    from ticket_extractors.reference_graph import TicketReference
+    
+    links = {'ROOT-1': ['A-1', 'PROJ-5678'], 'A-1': [], 'PROJ-5678': []}
+    jira = graph_jira(links, descriptions={'ROOT-1': 'See PROJ-5678'})
+    extractor = JiraExtractor(jira=jira)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    _, references = await extractor._expand_ticket('ROOT-1', (jira.issue('ROOT-1'), None), extractor.new_context())
+    
+    assert references == [
+        TicketReference('PROJ-5678', 'Linked issue', 'issuelink'),
+        TicketReference('A-1', 'Linked issue', 'issuelink'),
+    ]
+
+@pytest.mark.asyncio
+async def test_skeleton_crawl_matches_full_crawl(mock_url_analyzer, graph_jira):
+    """Test that a skeleton crawl builds the same bundle as a full crawl."""
+    links = {
+        'ROOT-1': ['A-1', 'B-1'],
+        'A-1': ['B-1', 'C-1'],
+        'B-1': ['ROOT-1'],
+        'C-1': ['MISSING-1'],
+    }
+    descriptions = {'ROOT-1': 'See PROJ-5678'}
+    links['PROJ-5678'] = []
+    bundles = []
+    for skeleton_crawl in (False, True):
+        extractor = JiraExtractor(
+            jira=graph_jira(links, searchable=True, descriptions=descriptions),
+            max_reference_depth=2,
+            skeleton_crawl=skeleton_crawl
+        )
+        extractor.url_analyzer = mock_url_analyzer
+        bundles.append(await extractor.get_ticket('ROOT-1'))
+    
+    assert bundles[1] == bundles[0]
+
+@pytest.mark.asyncio
+async def test_skeleton_crawl_costs_less_than_full_crawl(mock_url_analyzer, graph_jira):
+    """Test that a skeleton crawl discovers within the budget and fetches less than a full crawl."""
+    from ticket_extractors.traversal import TraversalBudget
+    
+    links = {
+        'ROOT-1': ['A-1', 'B-1'],
+        'A-1': ['C-1'],
+        'B-1': [],
+        'C-1': [],
+        'PROJ-5678': ['D-1', 'E-1', 'F-1', 'G-1'],
+        'PROJ-9012': ['H-1', 'I-1'],
+    }
+    links.update((key, []) for key in ('D-1', 'E-1', 'F-1', 'G-1', 'H-1', 'I-1'))
+    # Every ticket carries a long comment; two of them mention tickets heading further subtrees
+    comments = {key: ['x' * 5000] for key in links}
+    comments['ROOT-1'] = ['x' * 5000 + ' See PROJ-5678']
+    comments['A-1'] = ['x' * 5000 + ' See PROJ-9012']
+    
+    stats = {}
+    for skeleton_crawl in (False, True):
+        jira = graph_jira(links, comments=comments)
+        extractor = JiraExtractor(
+            jira=jira,
+            max_reference_depth=2,
+            budget=TraversalBudget(max_tickets=10),
+            batch_config=JQLBatchConfig(enabled=False),
+            skeleton_crawl=skeleton_crawl
+        )
+        extractor.url_analyzer = mock_url_analyzer
+        context = extractor.new_context()
+        ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+        stats[skeleton_crawl] = context.fetch_stats
+    
+    assert stats[True].api_calls < stats[False].api_calls
+    assert stats[True].bytes_received < stats[False].bytes_received
+    
+    # Discovery skipped the comments; the tickets kept were then completed in full
+    skeleton_fetches = [c.args[0] for c in jira.issue.call_args_list if 'comment' not in c.kwargs['fields']]
+    assert skeleton_fetches == ['ROOT-1', 'A-1', 'B-1', 'C-1']
+    mention, a_ticket, b_ticket = ticket_data['references']['jira_tickets']
+    assert a_ticket['summary'] == 'Summary A-1'
+    assert a_ticket['comments'][0]['body'].endswith('See PROJ-9012')
+    assert mention['id'] == 'PROJ-5678'
+    assert mention['metadata']['is_truncated'] is True
+    a_mention, c_ticket = a_ticket['references']['jira_tickets']
+    assert a_mention['metadata']['is_truncated'] is True
+    assert c_ticket['summary'] == 'Summary C-1'
+    
+    # The ticket budget stops discovery itself
+    jira = graph_jira(links, comments=comments)
+    extractor = JiraExtractor(
+        jira=jira,
+        max_reference_depth=2,
+        budget=TraversalBudget(max_tickets=3),
+        batch_config=JQLBatchConfig(enabled=False),
+        skeleton_crawl=True
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    context = extractor.new_context()
+    await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert [c.args[0] for c in jira.issue.call_args_list] == ['ROOT-1', 'A-1', 'B-1', 'ROOT-1', 'A-1', 'B-1']
+    assert context.truncated_reason == 'max_tickets'
+    assert context.tickets_fetched == 3
+
+@pytest.fixture
+def hierarchy_jira(jql_search):
+    """Factory of mock Jira clients whose tickets form the hierarchy described by ``parents`` (child -> parent)."""
+    def make(parents):
+        mock = Mock()
+        keys = set(parents) | {parent for parent in parents.values() if parent}
+        
+        def mock_issue(key, *args, **kwargs):
+            fields = {'summary': f"Summary {key}", 'issuelinks': [], 'comment': {'comments': [], 'total': 0}}
+            if parents.get(key):
+                fields['parent'] = {'key': parents[key]}
+            return {'key': key, 'fields': fields}
+        
+        mock.issue = Mock(side_effect=mock_issue)
+        mock.jql = jql_search(lambda key, fields: mock_issue(key) if key in keys else None, parents)
+        return mock
+    
+    return make
+
+@pytest.mark.asyncio
+async def test_hierarchy_expansion(mock_url_analyzer, hierarchy_jira):
+    """Test that children are found in bulk and parents are followed, with cycles handled."""
+    from ticket_extractors.hierarchy import HierarchyConfig
+    
+    parents = {'EPIC-1': None, 'STORY-1': 'EPIC-1', 'STORY-2': 'EPIC-1', 'STORY-3': 'EPIC-1', 'SUB-1': 'STORY-1'}
+    jira = hierarchy_jira(parents)
+    extractor = JiraExtractor(
+        jira=jira,
+        max_reference_depth=2,
+        hierarchy_config=HierarchyConfig(enabled=True, page_size=2)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    
+    normalized = await extractor.get_ticket_normalized('STORY-1')
+    ticket_data = normalized.expand('STORY-1')
+    
+    assert [(edge.target, edge.context) for edge in normalized.outgoing('STORY-1')] == [
+        ('EPIC-1', 'Parent ticket'), ('SUB-1', 'Child issue')
+    ]
+    epic, sub_task = ticket_data['references']['jira_tickets']
+    assert sub_task['summary'] == 'Summary SUB-1'
+    assert [child['id'] for child in epic['references']['jira_tickets']] == ['STORY-1', 'STORY-2', 'STORY-3']
+    assert epic['references']['jira_tickets'][0]['metadata']['is_processed_reference'] is True
+    
+    child_searches = [c for c in jira.jql.call_args_list if c.args[0].startswith('parent in')]
+    # One paginated search per level: the root, then SUB-1 and EPIC-1 together
+    assert [c.kwargs['start'] for c in child_searches] == [0, 0, 2]
+    assert jira.issue.call_count == 0
+
+@pytest.mark.asyncio
+async def test_children_of_deleted_parent(mock_url_analyzer, hierarchy_jira):
+    """Test that a deleted ticket in a child search does not hide the children of the others."""
+    from ticket_extractors.hierarchy import HierarchyConfig
+    
+    jira = hierarchy_jira({'EPIC-1': None, 'STORY-1': 'EPIC-1', 'STORY-2': 'EPIC-1'})
+    extractor = JiraExtractor(jira=jira, hierarchy_config=HierarchyConfig(enabled=True))
+    
+    children = await extractor._fetch_children(['EPIC-1', 'GONE-1'], extractor.new_context())
+    
+    assert children == {'EPIC-1': [('STORY-1', 'Child issue'), ('STORY-2', 'Child issue')]}
+    assert jira.jql.call_count == 1
+    assert jira.jql.call_args.kwargs['validate_query'] == 'warn'
+
+@pytest.mark.asyncio
+async def test_hierarchy_disabled_by_default(mock_url_analyzer, hierarchy_jira):
+    """Test that children are not searched unless hierarchy expansion is enabled."""
+    jira = hierarchy_jira({'STORY-1': 'EPIC-1', 'SUB-1': 'STORY-1'})
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('STORY-1')
+    
+    assert ticket_data['references']['jira_tickets'] == []
+    assert all(c.args[0].startswith('key in') for c in jira.jql.call_args_list)
+
+@pytest.mark.asyncio
+async def test_api_call_budget(mock_url_analyzer, graph_jira):
+    """Test that the API call budget stops the crawl between fetches."""
+    from ticket_extractors.traversal import TraversalBudget
+    
+    links = {'ROOT-1': ['A-1', 'B-1'], 'A-1': [], 'B-1': []}
+    jira = graph_jira(links, searchable=True)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2, budget=TraversalBudget(max_api_calls=1))
+    extractor.url_analyzer = mock_url_analyzer
+    
+    context = extractor.new_context()
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert jira.jql.call_count == 1
+    assert context.fetch_stats.api_calls == 1
+    assert context.truncated_reason == 'max_api_calls'
+    assert [ref['metadata']['is_truncated'] for ref in ticket_data['references']['jira_tickets']] == [True, True]
+
+@pytest.mark.asyncio
+async def test_memory_limit_truncates_crawl(mock_url_analyzer, graph_jira):
+    """Test that reaching the memory limit stops the crawl like a budget."""
+    from ticket_extractors.memory_manager import MemoryManager, MemoryConfig
+    
+    links = {'ROOT-1': ['A-1', 'B-1'], 'A-1': ['C-1'], 'B-1': [], 'C-1': []}
+    jira = graph_jira(links)
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    # Sample on every check; the limit is reached once the root has been fetched
+    memory = MemoryManager(MemoryConfig(check_every=1, check_interval=3600))
+    memory.limit_exceeded = Mock(side_effect=[None, "Memory usage exceeds maximum limit"])
+    extractor.memory_manager = memory
+    
+    context = extractor.new_context()
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert context.truncated_reason == 'memory'
+    assert ticket_data['id'] == 'ROOT-1'
+    assert ticket_data['references']['jira_tickets'] == [
+        {
+            'id': key,
+            'url': f"{config.JIRA_URL}/browse/{key}",
+            'context': 'Not fetched: traversal budget reached',
+            'metadata': {
+                'platform': 'knowledge_base',
+                'resource_type': 'jira_ticket',
+                'resource_id': key,
+                'ticket_id': key,
+                'is_truncated': True,
+                'status': 'not_started',
+                'elapsed_seconds': None
+            }
+        }
+        for key in ('A-1', 'B-1')
+    ]
+    # Neither the truncated tickets nor C-1 behind them were requested
+    assert [call.args[0] for call in jira.issue.call_args_list] == ['ROOT-1']
+    assert memory.limit_exceeded.call_count == 2
+
+@pytest.mark.asyncio
+async def test_stream_budget(mock_url_analyzer, graph_jira):
+    """Test that streaming under a budget yields truncated records for unfetched tickets."""
+    from ticket_extractors.traversal import TraversalBudget
+    
+    links = {'ROOT-1': ['A-1'], 'A-1': [], 'PROJ-5678': []}
+    jira = graph_jira(links, descriptions={'ROOT-1': 'See PROJ-5678'})
+    extractor = JiraExtractor(jira=jira, max_reference_depth=2, budget=TraversalBudget(max_tickets=2))
+    extractor.url_analyzer = mock_url_analyzer
+    
+    records = [record async for record in extractor.stream_ticket('ROOT-1')]
+    
+    assert [(r['type'], r['id']) for r in records] == [
+        ('jira_ticket', 'ROOT-1'), ('truncated', 'PROJ-5678'), ('jira_ticket', 'A-1')
+    ]
+    assert records[1]['reason'] == 'max_tickets'
+
+@pytest.mark.asyncio
+async def test_resources_fetched_in_separate_pools(mock_url_analyzer, graph_jira):
+    """Test that pages are fetched once each and slow scrapes do not hold up Jira fetches."""
+    from ticket_extractors.resource_fetch import ResourceFetchConfig
+    
+    links = {'ROOT-1': ['A-1'], 'A-1': ['B-1'], 'B-1': []}
+    descriptions = {
+        'ROOT-1': 'See https://confluence.example.com/display/TEST/Page1',
+        'A-1': 'Also https://confluence.example.com/display/TEST/Page1',
+    }
+    extractor = JiraExtractor(
+        jira=graph_jira(links, descriptions=descriptions),
+        max_reference_depth=2,
+        resource_config=ResourceFetchConfig(confluence_concurrency=1)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    
+    jira_done = asyncio.Event()
+    original_issue = extractor.jira.issue.side_effect
+    
+    def tracking_issue(key, *args, **kwargs):
+        if key == 'B-1':
+            jira_done.set()
+        return original_issue(key, *args, **kwargs)
+    
+    extractor.jira.issue.side_effect = tracking_issue
+    
+    async def slow_page(url):
+        # Jira keeps crawling while the page is being fetched
+        await asyncio.wait_for(jira_done.wait(), timeout=5)
+        return {'id': 'Page1', 'title': 'Page 1', 'url': url}
+    
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(side_effect=slow_page)
+    context = extractor.new_context()
+    
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert extractor.confluence_extractor.get_page_from_url.call_count == 1
+    assert ticket_data['references']['confluence_pages'][0]['data']['title'] == 'Page 1'
+    a_ticket = ticket_data['references']['jira_tickets'][0]
+    assert a_ticket['references']['confluence_pages'][0]['data']['title'] == 'Page 1'
+    assert context.reference_stats['by_type']['confluence'] == 1
+
+@pytest.mark.asyncio
+async def test_references_deduplicated_by_resource(mock_url_analyzer, graph_jira):
+    """Test that different URL forms of the same ticket or document are recorded once."""
+    links = {'ROOT-1': ['A-1'], 'A-1': []}
+    descriptions = {'ROOT-1': 'root links', 'A-1': 'guide link'}
+    extractor = JiraExtractor(jira=graph_jira(links, descriptions=descriptions), max_reference_depth=2)
+    matches = {
+        'root links': [
+            URLMatch(f"{config.JIRA_URL}/browse/A-1", 'jira', True, ResourceMetadata('jira_ticket', 'A-1')),
+            URLMatch(f"{config.JIRA_URL}/browse/A-1?focusedCommentId=7", 'jira', True, ResourceMetadata('jira_ticket', 'A-1')),
+            URLMatch("https://docs.example.com/guide", 'documentation', True),
+            URLMatch("https://docs.example.com/guide#setup", 'documentation', True),
+        ],
+        'guide link': [URLMatch("https://docs.example.com/guide/?utm_source=jira", 'documentation', True)],
+    }
+    
+    async def analyze_content(content):
+        return matches.get(content, [])
+    
+    extractor.url_analyzer = Mock(analyze_content=analyze_content)
+    extractor.webpage_extractor.get_page_from_url = AsyncMock(return_value={'title': 'Guide'})
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    assert [ref['id'] for ref in ticket_data['references']['jira_tickets']] == ['A-1']
+    assert len(ticket_data['references']['scrapable_documentation']) == 1
+    a_ticket = ticket_data['references']['jira_tickets'][0]
+    assert a_ticket['references']['scrapable_documentation'][0]['data'] == {'title': 'Guide'}
+    # Each document is fetched once per bundle, whatever URL form links to it
+    assert extractor.webpage_extractor.get_page_from_url.call_count == 1
+
+@pytest.mark.asyncio
+async def test_same_titled_pages_in_different_spaces(mock_url_analyzer, graph_jira):
+    """Test that pages linked by title are kept apart when their spaces differ."""
+    links = {'ROOT-1': []}
+    descriptions = {'ROOT-1': 'runbooks'}
+    extractor = JiraExtractor(jira=graph_jira(links, descriptions=descriptions), max_reference_depth=2)
+    urls = ["https://confluence.example.com/display/OPS/Runbook", "https://confluence.example.com/display/SEC/Runbook"]
+    
+    async def analyze_content(content):
+        if content != 'runbooks':
+            return []
+        return [URLMatch(url, 'confluence', True, ResourceMetadata('confluence_page', 'Runbook')) for url in urls]
+    
+    async def get_page_from_url(url):
+        return {'title': 'Runbook', 'space': url.split('/')[-2]}
+    
+    extractor.url_analyzer = Mock(analyze_content=analyze_content)
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(side_effect=get_page_from_url)
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    pages = ticket_data['references']['confluence_pages']
+    assert [page['url'] for page in pages] == urls
+    assert [page['data']['space'] for page in pages] == ['OPS', 'SEC']
+    assert extractor.confluence_extractor.get_page_from_url.call_count == 2
+
+@pytest.mark.asyncio
+async def test_failed_resource_is_recorded(mock_url_analyzer, graph_jira):
+    """Test that a page that cannot be fetched keeps its reference with an error."""
+    links = {'ROOT-1': []}
+    descriptions = {'ROOT-1': 'See https://confluence.example.com/display/TEST/Page1'}
+    extractor = JiraExtractor(jira=graph_jira(links, descriptions=descriptions), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(side_effect=Exception("boom"))
+    context = extractor.new_context()
+    
+    records = [record async for record in extractor.stream_ticket('ROOT-1', context=context)]
+    
+    page = records[-1]
+    assert page['type'] == 'confluence_pages'
+    assert page['data']['error'] == 'boom'
+    assert context.failed_urls == ['https://confluence.example.com/display/TEST/Page1']
+
+@pytest.fixture
+def slow_jira(graph_jira):
+    """Factory of graph mock Jira clients whose ``slow`` tickets take ``delay`` seconds to fetch."""
+    import time
+    
+    def make(links, slow, delay, descriptions=None):
+        jira = graph_jira(links, descriptions=descriptions)
+        original_issue = jira.issue.side_effect
+        
+        def slow_issue(key, *args, **kwargs):
+            if key in slow:
+                time.sleep(delay)
+            return original_issue(key, *args, **kwargs)
+        
+        jira.issue.side_effect = slow_issue
+        return jira
+    
+    return make
+
+@pytest.mark.asyncio
+async def test_node_timeout_marks_ticket(mock_url_analyzer, slow_jira):
+    """Test that a ticket whose request times out is marked with its status and elapsed time."""
+    from ticket_extractors.traversal import TimeoutConfig
+    
+    links = {'ROOT-1': ['SLOW-1', 'A-1'], 'SLOW-1': [], 'A-1': []}
+    extractor = JiraExtractor(
+        jira=slow_jira(links, {'SLOW-1'}, 0.5),
+        max_reference_depth=2,
+        timeouts=TimeoutConfig(node_seconds=0.1)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    slow, a_ticket = ticket_data['references']['jira_tickets']
+    assert slow['metadata']['status'] == 'timeout'
+    assert 0.1 <= slow['metadata']['elapsed_seconds'] < 0.5
+    assert slow['context'].startswith('Not fetched: timeout after')
+    assert a_ticket['summary'] == 'Summary A-1'
+
+@pytest.mark.asyncio
+async def test_concurrent_extractions_coalesce_fetches(mock_url_analyzer, slow_jira):
+    """Test that concurrent extractions share in-flight ticket and page fetches."""
+    links = {'ROOT-1': ['A-1'], 'ROOT-2': ['A-1'], 'A-1': []}
+    descriptions = {
+        'ROOT-1': 'See https://confluence.example.com/display/TEST/Page1',
+        'ROOT-2': 'See https://confluence.example.com/display/TEST/Page1',
+    }
+    extractor = JiraExtractor(jira=slow_jira(links, {'A-1'}, 0.2, descriptions=descriptions), max_reference_depth=2)
+    extractor.url_analyzer = mock_url_analyzer
+    
+    async def slow_page(url):
+        await asyncio.sleep(0.2)
+        return {'id': 'Page1', 'title': 'Page 1', 'url': url}
+    
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(side_effect=slow_page)
+    
+    one, two = await asyncio.gather(
+        extractor.get_ticket('ROOT-1', context=extractor.new_context()),
+        extractor.get_ticket('ROOT-2', context=extractor.new_context())
+    )
+    
+    for bundle in (one, two):
+        assert bundle['references']['jira_tickets'][0]['summary'] == 'Summary A-1'
+        assert bundle['references']['confluence_pages'][0]['data']['title'] == 'Page 1'
+    fetched = [call.args[0] for call in extractor.jira.issue.call_args_list]
+    assert fetched.count('A-1') == 1
+    assert extractor.confluence_extractor.get_page_from_url.call_count == 1
+    assert extractor.single_flight.stats['confluence'] == {'fetches': 1, 'coalesced': 1}
+    assert extractor.single_flight.stats['jira']['coalesced'] == 1
+
+@pytest.mark.asyncio
+async def test_bundle_deadline_cancels_level(mock_url_analyzer, slow_jira):
+    """Test that the bundle deadline cancels in-flight fetches and returns a partial bundle."""
+    import time
+    from ticket_extractors.traversal import TimeoutConfig
+    
+    links = {'ROOT-1': ['SLOW-1'], 'SLOW-1': ['B-1'], 'B-1': []}
+    extractor = JiraExtractor(
+        jira=slow_jira(links, {'SLOW-1'}, 1.0),
+        max_reference_depth=2,
+        timeouts=TimeoutConfig(bundle_seconds=0.3)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    context = extractor.new_context()
+    
+    started = time.monotonic()
+    ticket_data = await extractor.get_ticket('ROOT-1', context=context)
+    
+    assert time.monotonic() - started < 0.8
+    slow = ticket_data['references']['jira_tickets'][0]
+    assert slow['metadata']['status'] == 'cancelled'
+    assert slow['metadata']['elapsed_seconds'] > 0.2
+    assert context.truncated_reason == 'deadline'
+
+@pytest.mark.asyncio
+async def test_bundle_deadline_cancels_resources(mock_url_analyzer, graph_jira):
+    """Test that page fetches still running at the deadline are cancelled and marked."""
+    from ticket_extractors.traversal import TimeoutConfig
+    
+    links = {'ROOT-1': []}
+    descriptions = {'ROOT-1': 'See https://confluence.example.com/display/TEST/Page1'}
+    extractor = JiraExtractor(
+        jira=graph_jira(links, descriptions=descriptions),
+        max_reference_depth=2,
+        timeouts=TimeoutConfig(bundle_seconds=0.2)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    cancelled = asyncio.Event()
+    
+    async def hanging_page(url, timeout=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    extractor.confluence_extractor.get_page_from_url = AsyncMock(side_effect=hanging_page)
+    
+    ticket_data = await extractor.get_ticket('ROOT-1')
+    
+    page = ticket_data['references']['confluence_pages'][0]
+    assert cancelled.is_set()
+    assert 'data' not in page
+    assert page['status'] == 'cancelled'
+    assert page['elapsed_seconds'] is not None
+
+def _comment_jira(total, bots=()):
+    """Create a mock Jira client whose ticket has ``total`` comments, served in pages."""
+    comments = [
+        {
+            'author': {'displayName': 'Build Bot' if i in bots else f"User {i}"},
+            'body': f"Comment {i}",
+            'created': f"2024-03-20T10:00:{i:02d}.000+0000"
+        }
+        for i in range(total)
+    ]
+    mock = Mock()
+    mock.issue = Mock(return_value={
+        'key': 'LONG-1',
+        'fields': {
+            'summary': 'Long ticket',
+            'description': None,
+            'issuelinks': [],
+            'comment': {'comments': comments[:5], 'total': total, 'maxResults': 5}
+        }
+    })
+    
+    def mock_get(path, params=None):
+        assert path == 'rest/api/2/issue/LONG-1/comment'
+        start, size = params['startAt'], params['maxResults']
+        return {'startAt': start, 'maxResults': size, 'total': total, 'comments': comments[start:start + size]}
+    
+    mock.get = Mock(side_effect=mock_get)
+    return mock
+
+@pytest.mark.asyncio
+async def test_iter_comment_pages(mock_url_analyzer):
+    """Test that comments are paginated in order, optionally keeping only the newest ones."""
+    from ticket_extractors.comments import CommentConfig
+    
+    jira = _comment_jira(250)
+    extractor = JiraExtractor(jira=jira, comment_config=CommentConfig(page_size=100, prefetch_pages=2))
+    
+    pages = [page async for page in extractor.iter_comment_pages('LONG-1')]
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert pages[-1][-1]['body'] == 'Comment 249'
+    
+    capped = JiraExtractor(jira=jira, comment_config=CommentConfig(page_size=100, max_comments=120))
+    bodies = [comment['body'] async for page in capped.iter_comment_pages('LONG-1') for comment in page]
+    assert bodies == [f"Comment {i}" for i in range(130, 250)]
+
+@pytest.mark.asyncio
+async def test_iter_comment_pages_stopped_early():
+    """Test that prefetched pages are cancelled and awaited when the consumer stops early."""
+    from ticket_extractors.comments import CommentConfig
+    
+    extractor = JiraExtractor(jira=_comment_jira(500), comment_config=CommentConfig(page_size=100, prefetch_pages=3))
+    pages = extractor.iter_comment_pages('LONG-1')
+    
+    # The second page is read once the next pages are being prefetched
+    assert [len(await pages.__anext__()) for _ in range(2)] == [100, 100]
+    await pages.aclose()
+    
+    assert [task for task in asyncio.all_tasks() if task is not asyncio.current_task()] == []
+
+@pytest.mark.asyncio
+async def test_long_ticket_comments_paginated(mock_url_analyzer):
+    """Test that a ticket with a truncated embedded comment list is paginated during expansion."""
+    from ticket_extractors.comments import CommentConfig
+    
+    jira = _comment_jira(30, bots={3, 4})
+    extractor = JiraExtractor(
+        jira=jira,
+        batch_config=JQLBatchConfig(enabled=False),
+        comment_config=CommentConfig(page_size=10)
+    )
+    extractor.url_analyzer = mock_url_analyzer
+    
+    ticket_data = await extractor.get_ticket('LONG-1')
+    
+    assert len(ticket_data['comments']) == 28
+    assert ticket_data['comments'][-1]['body'] == 'Comment 29'
+    assert [call.kwargs['params']['startAt'] for call in jira.get.call_args_list] == [0, 10, 20]
+    jira.issue_get_comments.assert_not_called()
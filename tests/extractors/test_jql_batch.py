@@ -0,0 +1,31 @@
+from urllib.parse import quote
+from ticket_extractors.jql_batch import JQLBatchConfig, build_key_jql, chunk_keys, search_url_overhead
+
+def test_build_key_jql():
+    """Test building a key lookup query."""
+    assert build_key_jql(['PROJ-1', 'PROJ-2']) == 'key in (PROJ-1, PROJ-2)'
+
+def test_chunk_keys_by_count():
+    """Test that chunks never exceed the configured number of keys."""
+    keys = [f"PROJ-{i}" for i in range(7)]
+    chunks = chunk_keys(keys, JQLBatchConfig(max_keys_per_query=3))
+    
+    assert chunks == [keys[0:3], keys[3:6], keys[6:7]]
+
+def test_chunk_keys_by_url_length():
+    """Test that every chunk's search URL stays within the length limit."""
+    keys = [f"LONGPROJECT-{i}" for i in range(200)]
+    config = JQLBatchConfig(max_keys_per_query=100, max_url_length=500)
+    overhead = search_url_overhead("https://jira.example.com")
+    
+    chunks = chunk_keys(keys, config, overhead)
+    
+    assert [key for chunk in chunks for key in chunk] == keys
+    for chunk in chunks:
+        assert overhead + len(quote(build_key_jql(chunk), safe='')) <= config.max_url_length
+    assert len(chunks) > 2
+
+def test_chunk_keys_oversized_key():
+    """Test that a key longer than the limit still gets its own chunk."""
+    chunks = chunk_keys(['A-1', 'B-2'], JQLBatchConfig(max_url_length=1))
+    assert chunks == [['A-1'], ['B-2']]
@@ -0,0 +1,37 @@
+import pytest
+from ticket_extractors.memory_manager import MemoryManager, MemoryConfig, MemoryError
+
+def test_should_check_samples_by_operations():
+    """Test that the fast path asks for a sample first, then every ``check_every`` operations."""
+    manager = MemoryManager(MemoryConfig(check_interval=3600, check_every=3))
+    
+    assert manager.should_check()
+    manager.check_memory()
+    assert manager.samples == 1
+    assert manager.last_rss > 0
+    
+    assert [manager.should_check() for _ in range(3)] == [False, False, True]
+
+def test_should_check_samples_by_time():
+    """Test that a sample is due again once the check interval has passed."""
+    manager = MemoryManager(MemoryConfig(check_interval=0, check_every=1_000_000))
+    manager.get_rss()
+    
+    assert manager.should_check()
+
+def test_disabled_monitoring():
+    """Test that disabled monitoring never samples."""
+    manager = MemoryManager(MemoryConfig(enable_monitoring=False, max_rss_bytes=1))
+    
+    assert not manager.should_check()
+    manager.check_memory()
+    assert manager.samples == 0
+
+def test_absolute_byte_limit():
+    """Test the resident set size limit."""
+    manager = MemoryManager(MemoryConfig(max_rss_bytes=1))
+    
+    assert manager.limit_exceeded().endswith("exceeds maximum limit (1 bytes)")
+    with pytest.raises(MemoryError):
+        manager.check_memory()
+    assert MemoryManager(MemoryConfig(max_rss_bytes=1 << 50)).limit_exceeded() is None
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from unittest.mock import Mock
+from ticket_extractors.negative_cache import NegativeCache, NegativeCacheConfig, classify_failure
+
+def test_classify_failure():
+    """Test mapping fetch errors to failure classes."""
+    def http_error(status):
+        error = Exception(f"HTTP {status}")
+        error.response = Mock(status_code=status)
+        return error
+    
+    assert classify_failure(http_error(404)) == 'not_found'
+    assert classify_failure(Exception("Issue Does Not Exist")) == 'not_found'
+    assert classify_failure(http_error(403)) == 'forbidden'
+    assert classify_failure(http_error(401)) == 'forbidden'
+    assert classify_failure(asyncio.TimeoutError()) == 'timeout'
+    assert classify_failure(http_error(502)) == 'error'
+
+def test_entries_expire_by_failure_class():
+    """Test that each failure class is remembered for its own time to live."""
+    cache = NegativeCache(config=NegativeCacheConfig(not_found_seconds=100, timeout_seconds=10, error_seconds=0))
+    cache.record('jira:A-1', 'not_found', 'Issue Does Not Exist')
+    cache.record('webpage:https://docs.example.com/slow', 'timeout', 'Timed out')
+    cache.record('confluence:123', 'error', 'HTTP 502')
+    
+    now = time.time()
+    assert cache.get('jira:A-1', now=now).failure_class == 'not_found'
+    assert cache.get('webpage:https://docs.example.com/slow', now=now).error == 'Timed out'
+    assert cache.get('confluence:123', now=now) is None
+    
+    assert cache.get('webpage:https://docs.example.com/slow', now=now + 20) is None
+    assert cache.get('jira:A-1', now=now + 20) is not None
+    assert cache.stats == {'hits': 3, 'recorded': 2}
+
+def test_persistence(tmp_path):
+    """Test that flushed failures survive a restart, and that recording alone does not write."""
+    path = tmp_path / 'failures.json'
+    cache = NegativeCache(str(path))
+    cache.record('confluence:123', 'forbidden', 'HTTP 403')
+    assert cache.dirty and not path.exists()
+    cache.flush()
+    assert not cache.dirty
+    
+    reloaded = NegativeCache(str(path))
+    assert reloaded.get('confluence:123').failure_class == 'forbidden'
+    reloaded.forget('confluence:123')
+    assert reloaded.get('confluence:123') is None
+
+def test_max_entries():
+    """Test that the entries closest to expiry are dropped beyond the size bound."""
+    cache = NegativeCache(config=NegativeCacheConfig(max_entries=2))
+    cache.record('jira:A-1', 'timeout', 'Timed out')
+    cache.record('jira:B-1', 'not_found', 'Gone')
+    cache.record('jira:C-1', 'forbidden', 'Denied')
+    
+    assert len(cache) == 2
+    assert cache.get('jira:A-1') is None
+
+def test_unreadable_file(tmp_path):
+    """Test that a corrupt or partially written file is ignored."""
+    path = tmp_path / 'failures.json'
+    path.write_text('{"jira:A-1": {"failure_class": "not_fo')
+    
+    cache = NegativeCache(str(path))
+    assert len(cache) == 0
+    cache.record('jira:A-1', 'not_found', 'Gone')
+    cache.flush()
+    assert NegativeCache(str(path)).get('jira:A-1').error == 'Gone'
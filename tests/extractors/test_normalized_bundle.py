@@ -0,0 +1,83 @@
+import json
+import pytest
+from ticket_extractors.reference_graph import ReferenceGraph, TicketReference
+from ticket_extractors.normalized_bundle import NormalizedBundle, ReferenceEdge
+
+def _ticket(key):
+    return {
+        'id': key,
+        'summary': f"Summary {key}",
+        'comments': [],
+        'references': {
+            'confluence_pages': [],
+            'jira_tickets': [],
+            'other_urls': [],
+            'scrapable_documentation': []
+        }
+    }
+
+@pytest.fixture
+def graph():
+    """A small crawled graph with a cycle, a failed ticket and a ticket beyond max depth."""
+    graph = ReferenceGraph()
+    graph.add('ROOT-1', 0, _ticket('ROOT-1'), [
+        TicketReference('A-1', 'Found in description'),
+        TicketReference('B-1', 'Found in comment by Jane Doe'),
+        TicketReference('MISSING-1', 'Linked issue'),
+    ])
+    graph.add('A-1', 1, _ticket('A-1'), [
+        TicketReference('B-1', 'Linked issue (blocks)'),
+        TicketReference('A-1', 'Found in description'),
+    ])
+    graph.add('B-1', 1, _ticket('B-1'), [TicketReference('C-1', 'Linked issue')])
+    graph.add('C-1', 2, _ticket('C-1'), [TicketReference('D-1', 'Linked issue')])
+    graph.add('MISSING-1', 1, None)
+    return graph
+
+def test_from_graph_keeps_reachable_tickets(graph):
+    """Test that failed tickets and references to them are left out."""
+    normalized = NormalizedBundle.from_graph(graph, ['ROOT-1'], max_depth=2)
+    
+    assert list(normalized.nodes) == ['ROOT-1', 'A-1', 'B-1', 'C-1']
+    assert ReferenceEdge('ROOT-1', 'B-1', 'Found in comment by Jane Doe') in normalized.edges
+    assert all(edge.target != 'MISSING-1' for edge in normalized.edges)
+    assert all(edge.target != 'D-1' for edge in normalized.edges)
+
+def test_from_graph_respects_max_depth(graph):
+    """Test that tickets beyond the maximum depth are not part of the node table."""
+    normalized = NormalizedBundle.from_graph(graph, ['ROOT-1'], max_depth=1)
+    
+    assert list(normalized.nodes) == ['ROOT-1', 'A-1', 'B-1']
+
+def test_expand_builds_nested_bundle(graph):
+    """Test that expansion claims tickets breadth-first and uses placeholders for repeats."""
+    normalized = NormalizedBundle.from_graph(graph, ['ROOT-1'], max_depth=2)
+    
+    bundle = normalized.expand('ROOT-1')
+    
+    a_ticket, b_ticket = bundle['references']['jira_tickets']
+    assert a_ticket['summary'] == 'Summary A-1'
+    b_placeholder, a_self = a_ticket['references']['jira_tickets']
+    assert b_placeholder['metadata']['is_processed_reference'] is True
+    assert b_placeholder['metadata']['is_parent_reference'] is False
+    assert a_self['metadata']['is_parent_reference'] is True
+    assert b_ticket['references']['jira_tickets'][0]['summary'] == 'Summary C-1'
+    
+    # Nodes are not modified by expansion
+    assert normalized.nodes['A-1']['references']['jira_tickets'] == []
+
+def test_expand_unknown_root(graph):
+    """Test that a root that failed to fetch expands to None."""
+    normalized = NormalizedBundle.from_graph(graph, ['MISSING-1'], max_depth=2)
+    
+    assert normalized.nodes == {}
+    assert normalized.expand('MISSING-1') is None
+
+def test_dict_round_trip(graph):
+    """Test that the dictionary form survives JSON serialization."""
+    normalized = NormalizedBundle.from_graph(graph, ['ROOT-1'], max_depth=2)
+    
+    restored = NormalizedBundle.from_dict(json.loads(json.dumps(normalized.to_dict())))
+    
+    assert restored == normalized
+    assert restored.expand_all() == normalized.expand_all()
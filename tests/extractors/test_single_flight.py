@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from ticket_extractors.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_fetch():
+    """Test that concurrent calls for the same key run the fetch once."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'page'
+    
+    results = await asyncio.gather(*(flights.do(('confluence', '123'), fetch) for _ in range(3)))
+    
+    assert results == ['page'] * 3
+    assert len(calls) == 1
+    assert flights.stats == {'confluence': {'fetches': 1, 'coalesced': 2}}
+    assert len(flights) == 0
+    
+    # Completed fetches are not cached
+    assert await flights.do(('confluence', '123'), fetch) == 'page'
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    """Test that a failed fetch raises in every caller sharing it."""
+    flights = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    results = await asyncio.gather(
+        flights.do(('webpage', 'https://docs.example.com'), fetch),
+        flights.do(('webpage', 'https://docs.example.com'), fetch),
+        return_exceptions=True
+    )
+    
+    assert all(isinstance(result, ValueError) for result in results)
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_fetch_running():
+    """Test that cancelling one caller does not cancel the fetch the others wait for."""
+    flights = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'page'
+    
+    first = asyncio.ensure_future(flights.do(('confluence', '123'), fetch))
+    second = asyncio.ensure_future(flights.do(('confluence', '123'), fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    
+    assert await second == 'page'
+    assert first.cancelled()
+
+@pytest.mark.asyncio
+async def test_claimed_fetch():
+    """Test resolving and abandoning fetches claimed for a batch."""
+    flights = SingleFlight()
+    
+    future, owner = flights.claim(('jira', 'A-1'))
+    joined, joined_owner = flights.claim(('jira', 'A-1'))
+    assert owner and not joined_owner
+    assert joined is future
+    flights.resolve(('jira', 'A-1'), future, 'issue')
+    assert await joined == 'issue'
+    assert not flights.in_flight(('jira', 'A-1'))
+    
+    future, _ = flights.claim(('jira', 'B-1'))
+    flights.abandon(('jira', 'B-1'), future)
+    assert future.cancelled()
+    assert flights.stats['jira'] == {'fetches': 2, 'coalesced': 1}
@@ -0,0 +1,79 @@
+import time
+import pytest
+from ticket_extractors.ticket_cache import TicketCache, TicketCacheConfig
+
+def _issue(key, updated='2024-03-20T11:00:00.000+0000', description='Description'):
+    return {'key': key, 'fields': {'summary': f"Summary {key}", 'description': description, 'updated': updated}}
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a ticket cache in a temporary directory."""
+    cache = TicketCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+def test_round_trip(cache):
+    """Test storing and loading payloads with their comments."""
+    comments = {'comments': [{'body': 'Hello'}]}
+    cache.put_many([('PROJ-1', _issue('PROJ-1'), comments, ('summary', 'updated', 'comment'))])
+    
+    entries = cache.get_many(['PROJ-1', 'PROJ-2'], ('summary', 'updated'))
+    
+    assert list(entries) == ['PROJ-1']
+    assert entries['PROJ-1'].issue == _issue('PROJ-1')
+    assert entries['PROJ-1'].comments == comments
+    assert entries['PROJ-1'].updated == '2024-03-20T11:00:00.000+0000'
+    assert cache.stats['stores'] == 1
+
+def test_entries_must_cover_requested_fields(cache):
+    """Test that thin cached payloads are not served for wider projections."""
+    cache.put_many([('PROJ-1', _issue('PROJ-1'), {'comments': []}, ('summary', 'updated'))])
+    
+    assert cache.get_many(['PROJ-1'], ('summary', 'description')) == {}
+
+def test_freshness_and_counters(tmp_path):
+    """Test TTL freshness and hit/miss accounting."""
+    cache = TicketCache(str(tmp_path), TicketCacheConfig(ttl_seconds=60))
+    cache.put_many([('PROJ-1', _issue('PROJ-1'), {'comments': []}, ('summary',))])
+    entry = cache.get_many(['PROJ-1'], ('summary',))['PROJ-1']
+    
+    assert cache.is_fresh(entry)
+    assert not cache.is_fresh(entry, now=time.time() + 120)
+    
+    cache.mark_fresh(['PROJ-1'])
+    cache.mark_fresh(['PROJ-1'], revalidated=True)
+    cache.record_misses(2, stale=1)
+    
+    assert cache.stats['hits'] == 2
+    assert cache.stats['revalidated'] == 1
+    assert cache.stats['misses'] == 2
+    assert cache.stats['stale'] == 1
+    cache.close()
+
+def test_size_bounded_eviction(tmp_path):
+    """Test that least recently accessed entries are evicted first."""
+    cache = TicketCache(str(tmp_path), TicketCacheConfig(max_bytes=1000))
+    big = 'x' * 300
+    cache.put_many([('PROJ-1', _issue('PROJ-1', description=big), {'comments': []}, ('description',))])
+    cache.put_many([('PROJ-2', _issue('PROJ-2', description=big), {'comments': []}, ('description',))])
+    cache.mark_fresh(['PROJ-1'])
+    cache.put_many([('PROJ-3', _issue('PROJ-3', description=big), {'comments': []}, ('description',))])
+    
+    remaining = cache.get_many(['PROJ-1', 'PROJ-2', 'PROJ-3'], ('description',))
+    
+    assert cache.size_bytes() <= 1000
+    assert 'PROJ-2' not in remaining
+    assert 'PROJ-3' in remaining
+    assert cache.stats['evictions'] >= 1
+    cache.close()
+
+def test_shared_directory(tmp_path):
+    """Test that two cache instances on the same directory see each other's entries."""
+    writer = TicketCache(str(tmp_path))
+    reader = TicketCache(str(tmp_path))
+    
+    writer.put_many([('PROJ-1', _issue('PROJ-1'), {'comments': []}, ('summary',))])
+    
+    assert 'PROJ-1' in reader.get_many(['PROJ-1'], ('summary',))
+    writer.close()
+    reader.close()
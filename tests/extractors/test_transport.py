@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+import pytest
+from ticket_extractors.transport import ExecutorTransport, TransportConfig, get_default_transport
+
+@pytest.fixture
+def transport():
+    """Create a transport and shut it down after the test."""
+    transport = ExecutorTransport(TransportConfig(max_workers=4))
+    yield transport
+    transport.shutdown()
+
+@pytest.mark.asyncio
+async def test_call_runs_off_event_loop(transport):
+    """Test that blocking calls run on a worker thread."""
+    loop_thread = threading.get_ident()
+    
+    def blocking(value, offset=0):
+        return threading.get_ident(), value + offset
+    
+    thread_id, result = await transport.call(blocking, 1, offset=2)
+    
+    assert result == 3
+    assert thread_id != loop_thread
+    assert transport.stats['calls'] == 1
+
+@pytest.mark.asyncio
+async def test_calls_overlap(transport):
+    """Test that concurrent blocking calls do not run serially."""
+    start = time.monotonic()
+    await asyncio.gather(*(transport.call(time.sleep, 0.2) for _ in range(4)))
+    
+    assert time.monotonic() - start < 0.6
+
+@pytest.mark.asyncio
+async def test_call_propagates_errors(transport):
+    """Test that exceptions from the blocking call are re-raised."""
+    def failing():
+        raise ValueError("API error")
+    
+    with pytest.raises(ValueError):
+        await transport.call(failing)
+    assert transport.stats['errors'] == 1
+
+def test_default_transport_is_shared():
+    """Test that extractors created without a transport share one."""
+    assert get_default_transport() is get_default_transport()
@@ -0,0 +1,89 @@
+import pytest
+from ticket_extractors.traversal import TraversalContext, TraversalBudget, ReferenceQueue
+
+def test_queue_orders_by_depth_then_kind():
+    """Test that shallow tickets come first, and issue links before description and comment mentions."""
+    queue = ReferenceQueue()
+    queue.push('COMMENT-1', 1, 'comment')
+    queue.push('DEEP-1', 2, 'issuelink')
+    queue.push('DESC-1', 1, 'description')
+    queue.push('LINK-1', 1, 'issuelink')
+    queue.push('LINK-2', 1, 'issuelink')
+    
+    assert queue.next_depth() == 1
+    assert queue.pop_level(limit=3) == ['LINK-1', 'LINK-2', 'DESC-1']
+    assert queue.pop_level() == ['COMMENT-1']
+    assert queue.drain() == ['DEEP-1']
+    assert len(queue) == 0
+
+def test_unlimited_budget():
+    """Test that the default budget never runs out."""
+    context = TraversalContext()
+    context.tickets_fetched = 10_000
+    
+    assert not context.budget.limited
+    assert context.exhausted_budget() is None
+    assert context.remaining_tickets() is None
+
+@pytest.mark.parametrize('budget, reason', [
+    (TraversalBudget(max_tickets=5), 'max_tickets'),
+    (TraversalBudget(max_seconds=0), 'max_seconds'),
+    (TraversalBudget(max_bytes=100), 'max_bytes'),
+    (TraversalBudget(max_api_calls=2), 'max_api_calls'),
+])
+def test_exhausted_budget(budget, reason):
+    """Test that each limit is reported once it is reached."""
+    context = TraversalContext(budget=budget)
+    context.tickets_fetched = 5
+    context.fetch_stats.bytes_received = 100
+    context.fetch_stats.api_calls = 2
+    
+    assert context.exhausted_budget() == reason
+
+def test_memory_budget():
+    """Test that the memory governor ends the traversal at its limit."""
+    from ticket_extractors.memory_manager import MemoryManager, MemoryConfig
+    
+    assert TraversalContext(memory=MemoryManager()).exhausted_budget() is None
+    context = TraversalContext(memory=MemoryManager(MemoryConfig(max_rss_bytes=1)))
+    assert context.exhausted_budget() == 'memory'
+
+def test_memory_sampling_per_context():
+    """Test that traversals sharing a memory manager keep their own sampling cadence."""
+    from ticket_extractors.memory_manager import MemoryManager, MemoryConfig
+    
+    memory = MemoryManager(MemoryConfig(check_every=3, check_interval=3600))
+    first, second = TraversalContext(memory=memory), TraversalContext(memory=memory)
+    assert first.exhausted_budget() is None and memory.samples == 1
+    
+    # The second traversal samples on its first check, without delaying the first one's
+    assert second.exhausted_budget() is None and memory.samples == 2
+    for _ in range(3):
+        first.exhausted_budget()
+    assert memory.samples == 3
+
+def test_context_statistics():
+    """Test reference statistics and failure tracking."""
+    context = TraversalContext()
+    context.update_stats('jira', 1)
+    context.record_failure('https://jira/browse/X-1')
+    
+    assert context.reference_stats['total_references'] == 1
+    assert context.reference_stats['by_depth'] == {1: 1}
+    assert context.failed_urls == ['https://jira/browse/X-1']
+    assert not context.truncated
+
+def test_deadline():
+    """Test that request timeouts are capped by the extraction deadline."""
+    import time
+    
+    context = TraversalContext(node_timeout=5.0)
+    assert context.call_timeout() == 5.0
+    assert context.exhausted_budget() is None
+    
+    context.deadline = time.monotonic() + 1.0
+    assert 0 < context.call_timeout() <= 1.0
+    
+    context.deadline = time.monotonic() - 1.0
+    assert context.call_timeout() == 0.0
+    assert context.exhausted_budget() == 'deadline'
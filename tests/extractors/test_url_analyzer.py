@@ -136,12 +136,59 @@ async def test_url_context(analyzer, mock_rate_limiter, mock_memory_manager):
     assert matches[0].resource_metadata.resource_type == "jira_ticket"
 
 @pytest.mark.asyncio
-async def test_rate_limit_exceeded(analyzer, mocker):
-    """Test handling of rate limit exceeded errors."""
+async def test_urls_are_cleaned(analyzer, mock_rate_limiter, mock_memory_manager):
+    """Test that wiki link markup and trailing punctuation are stripped from matches."""
+    content = f"""
+    See {JIRA_URL}/browse/PROJ-123). Also [the guide|https://docs.example.com/guide], and
+    https://en.wikipedia.org/wiki/Foo_(bar).
+    """
+    
+    matches = await analyzer.analyze_content(content, "TEST-789")
+    
+    assert [match.url for match in matches] == [
+        f"{JIRA_URL}/browse/PROJ-123",
+        "https://docs.example.com/guide",
+        "https://en.wikipedia.org/wiki/Foo_(bar)",
+    ]
+
+def test_canonical_url():
+    """Test that links to the same document get the same canonical URL."""
+    from ticket_extractors.url_analyzer import canonical_url
+    
+    expected = "https://docs.example.com/guide?a=1&b=2"
+    assert canonical_url("https://docs.example.com/guide?a=1&b=2") == expected
+    assert canonical_url("HTTPS://Docs.Example.com:443/guide/?b=2&a=1#setup") == expected
+    assert canonical_url("https://docs.example.com/guide?utm_source=jira&a=1&b=2&gclid=x") == expected
+    assert canonical_url("http://docs.example.com:8080/guide") == "http://docs.example.com:8080/guide"
+
+def test_canonical_key():
+    """Test that tickets and pages are keyed by their id whatever URL links to them."""
+    from ticket_extractors.url_analyzer import URLMatch, ResourceMetadata, canonical_key
+    
+    ticket = ResourceMetadata(resource_type='jira_ticket', resource_id='PROJ-123')
+    assert canonical_key(URLMatch(f"{JIRA_URL}/browse/PROJ-123", 'jira', True, ticket)) == 'jira:PROJ-123'
+    assert canonical_key(URLMatch(
+        f"{JIRA_URL}/browse/PROJ-123?focusedCommentId=42", 'jira', True, ticket
+    )) == 'jira:PROJ-123'
+    
+    page = ResourceMetadata(resource_type='confluence_page', resource_id='12345')
+    assert canonical_key(URLMatch(f"{CONFLUENCE_URL}/pages/12345", 'confluence', True, page)) == 'confluence:12345'
+    # Titles are only unique within a space, so title links are keyed by their URL
+    titled = ResourceMetadata(resource_type='confluence_page', resource_id='Runbook')
+    assert canonical_key(URLMatch(
+        f"{CONFLUENCE_URL}/display/OPS/Runbook", 'confluence', True, titled
+    )) == f"url:{CONFLUENCE_URL}/display/OPS/Runbook"
+    assert canonical_key(URLMatch(
+        "https://docs.example.com/guide/#setup", 'documentation', True
+    )) == 'url:https://docs.example.com/guide'
+
+@pytest.mark.asyncio
+async def test_analysis_is_not_rate_limited(analyzer, mocker):
+    """Test that URL analysis does not go through the API rate limiter."""
     from aiohttp import ClientResponseError
     from yarl import URL
     
-    # Mock rate limiter to simulate rate limit exceeded
+    # A rate limiter that would reject the call must not be consulted
     mock_call = mocker.patch('ticket_extractors.rate_limiter.APIRateLimiter.call')
     mock_call.side_effect = ClientResponseError(
         request_info=mocker.Mock(real_url=URL('http://example.com')),
@@ -152,9 +199,26 @@ async def test_rate_limit_exceeded(analyzer, mocker):
     
     content = f"{JIRA_URL}/browse/PROJ-123"
     
-    with pytest.raises(ClientResponseError) as exc_info:
-        await analyzer.analyze_content(content, "TEST-789")
-    assert exc_info.value.status == 429
+    matches = await analyzer.analyze_content(content, "TEST-789")
+    assert len(matches) == 1
+    assert not mock_call.called
+
+@pytest.mark.asyncio
+async def test_analyze_many(analyzer, mock_memory_manager):
+    """Test analyzing several documents in one call."""
+    documents = [
+        ("description", f"See {JIRA_URL}/browse/PROJ-123"),
+        ("comment-1", "Docs: https://help.example.com/article/123"),
+        ("comment-2", "No links here"),
+        ("comment-1", f"And {CONFLUENCE_URL}/wiki/spaces/TEST/pages/12345"),
+    ]
+    
+    results = await analyzer.analyze_many(documents)
+    
+    assert [match.url_type for match in results["description"]] == ["jira"]
+    assert [match.url_type for match in results["comment-1"]] == ["help_center", "confluence"]
+    assert results["comment-2"] == []
+    assert list((await analyzer.analyze_many({"only": f"{JIRA_URL}/browse/PROJ-1"})).keys()) == ["only"]
 
 @pytest.mark.asyncio
 async def test_memory_limit_exceeded(analyzer, mocker):
@@ -166,4 +230,33 @@ async def test_memory_limit_exceeded(analyzer, mocker):
     content = f"{JIRA_URL}/browse/PROJ-123"
     
     with pytest.raises(MemoryError):
-        await analyzer.analyze_content(content, "TEST-789")
\ No newline at end of file
+        await analyzer.analyze_content(content, "TEST-789")
+
+
+def test_analyze_stream_across_chunk_boundaries(analyzer, mock_memory_manager):
+    """Test that streamed text gives the same matches as the whole text, however it is split."""
+    import asyncio
+    
+    content = (
+        f"Log line {JIRA_URL}/browse/PROJ-123 then\n<a href=\"https://help.example.com/article/42\">help</a> "
+        f"and {CONFLUENCE_URL}/wiki/spaces/TEST/pages/12345. Done www.docs.example.com/guide"
+    )
+    expected = [(match.url, match.url_type) for match in asyncio.run(analyzer.analyze_content(content))]
+    assert len(expected) == 4
+    
+    for size in (1, 7, 30, len(content)):
+        chunks = [content[i:i + size] for i in range(0, len(content), size)]
+        assert [(match.url, match.url_type) for match in analyzer.analyze_stream(chunks)] == expected
+
+def test_analyze_stream_file(analyzer, mock_memory_manager):
+    """Test streaming from a file-like object, skipping oversized tokens."""
+    import io
+    
+    text = f"{JIRA_URL}/browse/PROJ-1 " + "x" * 500 + f"https://help.example.com/a {JIRA_URL}/browse/PROJ-2"
+    
+    matches = list(analyzer.analyze_stream(io.StringIO(text), chunk_size=64, max_token_length=200))
+    
+    assert [match.url for match in matches] == [f"{JIRA_URL}/browse/PROJ-1", f"{JIRA_URL}/browse/PROJ-2"]
+    assert [match.url for match in analyzer.analyze_stream(io.StringIO(text), chunk_size=64)] == [
+        f"{JIRA_URL}/browse/PROJ-1", "https://help.example.com/a", f"{JIRA_URL}/browse/PROJ-2"
+    ]
@@ -168,14 +168,34 @@ async def test_mixed_urls(test_patterns_file, mock_rate_limiter, mock_memory_man
     assert matches[4].should_scrape == False
 
 @pytest.mark.asyncio
-async def test_rate_limit_exceeded(test_patterns_file, mocker):
-    """Test handling of rate limit exceeded errors."""
+async def test_classifications_are_memoized(test_patterns_file, tmp_path, mock_memory_manager):
+    """Test that repeated URLs are classified once, and reloading patterns invalidates the memo."""
+    analyzer = URLAnalyzer(test_patterns_file)
+    content = f"https://app.{BASE_DOMAIN}/campaign/123 and again https://app.{BASE_DOMAIN}/campaign/123/"
+    
+    first, second = await analyzer.analyze_content(content)
+    assert first.resource_metadata == second.resource_metadata
+    assert first.resource_metadata is not second.resource_metadata
+    assert analyzer.classification_cache.stats == {'hits': 1, 'misses': 1, 'evictions': 0}
+    
+    patterns_file = tmp_path / "other_patterns.json"
+    patterns_file.write_text(json.dumps({"url_patterns": {"platform": {"domains": [f"app.{BASE_DOMAIN}"], "scrape": True}}}))
+    analyzer.reload_patterns(str(patterns_file))
+    
+    assert len(analyzer.classification_cache) == 0
+    matches = await analyzer.analyze_content(f"https://app.{BASE_DOMAIN}/campaign/123")
+    assert matches[0].should_scrape is True
+    assert matches[0].resource_metadata is None
+
+@pytest.mark.asyncio
+async def test_analysis_is_not_rate_limited(test_patterns_file, mocker):
+    """Test that URL analysis does not go through the API rate limiter."""
     from aiohttp import ClientResponseError
     from yarl import URL
     
     analyzer = URLAnalyzer(test_patterns_file)
     
-    # Mock rate limiter to simulate rate limit exceeded
+    # A rate limiter that would reject the call must not be consulted
     mock_call = mocker.patch('ticket_extractors.rate_limiter.APIRateLimiter.call')
     mock_call.side_effect = ClientResponseError(
         request_info=mocker.Mock(real_url=URL('http://example.com')),
@@ -186,9 +206,9 @@ async def test_rate_limit_exceeded(test_patterns_file, mocker):
     
     content = f"https://app.{BASE_DOMAIN}/campaign/123"
     
-    with pytest.raises(ClientResponseError) as exc_info:
-        await analyzer.analyze_content(content, "TEST-1")
-    assert exc_info.value.status == 429
+    matches = await analyzer.analyze_content(content, "TEST-1")
+    assert len(matches) == 1
+    assert not mock_call.called
 
 @pytest.mark.asyncio
 async def test_memory_limit_exceeded(test_patterns_file, mocker):
@@ -202,4 +222,23 @@ async def test_memory_limit_exceeded(test_patterns_file, mocker):
     content = f"https://app.{BASE_DOMAIN}/campaign/123"
     
     with pytest.raises(MemoryError):
-        await analyzer.analyze_content(content, "TEST-1") 
\ No newline at end of file
+        await analyzer.analyze_content(content, "TEST-1") 
+@pytest.mark.asyncio
+async def test_inline_flag_resource_pattern(tmp_path, mock_memory_manager):
+    """Test that a resource pattern with a global inline flag is still matched on its own."""
+    patterns_file = tmp_path / "inline_patterns.json"
+    patterns_file.write_text(json.dumps({"url_patterns": {"platform": {
+        "domains": [f"app.{BASE_DOMAIN}"],
+        "resource_patterns": [
+            {"pattern": "(?i)/item/([a-z]+)", "type": "item", "extract_id": "$1"},
+            {"pattern": "/campaign/([0-9]+)", "type": "campaign", "extract_id": "$1"}
+        ]
+    }}}))
+    analyzer = URLAnalyzer(str(patterns_file))
+    
+    item, campaign = await analyzer.analyze_content(
+        f"https://app.{BASE_DOMAIN}/item/Abc and https://app.{BASE_DOMAIN}/campaign/7"
+    )
+    assert item.resource_metadata.resource_type == "item"
+    assert item.resource_metadata.resource_id == "Abc"
+    assert campaign.resource_metadata.resource_id == "7"
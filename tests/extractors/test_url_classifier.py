@@ -0,0 +1,111 @@
+import pytest
+from ticket_extractors.url_classifier import DomainTrie, URLClassifier
+
+PATTERNS = {
+    "help_center": {
+        "domains": ["help.example.com"],
+        "scrape": True,
+        "exclude_patterns": ["^/search(/.*)?$", "([invalid"]
+    },
+    "platform": {
+        "domains": ["app.example.com"],
+        "scrape": False,
+        "resource_patterns": [
+            {"pattern": "/campaign/([0-9]+)", "type": "campaign", "extract_id": "$1"},
+            {"pattern": "/campaign/([0-9]+)/ideas/([0-9]+)", "type": "campaign_idea", "extract_id": "$2", "parent_id": "$1"}
+        ]
+    }
+}
+
+@pytest.fixture
+def classifier():
+    """Create a classifier for the test patterns."""
+    domains = {domain: platform for platform, config in PATTERNS.items() for domain in config["domains"]}
+    return URLClassifier(PATTERNS, domains, "example.com")
+
+def test_domain_trie():
+    """Test that suffixes match whole labels and the longest suffix wins."""
+    trie = DomainTrie()
+    trie.add("atlassian.net", "cloud")
+    trie.add("wiki.example.com", "wiki")
+    
+    assert trie.match("acme.atlassian.net") == "cloud"
+    assert trie.match("atlassian.net") == "cloud"
+    assert trie.match("team.wiki.example.com") == "wiki"
+    assert trie.match("example.com") is None
+    assert trie.match("notatlassian.net") is None
+
+def test_classify(classifier):
+    """Test classifying hosts by hint, collaboration suffix and configured domain."""
+    assert classifier.classify("help.example.com", "/article/1")[:2] == ("help_center", "help_center")
+    assert classifier.classify("docs.python.org", "/3")[:2] == ("documentation", "documentation")
+    assert classifier.classify("acme.atlassian.net", "/browse/PROJ-1") == ("jira", "jira", ("jira_ticket", "PROJ-1", None))
+    assert classifier.classify("jira.example.com:8443", "/browse/PROJ-2")[2] == ("jira_ticket", "PROJ-2", None)
+    assert classifier.classify("acme.atlassian.net", "/wiki/spaces/S/pages/123/Title") == (
+        "confluence", "confluence", ("confluence_page", "123", None)
+    )
+    assert classifier.classify("app.example.com", "/campaign/1")[:2] == ("platform", "platform")
+    assert classifier.classify("other.example.com", "/page") == ("external", None, None)
+
+def test_extract_resource_prefers_specific_patterns(classifier):
+    """Test that the longest pattern wins, wherever in the path each pattern matches."""
+    assert classifier.extract_resource("platform", "/campaign/123/ideas/456") == ("campaign_idea", "456", "123")
+    assert classifier.extract_resource("platform", "/campaign/9") == ("campaign", "9", None)
+    assert classifier.extract_resource("platform", "/x/campaign/7/y") == ("campaign", "7", None)
+    assert classifier.extract_resource("platform", "/ideas") is None
+    assert classifier.extract_resource("help_center", "/campaign/1") is None
+
+def test_extract_resource_patterns_that_do_not_combine():
+    """Test that backreferences keep their own groups and "." does not match newlines."""
+    patterns = {"platform": {"resource_patterns": [
+        {"pattern": r"/(\w+)/\1/([0-9]+)", "type": "twin", "extract_id": "$2", "parent_id": "$1"},
+        {"pattern": r"/a.b/([0-9]+)", "type": "dotted", "extract_id": "$1"}
+    ]}}
+    classifier = URLClassifier(patterns, {}, "example.com")
+    
+    assert classifier.platforms["platform"].resource_regex is None
+    assert classifier.extract_resource("platform", "/team/team/42") == ("twin", "42", "team")
+    assert classifier.extract_resource("platform", "/team/other/42") is None
+    assert classifier.extract_resource("platform", "/a\nb/1") is None
+    
+    # Without backreferences the patterns are combined, still without DOTALL semantics
+    del patterns["platform"]["resource_patterns"][0]
+    classifier = URLClassifier(patterns, {}, "example.com")
+    assert classifier.platforms["platform"].resource_regex is not None
+    assert classifier.extract_resource("platform", "/a\nb/1") is None
+    assert classifier.extract_resource("platform", "/x\n/axb/1") == ("dotted", "1", None)
+
+def test_should_scrape(classifier):
+    """Test scraping rules with precompiled exclude patterns; invalid patterns are skipped."""
+    assert classifier.should_scrape("help_center", "/article/1")
+    assert not classifier.should_scrape("help_center", "/search/results")
+    assert not classifier.should_scrape("platform", "/campaign/1")
+    assert not classifier.should_scrape("unknown", "/")
+
+def test_classification_cache_lru():
+    """Test the LRU bound and hit, miss and eviction counters."""
+    from ticket_extractors.url_classifier import ClassificationCache, ClassificationCacheConfig
+    
+    cache = ClassificationCache("patterns-v1", ClassificationCacheConfig(max_entries=2))
+    cache.put("a.example.com/1", ("external", False, None))
+    cache.put("b.example.com/2", ("external", False, None))
+    assert cache.get("a.example.com/1") is not None
+    cache.put("c.example.com/3", ("external", False, None))
+    
+    assert cache.get("b.example.com/2") is None
+    assert cache.get("a.example.com/1") is not None
+    assert cache.stats == {'hits': 2, 'misses': 1, 'evictions': 1}
+
+def test_classification_cache_persistence(tmp_path):
+    """Test that a persisted cache is reused only with the same patterns."""
+    from ticket_extractors.url_classifier import ClassificationCache, ClassificationCacheConfig
+    
+    config = ClassificationCacheConfig(path=str(tmp_path / "urls.json"))
+    cache = ClassificationCache("patterns-v1", config)
+    cache.put("jira.example.com/browse/A-1", ("jira", True, ("jira_ticket", "A-1", None)))
+    cache.save()
+    
+    assert ClassificationCache("patterns-v1", config).get("jira.example.com/browse/A-1") == (
+        "jira", True, ("jira_ticket", "A-1", None)
+    )
+    assert len(ClassificationCache("patterns-v2", config)) == 0
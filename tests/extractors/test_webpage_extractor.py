@@ -56,6 +56,19 @@ async def test_failed_fetch(extractor):
         page_data = await extractor.get_page_from_url(url)
         assert page_data is None
 
+@pytest.mark.asyncio
+async def test_error_status_is_raised(extractor):
+    """Test that an HTTP error status reaches the caller instead of being reported as no page."""
+    from ticket_extractors.webpage_extractor import PageStatusError
+    
+    url = "https://example.com/private-page"
+    with patch('ticket_extractors.webpage_extractor.WebPageExtractor._fetch_page_content') as mock_fetch:
+        mock_fetch.side_effect = PageStatusError(url, 403)
+        
+        with pytest.raises(PageStatusError) as error:
+            await extractor.get_page_from_url(url)
+        assert error.value.status == 403
+
 @pytest.mark.asyncio
 async def test_empty_content(extractor):
     """Test handling of empty page content."""
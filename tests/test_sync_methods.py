@@ -25,7 +25,7 @@ def mock_jira():
         }
     }
     
-    def mock_issue(key):
+    def mock_issue(key, *args, **kwargs):
         if key == 'TEST-123':
             return mock_ticket
         raise Exception(f"Issue {key} not found")